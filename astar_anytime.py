@@ -0,0 +1,249 @@
+from astar_grid import Grid
+from astar_heuristic import HeuristicField, get_heuristic, is_admissible
+from astar_node import NodePool
+from astar_open_list import OpenList
+from astar_search import get_offsets
+import math
+import time
+
+
+class AnytimeSearch:
+    ''' The anytime repairing A* (ARA*) search engine.
+
+    The first pass is a weighted A* search (the heuristic is multiplied by the
+    'anytimeWeight' setting), which finds a path quickly whose length is at
+    most that many times the shortest. Each later pass lowers the weight and
+    reuses the previous pass: only the cells whose distance improved since
+    they were expanded are queued again. The search stops once the path is
+    proven optimal or the 'timeLimit' setting (in seconds, 0 for no limit)
+    runs out, returning the best path found so far.
+
+    The time limit only applies once a first path is found, and stopping the
+    search also returns the best path found so far. Every pass redraws the
+    cells it queues and expands as unsolved and solved.
+
+    @params
+        grid: the grid to search
+    '''
+
+    LABEL = 'Anytime A* (ARA*)'
+
+    # How much the weight is lowered after each pass
+    WEIGHT_STEP = 0.5
+
+    def __init__(self, grid):
+        self.__grid = grid
+        self.__nodes = NodePool(grid.size)
+        self.__heuristic_field = HeuristicField(grid.size)
+        self.unsolved = OpenList()
+        self.__num_solved = 0
+        self.__suboptimality_bound = None
+        self.__landmarks = None
+
+    def get_num_unsolved(self):
+        return len(self.unsolved)
+
+    def get_num_solved(self):
+        return self.__num_solved
+
+    def set_landmarks(self, landmarks):
+        ''' Attaches the landmarks the 'alt' heuristic is computed from (see astar_landmarks.Landmarks).
+
+        Args:
+            landmarks::[Landmarks]
+                The landmarks of the current maze (None unless the 'alt' heuristic is selected)
+
+        Returns:
+            None
+        '''
+        self.__landmarks = landmarks
+
+    def get_suboptimality_bound(self):
+        ''' Returns how many times longer than the shortest path the best path found may be.
+
+        Args:
+            None
+
+        Returns:
+            [float]
+                The bound, or None if no path was found yet or the heuristic is not admissible
+        '''
+        return self.__suboptimality_bound
+
+    def search(self, start, end, settings, tick):
+        ''' Searches for a path from the start cell to the end cell, improving it until it is optimal or time runs out.
+
+        Args:
+            start::[int]
+                The index of the start cell
+            end::[int]
+                The index of the end cell
+            settings::[dict]
+                The model settings
+            tick::[function]
+                Called once per expansion; the search stops if it returns False
+
+        Returns:
+            [list]
+                The cell indices on the best path from start to end, or None if no path was found
+        '''
+        weight = settings['anytimeWeight']
+        if weight < 1:
+            raise ValueError('The anytime weight must be at least 1. Received {} instead.'.format(weight))
+
+        self.__nodes.reset()
+        self.unsolved = OpenList()
+        self.__num_solved = 0
+        self.__suboptimality_bound = None
+
+        deadline = time.time() + settings['timeLimit'] if settings['timeLimit'] > 0 else math.inf
+        admissible = is_admissible(settings['heuristic'], settings['allowDiagonals'])
+
+        nCol = self.__grid.nCol
+        endX, endY = divmod(end, nCol)
+        g = self.__nodes.g
+        if settings['heuristic'] == 'alt' and self.__landmarks is not None:
+            heuristic = self.__landmarks.get_heuristic(end)
+        else:
+            heuristic = get_heuristic(settings['heuristic'], settings['allowDiagonals'])
+        hValues = self.__heuristic_field.get_values(end, heuristic)
+        self.__end_position = (endX, endY)
+        self.__heuristic = heuristic
+        self.__h_values = hValues
+
+        g[start] = 0
+        self.__nodes.touched.append(start)
+        self.unsolved.push(start, (weight * self.__get_h(start), 0), start)
+
+        # Cells whose distance improved after they were expanded in the current pass
+        inconsistent = set()
+        bestPath = None
+
+        while True:
+            # Stopped by the user, or by the deadline once there is a path to fall back on
+            if not self.__improve_path(end, weight, settings['allowDiagonals'], inconsistent,
+                                       deadline if bestPath is not None else math.inf, tick):
+                return bestPath
+
+            if g[end] == math.inf:
+                return None
+            bestPath = self.__nodes.path_to(end)
+
+            # The path is at most the weight times the shortest, and at most its length over the lowest f left
+            remaining = [g[cell] + self.__get_h(cell) for cell in inconsistent.union(self.unsolved)]
+            if admissible:
+                lowestF = min(remaining, default=g[end])
+                self.__suboptimality_bound = min(weight, g[end] / lowestF) if lowestF > 0 else 1.0
+
+            bound = self.__suboptimality_bound
+            if weight <= 1 or (bound is not None and bound <= 1) or not remaining or time.time() >= deadline:
+                return bestPath
+
+            weight = max(1.0, min(weight - self.WEIGHT_STEP, bound or math.inf))
+            self.__start_pass(weight, inconsistent)
+
+    def __get_h(self, cell):
+        h = self.__h_values[cell]
+        if h < 0:
+            x, y = divmod(cell, self.__grid.nCol)
+            endX, endY = self.__end_position
+            h = self.__h_values[cell] = self.__heuristic(endX - x, endY - y)
+        return h
+
+    def __start_pass(self, weight, inconsistent):
+        ''' Requeues the unsolved and inconsistent cells under a new weight and clears the drawn search.
+
+        Args:
+            weight::[float]
+                The weight of the heuristic in the next pass
+            inconsistent::[set]
+                The cells whose distance improved after they were expanded (emptied)
+
+        Returns:
+            None
+        '''
+        grid = self.__grid
+        g = self.__nodes.g
+        queued = inconsistent.union(self.unsolved)
+        inconsistent.clear()
+
+        grid.clear_search()
+        self.unsolved = OpenList()
+        for cell in queued:
+            self.unsolved.push(cell, (g[cell] + weight * self.__get_h(cell), -g[cell]), cell)
+            if grid.cells[cell] == Grid.EMPTY:
+                grid.set(cell, Grid.UNSOLVED)
+
+    def __improve_path(self, end, weight, allow_diagonals, inconsistent, deadline, tick):
+        ''' Expands cells until the path to the end cell is within the weight of the shortest.
+
+        Args:
+            end::[int]
+                The index of the end cell
+            weight::[float]
+                The weight of the heuristic
+            allow_diagonals::[bool]
+                Whether or not diagonal movement is allowed
+            inconsistent::[set]
+                Collects the cells whose distance improved after they were expanded
+            deadline::[float]
+                The time at which to give up on the pass
+            tick::[function]
+                Called once per expansion; the search stops if it returns False
+
+        Returns:
+            [bool]
+                Whether or not the pass finished
+        '''
+        grid = self.__grid
+        nRow, nCol = grid.nRow, grid.nCol
+        cells = grid.cells
+        g = self.__nodes.g
+        parent = self.__nodes.parent
+        touched = self.__nodes.touched
+        unsolved = self.unsolved
+        offsets = get_offsets(allow_diagonals)
+        get_h = self.__get_h
+
+        # Cells expanded in this pass
+        closed = bytearray(grid.size)
+
+        while len(unsolved) != 0 and unsolved.peek_priority()[0] < g[end]:
+            if not tick() or time.time() >= deadline:
+                return False
+
+            curCell = unsolved.pop()
+            closed[curCell] = 1
+            self.__num_solved += 1
+            if cells[curCell] == Grid.UNSOLVED:
+                grid.set(curCell, Grid.SOLVED)
+
+            curX, curY = divmod(curCell, nCol)
+            adjG = g[curCell] + 1
+
+            for offsetX, offsetY in offsets:
+                adjX = curX + offsetX
+                adjY = curY + offsetY
+
+                if not (0 <= adjX < nRow and 0 <= adjY < nCol):
+                    continue
+
+                adjCell = adjX * nCol + adjY
+                if cells[adjCell] == Grid.WALL or adjG >= g[adjCell]:
+                    continue
+
+                if g[adjCell] == math.inf:
+                    touched.append(adjCell)
+                g[adjCell] = adjG
+                parent[adjCell] = curCell
+
+                if closed[adjCell]:
+                    inconsistent.add(adjCell)
+                    continue
+
+                # Ties are broken in favour of the deeper cell
+                unsolved.push(adjCell, (adjG + weight * get_h(adjCell), -adjG), adjCell)
+                if cells[adjCell] == Grid.EMPTY:
+                    grid.set(adjCell, Grid.UNSOLVED)
+
+        return True
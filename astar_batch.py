@@ -0,0 +1,144 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from astar_cache import SolveCache
+from astar_model import AStarModel, load_maze_data
+
+
+def find_maze_files(paths, pattern='*.json'):
+    ''' Finds the maze files to solve.
+
+    Args:
+        paths::[list]
+            Maze files and directories (searched recursively)
+        pattern::[str]
+            The glob pattern of maze files inside directories
+
+    Returns:
+        [list]
+            The maze file paths sorted within each directory
+    '''
+    filenames = []
+    for path in paths:
+        if os.path.isdir(path):
+            filenames.extend(sorted(glob.glob(os.path.join(path, '**', pattern), recursive=True)))
+        else:
+            filenames.append(path)
+    return filenames
+
+
+def solve_maze_file(filename, allow_diagonals=True, cache_path=None):
+    ''' Solves an exported maze file headlessly.
+
+    Args:
+        filename::[str]
+            The path of the maze file
+        allow_diagonals::[bool]
+            Whether or not diagonal movement is allowed
+        cache_path::[str]
+            The path of a persistent solve cache to use (optional)
+
+    Returns:
+        [dict]
+            The result of the solve (or the error that prevented it)
+    '''
+    result = {'file': filename}
+    cache = None
+
+    try:
+        maze_data = load_maze_data(filename)
+        width = maze_data['gridWidth']
+
+        model = AStarModel(view=None, nRow=width, nCol=width)
+        model.set_setting('enablePrintToConsole', False)
+        model.set_setting('allowDiagonals', allow_diagonals)
+        model.set_setting('expansionsPerFrame', 0)
+        model.import_maze_data(maze_data)
+
+        if cache_path is not None:
+            cache = SolveCache(cache_path)
+            model.set_cache(cache)
+
+        start_time = time.perf_counter()
+        success = model.solve()
+        solve_time = time.perf_counter() - start_time
+
+        result.update({
+            'gridWidth': width,
+            'success': success,
+            'pathLength': model.get_stat('numPath'),
+            'expansions': model.get_stat('numSolved'),
+            'time': round(solve_time, 6)
+        })
+
+        if cache is not None:
+            result.update({
+                'cacheHit': model.get_stat('isCacheHit'),
+                'key': model.get_maze_key()
+            })
+    except Exception as error:
+        result.update({
+            'success': False,
+            'error': '{}: {}'.format(type(error).__name__, error)
+        })
+    finally:
+        if cache is not None:
+            cache.close()
+
+    return result
+
+
+def solve_maze_files(filenames, allow_diagonals=True, workers=None, cache_path=None):
+    ''' Solves maze files in parallel, yielding each result as soon as it completes.
+
+    Args:
+        filenames::[list]
+            The paths of the maze files
+        allow_diagonals::[bool]
+            Whether or not diagonal movement is allowed
+        workers::[int]
+            The number of worker processes (defaults to the number of cores)
+        cache_path::[str]
+            The path of a persistent solve cache to use (optional)
+
+    Returns:
+        [generator]
+            The result of every solve, in completion order
+    '''
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = [executor.submit(solve_maze_file, filename, allow_diagonals, cache_path)
+                   for filename in filenames]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Solves exported maze files in parallel and prints one JSON line per maze.')
+    parser.add_argument('paths', nargs='+',
+                        help='maze files or directories of maze files')
+    parser.add_argument('--pattern', default='*.json',
+                        help='glob pattern of maze files inside directories')
+    parser.add_argument('--no-diagonals', action='store_true',
+                        help='disallow diagonal movement')
+    parser.add_argument('--workers', type=int,
+                        help='number of worker processes (defaults to the number of cores)')
+    parser.add_argument('--cache',
+                        help='persistent solve cache file to look up and store results in')
+    args = parser.parse_args()
+
+    filenames = find_maze_files(args.paths, args.pattern)
+    for result in solve_maze_files(filenames,
+                                   allow_diagonals=not args.no_diagonals,
+                                   workers=args.workers,
+                                   cache_path=args.cache):
+        sys.stdout.write(json.dumps(result) + '\n')
+        sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,339 @@
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from astar_connectivity import ConnectivityIndex
+from astar_generator import GENERATORS, generate_maze
+from astar_grid import Grid
+from astar_model import AStarModel
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+# Default grid widths of the generated mazes
+DEFAULT_SIZES = [15, 50, 100, 500, 1000, 2000]
+
+# Relative drop in expansions per second that counts as a regression
+DEFAULT_TOLERANCE = 0.2
+
+# Baseline solves faster than this (in seconds) are too noisy to compare expansion rates
+MIN_COMPARABLE_SOLVE_TIME = 0.05
+
+# Seeds tried after the requested one before giving up on a solvable generated maze
+MAX_SEED_ATTEMPTS = 100
+
+
+'''
+BENCHMARK METHODS.
+'''
+
+
+def find_sample_mazes(directory):
+    ''' Finds every exported maze under the given directory.
+
+    Args:
+        directory::[str]
+            The directory containing the maze JSON files (e.g. sample_mazes)
+
+    Returns:
+        [list]
+            (name, maze spec) pairs sorted by name
+    '''
+    mazes = []
+    for filename in sorted(glob.glob(os.path.join(directory, '**', '*.json'), recursive=True)):
+        name = os.path.splitext(os.path.relpath(filename, directory))[0]
+        mazes.append(('sample:{}'.format(name.replace(os.sep, '/')),
+                      ('sample', filename)))
+    return mazes
+
+
+def build_maze(spec):
+    ''' Builds the maze data described by a maze spec.
+
+    Args:
+        spec::[tuple]
+            ('sample', filename) for an exported maze, or
+            (generator name, width, seed) for a generated maze
+
+    Returns:
+        [dict]
+            The maze data (see AStarModel.import_maze_data())
+    '''
+    if spec[0] == 'sample':
+        with open(spec[1], 'r') as file:
+            return json.load(file)
+
+    generator_name, width, seed = spec
+    return generate_maze(generator_name, width, seed)
+
+
+def find_solvable_seed(generator_name, width, seed):
+    ''' Returns the first seed from the given one whose generated maze connects the start and the end.
+
+    Some generators (such as random fill) can wall in the start or the end,
+    and a solve that fails straight away measures nothing. Mazes are checked
+    without diagonal movement, so they can be solved with it too.
+
+    Args:
+        generator_name::[str]
+            The name of the generator (see astar_generator.GENERATORS)
+        width::[int]
+            The width of the square maze
+        seed::[int]
+            The first seed to try
+
+    Returns:
+        [int]
+            The seed of a solvable maze
+    '''
+    for candidate in range(seed, seed + MAX_SEED_ATTEMPTS):
+        maze_data = generate_maze(generator_name, width, candidate)
+        grid = Grid(width, width, track_changes=False)
+        grid.load_wall_plane(maze_data['wallPlane'])
+        connectivity = ConnectivityIndex(grid, allow_diagonals=False)
+        if connectivity.is_connected(grid.index(maze_data['start']), grid.index(maze_data['end'])):
+            return candidate
+
+    raise ValueError('No seed from {} to {} generates a solvable {} x {} [{}] maze.'.format(
+        seed, seed + MAX_SEED_ATTEMPTS - 1, width, width, generator_name))
+
+
+def create_model(maze_data, allow_diagonals):
+    ''' Creates a headless model loaded with the given maze.
+
+    Args:
+        maze_data::[dict]
+            The maze data (see AStarModel.import_maze_data())
+        allow_diagonals::[bool]
+            Whether or not diagonal movement is allowed
+
+    Returns:
+        [AStarModel]
+            The model, ready to be solved
+    '''
+    width = maze_data['gridWidth']
+    model = AStarModel(view=None, nRow=width, nCol=width)
+    model.set_setting('enablePrintToConsole', False)
+    model.set_setting('allowDiagonals', allow_diagonals)
+
+    # There is no view to draw frames for
+    model.set_setting('expansionsPerFrame', 0)
+
+    model.import_maze_data(maze_data)
+    return model
+
+
+def get_peak_memory():
+    ''' Returns the peak resident set size of the current process in bytes, or None if unavailable.
+
+    Args:
+        None
+
+    Returns:
+        [int]
+            The peak resident set size in bytes
+    '''
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def run_benchmark(name, spec, allow_diagonals, repeat=1):
+    ''' Builds and solves a maze and measures the solver.
+
+    The solve time is the best of `repeat` runs, and includes labelling the
+    connected regions of the maze, which is also reported on its own as the
+    connectivity build time of that run. The peak memory is the peak
+    resident set size of the process, so each benchmark should run in a fresh
+    process (see run_isolated_benchmark).
+
+    Args:
+        name::[str]
+            The name of the maze
+        spec::[tuple]
+            The maze spec (see build_maze)
+        allow_diagonals::[bool]
+            Whether or not diagonal movement is allowed
+        repeat::[int]
+            The number of timed runs
+
+    Returns:
+        [dict]
+            The benchmark result
+    '''
+    maze_data = build_maze(spec)
+    solve_time = None
+    connectivity_build_time = None
+
+    for _ in range(max(repeat, 1)):
+        model = create_model(maze_data, allow_diagonals)
+        start_time = time.perf_counter()
+        success = model.solve()
+        elapsed_time = time.perf_counter() - start_time
+        if solve_time is None or elapsed_time < solve_time:
+            solve_time = elapsed_time
+            connectivity_build_time = model.get_stat('connectivityBuildTime')
+
+    expansions = model.get_stat('numSolved')
+
+    return {
+        'name': name,
+        'gridWidth': maze_data['gridWidth'],
+        'allowDiagonals': allow_diagonals,
+        'success': success,
+        'expansions': expansions,
+        'pathLength': model.get_stat('numPath'),
+        'solveTime': solve_time,
+        'connectivityBuildTime': connectivity_build_time,
+        'expansionsPerSecond': expansions / solve_time if solve_time > 0 else None,
+        'peakMemoryBytes': get_peak_memory()
+    }
+
+
+def run_isolated_benchmark(name, spec, allow_diagonals, repeat=1):
+    ''' Runs a benchmark in a fresh process so that its peak memory is not shared with other runs.
+
+    Args:
+        name::[str]
+            The name of the maze
+        spec::[tuple]
+            The maze spec (see build_maze)
+        allow_diagonals::[bool]
+            Whether or not diagonal movement is allowed
+        repeat::[int]
+            The number of timed runs
+
+    Returns:
+        [dict]
+            The benchmark result
+    '''
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(run_benchmark, name, spec, allow_diagonals, repeat).result()
+
+
+def compare_to_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    ''' Compares benchmark results against a stored baseline.
+
+    A result regresses if its expansions per second dropped by more than the
+    tolerance, or if its outcome (success, expansions, or path length) changed.
+    Expansion rates are only compared for baseline solves that took at least
+    MIN_COMPARABLE_SOLVE_TIME seconds.
+
+    Args:
+        results::[list]
+            The benchmark results
+        baseline::[dict]
+            A previously saved benchmark report
+        tolerance::[float]
+            The allowed relative drop in expansions per second
+
+    Returns:
+        [list]
+            A message for every regression found
+    '''
+    baseline_results = {(r['name'], r['allowDiagonals']): r for r in baseline['results']}
+    regressions = []
+
+    for result in results:
+        key = (result['name'], result['allowDiagonals'])
+        if key not in baseline_results:
+            continue
+
+        base = baseline_results[key]
+        label = '{} (diagonals {})'.format(
+            result['name'], 'on' if result['allowDiagonals'] else 'off')
+
+        for field in ('success', 'expansions', 'pathLength'):
+            if result[field] != base[field]:
+                regressions.append('{}: {} changed from {} to {}'.format(
+                    label, field, base[field], result[field]))
+
+        rate = result['expansionsPerSecond']
+        base_rate = base['expansionsPerSecond']
+        if base['solveTime'] < MIN_COMPARABLE_SOLVE_TIME:
+            continue
+
+        if rate is not None and base_rate and rate < base_rate * (1 - tolerance):
+            regressions.append('{}: expansions per second dropped from {:.0f} to {:.0f} ({:.1%})'.format(
+                label, base_rate, rate, rate / base_rate - 1))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmarks the A* model headlessly over the sample mazes and generated mazes.')
+    parser.add_argument('--samples', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sample_mazes'),
+                        help='directory of exported mazes to include')
+    parser.add_argument('--sizes', type=int, nargs='*', default=DEFAULT_SIZES,
+                        help='grid widths of the generated mazes')
+    parser.add_argument('--generators', nargs='*', default=list(GENERATORS), choices=list(GENERATORS),
+                        help='maze generators to include')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='first seed to try for the maze generators (the first seed of a solvable maze is used)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='number of timed runs per maze (the best is reported)')
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help='file to write the machine-readable report to')
+    parser.add_argument('--baseline',
+                        help='previous report to compare against; exits with status 1 on regression')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='allowed relative drop in expansions per second')
+    args = parser.parse_args()
+
+    mazes = find_sample_mazes(args.samples) if args.samples else []
+    for generator_name in args.generators:
+        for size in args.sizes:
+            mazes.append(('{}:{}'.format(generator_name, size),
+                          (generator_name, size, find_solvable_seed(generator_name, size, args.seed))))
+
+    results = []
+    for name, spec in mazes:
+        for allow_diagonals in (True, False):
+            result = run_isolated_benchmark(name, spec, allow_diagonals,
+                                            repeat=args.repeat)
+            if spec[0] != 'sample':
+                result['seed'] = spec[2]
+            results.append(result)
+            print('{:<32} diagonals {:<3} {:>9} expansions {:>10.4f} s ({:.4f} s labelling) {:>10.0f} exp/s  path {}'.format(
+                name, 'on' if allow_diagonals else 'off', result['expansions'],
+                result['solveTime'], result['connectivityBuildTime'] or 0, result['expansionsPerSecond'] or 0,
+                result['pathLength'] if result['success'] else '-'))
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'results': results
+    }
+
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print('Wrote {} results to {}.'.format(len(results), args.output))
+
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            baseline = json.load(file)
+
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        for regression in regressions:
+            print('REGRESSION: {}'.format(regression))
+
+        if regressions:
+            sys.exit(1)
+        print('No regressions against {}.'.format(args.baseline))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+from astar_grid import Grid
+from astar_heuristic import get_heuristic
+from astar_node import NodePool
+from astar_open_list import OpenList
+from astar_search import get_offsets
+import math
+
+
+class BidirectionalSearch:
+    ''' The bidirectional A* search engine.
+
+    One A* search grows forward from the start cell while another grows
+    backward from the end cell, each expanding from whichever frontier is
+    smaller. Whenever a cell is reached by both searches, the path through it
+    becomes a candidate.
+
+    Both searches share one potential, half the difference between the
+    distance estimates to the end and to the start (the forward search adds it
+    to g and the backward search subtracts it). Since both searches then rank
+    cells by the same consistent estimate, the search can stop as soon as the
+    lowest priorities of the two frontiers add up to the best candidate: no
+    shorter path remains, so the path is still optimal.
+
+    Both frontiers are marked as unsolved and solved. Distances are estimated
+    with the heuristic chosen by the 'heuristic' setting (see astar_heuristic).
+
+    @params
+        grid: the grid to search
+    '''
+
+    LABEL = 'Bidirectional A*'
+
+    def __init__(self, grid):
+        self.__grid = grid
+
+        # The forward search from the start and the backward search from the end
+        self.__nodes = (NodePool(grid.size), NodePool(grid.size))
+        self.__unsolved = (OpenList(), OpenList())
+        self.__closed = (bytearray(grid.size), bytearray(grid.size))
+        self.__num_solved = 0
+
+    def get_num_unsolved(self):
+        return len(self.__unsolved[0]) + len(self.__unsolved[1])
+
+    def get_num_solved(self):
+        return self.__num_solved
+
+    def search(self, start, end, settings, tick):
+        ''' Searches for a path from the start cell to the end cell.
+
+        Args:
+            start::[int]
+                The index of the start cell
+            end::[int]
+                The index of the end cell
+            settings::[dict]
+                The model settings
+            tick::[function]
+                Called once per expansion; the search stops if it returns False
+
+        Returns:
+            [list]
+                The cell indices on the path from start to end, or None if no path was found
+        '''
+        for nodes in self.__nodes:
+            nodes.reset()
+        self.__unsolved = (OpenList(), OpenList())
+        self.__closed = (bytearray(self.__grid.size), bytearray(self.__grid.size))
+        self.__num_solved = 0
+
+        grid = self.__grid
+        nRow, nCol = grid.nRow, grid.nCol
+        cells = grid.cells
+        offsets = get_offsets(settings['allowDiagonals'])
+        heuristic = get_heuristic(settings['heuristic'], settings['allowDiagonals'])
+
+        startX, startY = divmod(start, nCol)
+        endX, endY = divmod(end, nCol)
+
+        def potential(x, y):
+            return (heuristic(endX - x, endY - y) - heuristic(startX - x, startY - y)) / 2
+
+        # The backward search uses the negated potential
+        signs = (1, -1)
+        roots = (start, end)
+
+        for side in (0, 1):
+            rootX, rootY = divmod(roots[side], nCol)
+            self.__nodes[side].g[roots[side]] = 0
+            self.__nodes[side].touched.append(roots[side])
+            self.__unsolved[side].push(roots[side], (signs[side] * potential(rootX, rootY), 0), roots[side])
+
+        # Length of the best path found so far and the cell where its two halves meet
+        bestLength = math.inf
+        meetCell = -1
+
+        while len(self.__unsolved[0]) != 0 and len(self.__unsolved[1]) != 0:
+            # No path through either frontier can be shorter than the best path found
+            if bestLength <= self.__unsolved[0].peek_priority()[0] + self.__unsolved[1].peek_priority()[0]:
+                break
+
+            if not tick():
+                return None
+
+            # Expand the smaller frontier
+            side = 0 if len(self.__unsolved[0]) <= len(self.__unsolved[1]) else 1
+            unsolved = self.__unsolved[side]
+            closed = self.__closed[side]
+            g = self.__nodes[side].g
+            parent = self.__nodes[side].parent
+            touched = self.__nodes[side].touched
+            otherG = self.__nodes[1 - side].g
+            sign = signs[side]
+
+            curCell = unsolved.pop()
+            closed[curCell] = 1
+            self.__num_solved += 1
+            if cells[curCell] == Grid.UNSOLVED:
+                grid.set(curCell, Grid.SOLVED)
+
+            curX, curY = divmod(curCell, nCol)
+            adjG = g[curCell] + 1
+
+            for offsetX, offsetY in offsets:
+                adjX = curX + offsetX
+                adjY = curY + offsetY
+
+                if not (0 <= adjX < nRow and 0 <= adjY < nCol):
+                    continue
+
+                adjCell = adjX * nCol + adjY
+                if cells[adjCell] == Grid.WALL or closed[adjCell]:
+                    continue
+
+                if adjG < g[adjCell]:
+                    if g[adjCell] == math.inf:
+                        touched.append(adjCell)
+                    g[adjCell] = adjG
+                    parent[adjCell] = curCell
+
+                    # Ties are broken in favour of the deeper cell
+                    unsolved.push(adjCell, (adjG + sign * potential(adjX, adjY), -adjG), adjCell)
+                    if cells[adjCell] == Grid.EMPTY:
+                        grid.set(adjCell, Grid.UNSOLVED)
+
+                    # The cell was reached from both sides
+                    if adjG + otherG[adjCell] < bestLength:
+                        bestLength = adjG + otherG[adjCell]
+                        meetCell = adjCell
+
+        if meetCell == -1:
+            return None
+
+        # Join the forward half with the reversed backward half
+        backwardHalf = self.__nodes[1].path_to(meetCell)
+        backwardHalf.reverse()
+        return self.__nodes[0].path_to(meetCell) + backwardHalf[1:]
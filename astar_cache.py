@@ -0,0 +1,205 @@
+import argparse
+import json
+import os
+import sqlite3
+import time
+
+
+class SolveCache:
+    ''' A persistent, content-addressed cache of solve results backed by a SQLite file.
+
+    Results are keyed by AStarModel.get_maze_key(), a canonical hash of the grid
+    size, walls, start, end, and the settings that affect the search. When the
+    stored results exceed max_bytes, the least recently used ones are evicted.
+
+    The cache can be shared by several processes. To keep lookups fast, the
+    recency of looked up results is written back in batches (see flush()).
+
+    @params
+        path: the path of the cache file
+        max_bytes: the maximum total size of the stored results
+    '''
+
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    # Number of lookups after which their recency is written back
+    FLUSH_INTERVAL = 64
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        if max_bytes <= 0:
+            raise ValueError(
+                'The cache size must be positive. Received {} bytes instead.'.format(max_bytes))
+
+        self.__path = path
+        self.__max_bytes = max_bytes
+
+        # Last lookup time of keys whose recency has not been written back yet
+        self.__pending_touches = {}
+        self.__connection = sqlite3.connect(path, timeout=30)
+
+        # Write-ahead logging without syncing every commit keeps lookups fast
+        self.__connection.execute('PRAGMA journal_mode=WAL')
+        self.__connection.execute('PRAGMA synchronous=NORMAL')
+        self.__connection.execute('CREATE TABLE IF NOT EXISTS results ('
+                                  'key TEXT PRIMARY KEY, '
+                                  'value TEXT NOT NULL, '
+                                  'size INTEGER NOT NULL, '
+                                  'last_used REAL NOT NULL)')
+        self.__connection.execute(
+            'CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)')
+        self.__connection.commit()
+
+    def __len__(self):
+        return self.__connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def __contains__(self, key):
+        return self.__connection.execute('SELECT 1 FROM results WHERE key = ?', (key,)).fetchone() is not None
+
+    def get_path(self):
+        return self.__path
+
+    def get_size(self):
+        return self.__connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+
+    def get(self, key):
+        ''' Returns the result stored under the given key and marks it as recently used.
+
+        Args:
+            key::[str]
+                The maze key
+
+        Returns:
+            [dict]
+                The stored result, or None if the key is not cached
+        '''
+        row = self.__connection.execute(
+            'SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+
+        self.__pending_touches[key] = time.time()
+        if len(self.__pending_touches) >= self.FLUSH_INTERVAL:
+            self.flush()
+
+        return json.loads(row[0])
+
+    def put(self, key, result):
+        ''' Stores a result under the given key, evicting the least recently used results if needed.
+
+        Args:
+            key::[str]
+                The maze key
+            result::[dict]
+                The JSON-serializable result to store
+
+        Returns:
+            None
+        '''
+        value = json.dumps(result, separators=(',', ':'))
+
+        # Results larger than the whole cache are not worth storing
+        if len(value) > self.__max_bytes:
+            return
+
+        self.__pending_touches.pop(key, None)
+        with self.__connection:
+            self.__write_touches()
+            self.__connection.execute('INSERT OR REPLACE INTO results (key, value, size, last_used) VALUES (?, ?, ?, ?)',
+                                      (key, value, len(value), time.time()))
+            self.__evict()
+
+    def invalidate(self, key):
+        ''' Removes the result stored under the given key.
+
+        Args:
+            key::[str]
+                The maze key
+
+        Returns:
+            [bool]
+                Whether or not a result was removed
+        '''
+        self.__pending_touches.pop(key, None)
+        with self.__connection:
+            cursor = self.__connection.execute(
+                'DELETE FROM results WHERE key = ?', (key,))
+        return cursor.rowcount > 0
+
+    def clear(self):
+        self.__pending_touches = {}
+        with self.__connection:
+            self.__connection.execute('DELETE FROM results')
+
+    def flush(self):
+        ''' Writes back the recency of the results looked up since the last flush.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        with self.__connection:
+            self.__write_touches()
+
+    def close(self):
+        self.flush()
+        self.__connection.close()
+
+    def __write_touches(self):
+        if self.__pending_touches:
+            self.__connection.executemany('UPDATE results SET last_used = ? WHERE key = ?',
+                                          [(last_used, key) for key, last_used in self.__pending_touches.items()])
+            self.__pending_touches = {}
+
+    def __evict(self):
+        ''' Removes the least recently used results until the cache fits within its size cap.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        excess = self.get_size() - self.__max_bytes
+        if excess <= 0:
+            return
+
+        evicted = []
+        for key, size in self.__connection.execute('SELECT key, size FROM results ORDER BY last_used'):
+            evicted.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+
+        self.__connection.executemany(
+            'DELETE FROM results WHERE key = ?', evicted)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Inspects or clears a persistent solve-result cache.')
+    parser.add_argument('path', help='the cache file')
+    parser.add_argument('--clear', action='store_true',
+                        help='remove every cached result')
+    parser.add_argument('--invalidate', nargs='*', default=[], metavar='KEY',
+                        help='remove the cached results with the given keys')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        parser.error('The cache file does not exist: {}'.format(args.path))
+
+    cache = SolveCache(args.path)
+
+    if args.clear:
+        cache.clear()
+    for key in args.invalidate:
+        if not cache.invalidate(key):
+            print('Not cached: {}'.format(key))
+
+    print('{} results, {} bytes'.format(len(cache), cache.get_size()))
+    cache.close()
+
+
+if __name__ == '__main__':
+    main()
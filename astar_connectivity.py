@@ -0,0 +1,352 @@
+from array import array
+from collections import deque
+from astar_grid import Grid
+import re
+import time
+
+
+class ConnectivityIndex:
+    ''' Labels the connected regions of free (non-wall) cells, so that an unreachable end is found without searching.
+
+    Every free cell holds a region label, and labels that were joined point to a
+    common root through a union-find. The labels are built on the first query
+    from the runs of free cells in each row, and are then kept up to date as
+    walls change (see on_cell_changed()):
+
+    - Removing a wall joins the regions around the cell in O(1).
+    - Placing a wall can split a region. If the free cells around the new wall
+      are not already joined through the ring of cells around it, they are
+      flooded in lockstep until they meet, and each region that closes off
+      first gets a new label. The flood stops after SPLIT_SEARCH_LIMIT cells.
+
+    A split that was not resolved leaves two regions sharing a label, so cells
+    with different labels are always disconnected. A query for cells sharing a
+    label rebuilds the labels first if a split was missed.
+
+    @params
+        grid: the grid to index
+        allow_diagonals: whether or not diagonal movement is allowed (diagonal neighbours are connected)
+    '''
+
+    # Free cells the flood after placing a wall may visit before the split is left unresolved
+    SPLIT_SEARCH_LIMIT = 1 << 14
+
+    # The ring of cells around a cell as (row, column) offsets, in order around the cell
+    __RING = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+
+    def __init__(self, grid, allow_diagonals):
+        self.__grid = grid
+        self.__allow_diagonals = allow_diagonals
+
+        # Region label of every cell (-1 for walls), None until the first query
+        self.__labels = None
+
+        # Union-find over region labels
+        self.__parents = array('i')
+
+        # False once a wall may have split a region without it being relabelled
+        self.__is_exact = True
+
+        # Neighbour offsets as (row, column) offsets
+        self.__offsets = self.__RING if allow_diagonals else self.__RING[::2]
+
+    def build(self):
+        ''' Labels the regions if they were never labelled, or if a wall may have split a region without it being relabelled.
+        Queries label the regions themselves when needed, so this only moves that work to a chosen moment.
+
+        Args:
+            None
+
+        Returns:
+            [float]
+                The seconds spent labelling the regions (0 if the labels were up to date)
+        '''
+        if self.__labels is not None and self.__is_exact:
+            return 0
+
+        start_time = time.perf_counter()
+        self.__build()
+        return time.perf_counter() - start_time
+
+    def is_connected(self, a, b):
+        ''' Returns whether or not there is a path between two free cells.
+
+        Args:
+            a::[int]
+                The index of the first cell
+            b::[int]
+                The index of the second cell
+
+        Returns:
+            [bool]
+                Whether or not the cells are in the same region
+        '''
+        if self.__labels is None:
+            self.__build()
+
+        if self.__find(self.__labels[a]) != self.__find(self.__labels[b]):
+            return False
+
+        # A missed split may be all that joins the two cells
+        if not self.__is_exact:
+            self.__build()
+            return self.__find(self.__labels[a]) == self.__find(self.__labels[b])
+        return True
+
+    def on_cell_changed(self, cell):
+        ''' Updates the regions after a cell was turned into a wall or cleared.
+
+        Args:
+            cell::[int]
+                The index of the changed cell
+
+        Returns:
+            None
+        '''
+        if self.__labels is None:
+            return
+
+        if self.__grid.cells[cell] == Grid.WALL:
+            if self.__labels[cell] != -1:
+                self.__labels[cell] = -1
+                self.__split(cell)
+        elif self.__labels[cell] == -1:
+            self.__join(cell)
+
+    def __find(self, label):
+        parents = self.__parents
+        while parents[label] != label:
+            parents[label] = parents[parents[label]]
+            label = parents[label]
+        return label
+
+    def __new_label(self):
+        label = len(self.__parents)
+        self.__parents.append(label)
+        return label
+
+    def __build(self):
+        ''' Labels every region from scratch.
+
+        Each run of free cells in a row gets a label and is joined with the runs
+        it touches in the row above. Runs are found with a single regular
+        expression scan over the wall plane, with a wall appended to every row.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        grid = self.__grid
+        nCol = grid.nCol
+        stride = nCol + 1
+        plane = grid.wall_plane()
+
+        rows = bytearray(b'\x01') * (grid.nRow * stride)
+        for x in range(grid.nRow):
+            rows[x * stride:x * stride + nCol] = plane[x * nCol:(x + 1) * nCol]
+
+        # Runs in the row above touch a run if they overlap it, or also if they touch it diagonally
+        reach = 1 if self.__allow_diagonals else 0
+
+        parents = array('i')
+        self.__parents = parents
+        find = self.__find
+        runStarts = array('i')
+        runEnds = array('i')
+
+        # Runs of the previous and current rows as (start column, end column, label)
+        previousRuns = []
+        currentRuns = []
+        currentRow = 0
+        j = 0
+
+        for match in re.finditer(b'\x00+', rows):
+            row, start = divmod(match.start(), stride)
+            end = start + match.end() - match.start()
+
+            if row != currentRow:
+                previousRuns = currentRuns if row == currentRow + 1 else []
+                currentRuns = []
+                currentRow = row
+                j = 0
+
+            label = len(parents)
+            parents.append(label)
+            root = label
+
+            # Skip the runs above that end before this run, then join the ones that touch it
+            while j < len(previousRuns) and previousRuns[j][1] + reach <= start:
+                j += 1
+            k = j
+            while k < len(previousRuns) and previousRuns[k][0] < end + reach:
+                other = find(previousRuns[k][2])
+                if other < root:
+                    parents[root] = other
+                    root = other
+                elif other > root:
+                    parents[other] = root
+                k += 1
+
+            # The last run touched may also touch the next run
+            j = max(j, k - 1)
+
+            currentRuns.append((start, end, label))
+            runStarts.append(row * nCol + start)
+            runEnds.append(row * nCol + end)
+
+        labels = array('i', [-1]) * grid.size
+        for label in range(len(parents)):
+            start, end = runStarts[label], runEnds[label]
+            labels[start:end] = array('i', [find(label)]) * (end - start)
+
+        self.__labels = labels
+        self.__is_exact = True
+
+    def __get_free_neighbours(self, cell):
+        nRow, nCol = self.__grid.nRow, self.__grid.nCol
+        cells = self.__grid.cells
+        x, y = divmod(cell, nCol)
+
+        neighbours = []
+        for offsetX, offsetY in self.__offsets:
+            nX, nY = x + offsetX, y + offsetY
+            if 0 <= nX < nRow and 0 <= nY < nCol and cells[nX * nCol + nY] != Grid.WALL:
+                neighbours.append(nX * nCol + nY)
+        return neighbours
+
+    def __join(self, cell):
+        ''' Labels a cell that was cleared, joining the regions around it.
+
+        Args:
+            cell::[int]
+                The index of the cleared cell
+
+        Returns:
+            None
+        '''
+        labels = self.__labels
+        roots = {self.__find(labels[neighbour]) for neighbour in self.__get_free_neighbours(cell)}
+
+        if not roots:
+            labels[cell] = self.__new_label()
+            return
+
+        root = min(roots)
+        for other in roots:
+            self.__parents[other] = root
+        labels[cell] = root
+
+    def __get_separate_neighbours(self, cell):
+        ''' Returns one free neighbour of a cell per group of neighbours not joined through the ring around the cell.
+
+        Consecutive cells of the ring around a cell are neighbours of each
+        other, so the free neighbours along an unbroken arc of free ring cells
+        stay connected whatever happens to the cell itself.
+
+        Args:
+            cell::[int]
+                The index of the cell
+
+        Returns:
+            [list]
+                The indices of one neighbour per group
+        '''
+        nRow, nCol = self.__grid.nRow, self.__grid.nCol
+        cells = self.__grid.cells
+        x, y = divmod(cell, nCol)
+
+        ring = []
+        for offsetX, offsetY in self.__RING:
+            nX, nY = x + offsetX, y + offsetY
+            isFree = 0 <= nX < nRow and 0 <= nY < nCol and cells[nX * nCol + nY] != Grid.WALL
+            ring.append(nX * nCol + nY if isFree else -1)
+
+        # Start walking the ring just after a wall so that no arc is split in two
+        if -1 not in ring:
+            return []
+        first = ring.index(-1)
+
+        representatives = []
+        isNewArc = True
+        for i in range(first + 1, first + 1 + len(ring)):
+            ringCell = ring[i % len(ring)]
+            if ringCell == -1:
+                isNewArc = True
+            elif isNewArc and (self.__allow_diagonals or i % 2 == 0):
+                # Without diagonal movement, only the straight neighbours (even ring positions) are neighbours
+                representatives.append(ringCell)
+                isNewArc = False
+        return representatives
+
+    def __split(self, cell):
+        ''' Relabels the regions cut off by a cell that was turned into a wall.
+
+        One flood per group of separate neighbours (see
+        __get_separate_neighbours()) runs in lockstep. Floods that meet are
+        merged. A flood that runs out of cells has found a region that was cut
+        off, which gets a new label. The remaining flood keeps the old label.
+
+        Args:
+            cell::[int]
+                The index of the new wall
+
+        Returns:
+            None
+        '''
+        representatives = self.__get_separate_neighbours(cell)
+        if len(representatives) < 2:
+            return
+
+        # The flood that reached each cell, and the flood each merged flood was merged into
+        owners = {}
+        floods = list(range(len(representatives)))
+        queues = []
+        for flood, representative in enumerate(representatives):
+            owners[representative] = flood
+            queues.append(deque([representative]))
+
+        def find_flood(flood):
+            while floods[flood] != flood:
+                flood = floods[flood]
+            return flood
+
+        active = set(floods)
+        labels = self.__labels
+
+        while len(active) > 1:
+            if len(owners) > self.SPLIT_SEARCH_LIMIT:
+                self.__is_exact = False
+                return
+
+            for flood in list(active):
+                if flood not in active:
+                    continue
+
+                queue = queues[flood]
+                if not queue:
+                    # Everything this flood reached was cut off from the others
+                    label = self.__new_label()
+                    for ownedCell, owner in owners.items():
+                        if find_flood(owner) == flood:
+                            labels[ownedCell] = label
+                    active.remove(flood)
+                    if len(active) == 1:
+                        break
+                    continue
+
+                for neighbour in self.__get_free_neighbours(queue.popleft()):
+                    owner = owners.get(neighbour)
+                    if owner is None:
+                        owners[neighbour] = flood
+                        queue.append(neighbour)
+                        continue
+
+                    owner = find_flood(owner)
+                    if owner != flood:
+                        # The floods met, so their cells are still connected
+                        floods[owner] = flood
+                        queue.extend(queues[owner])
+                        queues[owner] = None
+                        active.remove(owner)
@@ -0,0 +1,251 @@
+from array import array
+from collections import OrderedDict
+from astar_search import get_offsets
+
+
+class DistanceField:
+    ''' The distance from every cell to one goal, found by a breadth-first search outward from the goal.
+
+    Every step costs 1, so the breadth-first search finds the exact distances.
+    Any cell reaches the goal along a shortest path by repeatedly stepping to
+    a neighbour one step closer, so a path from any start only costs its length.
+
+    The field is stored with a border of walls around the grid, so the search
+    needs no bounds checks.
+
+    @params
+        grid: the grid (its walls are copied when the field is created)
+        goal: the index of the goal cell
+        allow_diagonals: whether or not diagonal movement is allowed
+    '''
+
+    def __init__(self, grid, goal, allow_diagonals):
+        self.__nCol = grid.nCol
+        self.__width = grid.nCol + 2
+        self.__goal = goal
+
+        # Offsets to the neighbours in the padded layout, straight steps first so that paths prefer them
+        self.__offsets = [offsetX * self.__width + offsetY for offsetX, offsetY in get_offsets(allow_diagonals)]
+
+        # 1 for walls and the border, 0 for free cells
+        self.__blocked = bytearray(b'\x01') * (self.__width * (grid.nRow + 2))
+        plane = grid.wall_plane()
+        for x in range(grid.nRow):
+            row = (x + 1) * self.__width + 1
+            self.__blocked[row:row + grid.nCol] = plane[x * grid.nCol:(x + 1) * grid.nCol]
+
+        # Distance of every cell in the padded layout (-1 if unreachable)
+        self.__distances = None
+        self.num_reached = 0
+
+    def __to_padded(self, cell):
+        x, y = divmod(cell, self.__nCol)
+        return (x + 1) * self.__width + y + 1
+
+    def __from_padded(self, padded):
+        x, y = divmod(padded, self.__width)
+        return (x - 1) * self.__nCol + y - 1
+
+    def build(self, tick):
+        ''' Computes the distances.
+
+        Args:
+            tick::[function]
+                Called once per ring of cells at the same distance; the build stops if it returns False
+
+        Returns:
+            [bool]
+                Whether or not the build completed
+        '''
+        distances = array('i', [-1]) * len(self.__blocked)
+        seen = bytearray(self.__blocked)
+        offsets = self.__offsets
+
+        goal = self.__to_padded(self.__goal)
+        distances[goal] = 0
+        seen[goal] = 1
+        frontier = [goal]
+        distance = 0
+        numReached = 1
+
+        while frontier:
+            if not tick():
+                return False
+
+            distance += 1
+            nextFrontier = []
+            push = nextFrontier.append
+            for cell in frontier:
+                for offset in offsets:
+                    neighbour = cell + offset
+                    if not seen[neighbour]:
+                        seen[neighbour] = 1
+                        distances[neighbour] = distance
+                        push(neighbour)
+            numReached += len(nextFrontier)
+            frontier = nextFrontier
+
+        self.__distances = distances
+        self.__blocked = None
+        self.num_reached = numReached
+        return True
+
+    def get_distance(self, cell):
+        ''' Returns the number of steps from a cell to the goal.
+
+        Args:
+            cell::[int]
+                The index of the cell
+
+        Returns:
+            [int]
+                The distance to the goal, or -1 if the goal cannot be reached
+        '''
+        return self.__distances[self.__to_padded(cell)]
+
+    def get_distances(self):
+        ''' Returns the distance of every cell to the goal.
+
+        Args:
+            None
+
+        Returns:
+            [array]
+                The distance of each cell in grid order (-1 for walls and cells that cannot reach the goal)
+        '''
+        distances = array('i')
+        nRow = len(self.__distances) // self.__width - 2
+        for x in range(nRow):
+            row = (x + 1) * self.__width + 1
+            distances += self.__distances[row:row + self.__nCol]
+        return distances
+
+    def path_from(self, start):
+        ''' Returns a shortest path from a cell to the goal by descending the field.
+
+        Args:
+            start::[int]
+                The index of the start cell
+
+        Returns:
+            [list]
+                The cell indices on the path from the start to the goal, or None if the goal cannot be reached
+        '''
+        distances = self.__distances
+        cell = self.__to_padded(start)
+        distance = distances[cell]
+        if distance == -1:
+            return None
+
+        path = [start]
+        while distance > 0:
+            distance -= 1
+            for offset in self.__offsets:
+                if distances[cell + offset] == distance:
+                    cell += offset
+                    break
+            path.append(self.__from_padded(cell))
+        return path
+
+
+class DistanceFieldSearch:
+    ''' Answers queries with reverse distance fields rooted at the end cell.
+
+    The first search for an end builds its DistanceField, which costs about
+    as much as a breadth-first search over the whole grid. Later searches
+    for the same end, from any start, just descend the field and cost the
+    length of their path. This suits many starts converging on one end.
+
+    Fields are kept in a least recently used cache keyed by the end, the
+    movement setting, and the version of the walls. Changing a wall
+    discards every field (see on_cell_changed()). The field is not drawn;
+    the solved count is the number of cells the field reached when it was
+    built, and 0 when it was reused.
+
+    @params
+        grid: the grid to search
+    '''
+
+    LABEL = 'Reverse distance field'
+
+    # Number of distance fields kept
+    CACHE_SIZE = 8
+
+    def __init__(self, grid):
+        self.__grid = grid
+        self.__fields = OrderedDict()
+        self.__wall_version = 0
+        self.__num_solved = 0
+
+    def get_num_unsolved(self):
+        return 0
+
+    def get_num_solved(self):
+        return self.__num_solved
+
+    def on_cell_changed(self, cell):
+        ''' Discards every distance field after a cell was turned into a wall or cleared.
+
+        Args:
+            cell::[int]
+                The index of the changed cell
+
+        Returns:
+            None
+        '''
+        self.__wall_version += 1
+        self.__fields.clear()
+
+    def get_field(self, end, allow_diagonals, tick=lambda: True):
+        ''' Returns the distance field of an end cell, building it if it is not cached.
+
+        Args:
+            end::[int]
+                The index of the end cell
+            allow_diagonals::[bool]
+                Whether or not diagonal movement is allowed
+            tick::[function]
+                Called while building the field; the build stops if it returns False
+
+        Returns:
+            [DistanceField]
+                The distance field, or None if the build was stopped
+        '''
+        key = (end, allow_diagonals, self.__wall_version)
+        if key in self.__fields:
+            self.__fields.move_to_end(key)
+            self.__num_solved = 0
+            return self.__fields[key]
+
+        field = DistanceField(self.__grid, end, allow_diagonals)
+        if not field.build(tick):
+            return None
+        self.__num_solved = field.num_reached
+
+        self.__fields[key] = field
+        if len(self.__fields) > self.CACHE_SIZE:
+            self.__fields.popitem(last=False)
+        return field
+
+    def search(self, start, end, settings, tick):
+        ''' Finds a shortest path from the start cell to the end cell by descending the end's distance field.
+
+        Args:
+            start::[int]
+                The index of the start cell
+            end::[int]
+                The index of the end cell
+            settings::[dict]
+                The model settings
+            tick::[function]
+                Called while building the field; the search stops if it returns False
+
+        Returns:
+            [list]
+                The cell indices on the path from start to end, or None if no path was found
+        '''
+        self.__num_solved = 0
+        field = self.get_field(end, settings['allowDiagonals'], tick)
+        if field is None:
+            return None
+        return field.path_from(start)
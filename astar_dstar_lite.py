@@ -0,0 +1,290 @@
+from array import array
+from astar_grid import Grid
+from astar_heuristic import get_heuristic
+from astar_open_list import OpenList
+from astar_search import get_offsets
+import math
+
+
+class DStarLiteSearch:
+    ''' The D* Lite search engine, which repairs its previous search after the maze changes.
+
+    The search runs backward from the end cell, keeping for every cell its
+    distance to the end (g) and a one-step lookahead of that distance (rhs).
+    Only cells whose two values disagree are queued, so after a wall is placed
+    or removed only the cells whose distance actually changed are expanded
+    again instead of searching the whole maze from scratch. Moving the start
+    cell is handled by offsetting the queue keys (km) rather than re-queuing.
+
+    Cells changed since the last search are reported through on_cell_changed().
+    Changing the end cell, the allowDiagonals setting or the heuristic starts over.
+
+    @params
+        grid: the grid to search
+    '''
+
+    LABEL = 'D* Lite'
+
+    def __init__(self, grid):
+        self.__grid = grid
+        self.__g = array('d', [math.inf]) * grid.size
+        self.__rhs = array('d', [math.inf]) * grid.size
+        self.unsolved = OpenList()
+        self.__num_solved = 0
+
+        # Cells whose wall state changed since the last search
+        self.__changed_cells = set()
+
+        # The end cell and settings the search state was built for (None before the first search)
+        self.__end = None
+        self.__allow_diagonals = None
+        self.__heuristic_function = None
+        self.__last_start = None
+        self.__km = 0
+
+    def get_num_unsolved(self):
+        return len(self.unsolved)
+
+    def get_num_solved(self):
+        return self.__num_solved
+
+    def on_cell_changed(self, cell):
+        ''' Records that a cell was turned into a wall or cleared since the last search.
+
+        Args:
+            cell::[int]
+                The index of the changed cell
+
+        Returns:
+            None
+        '''
+        if self.__end is not None:
+            self.__changed_cells.add(cell)
+
+    def search(self, start, end, settings, tick):
+        ''' Searches for a path from the start cell to the end cell, reusing the previous search if possible.
+
+        Args:
+            start::[int]
+                The index of the start cell
+            end::[int]
+                The index of the end cell
+            settings::[dict]
+                The model settings
+            tick::[function]
+                Called once per expansion; the search stops if it returns False
+
+        Returns:
+            [list]
+                The cell indices on the path from start to end, or None if no path was found
+        '''
+        self.__num_solved = 0
+        self.__start = start
+        self.__offsets = get_offsets(settings['allowDiagonals'])
+        heuristic = get_heuristic(settings['heuristic'], settings['allowDiagonals'])
+
+        if (end != self.__end or settings['allowDiagonals'] != self.__allow_diagonals
+                or heuristic is not self.__heuristic_function):
+            self.__heuristic_function = heuristic
+            self.__initialize(start, end, settings['allowDiagonals'])
+
+        else:
+            # Keys queued before the start moved are lowered by the distance it moved
+            self.__km += self.__heuristic(self.__last_start, start)
+            self.__last_start = start
+
+            for changedCell in self.__changed_cells:
+                self.__update_rhs(changedCell)
+                for adjCell in self.__neighbours(changedCell):
+                    self.__update_rhs(adjCell)
+            self.__changed_cells.clear()
+
+        # Queued cells are drawn as unsolved again since the grid was cleared
+        cells = self.__grid.cells
+        for cell in self.unsolved:
+            if cells[cell] == Grid.EMPTY:
+                self.__grid.set(cell, Grid.UNSOLVED)
+
+        if not self.__compute_shortest_path(tick):
+            return None
+
+        return self.__extract_path()
+
+    def __initialize(self, start, end, allow_diagonals):
+        ''' Discards the previous search and queues the end cell.
+
+        Args:
+            start::[int]
+                The index of the start cell
+            end::[int]
+                The index of the end cell
+            allow_diagonals::[bool]
+                Whether or not diagonal movement is allowed
+
+        Returns:
+            None
+        '''
+        size = self.__grid.size
+        self.__g = array('d', [math.inf]) * size
+        self.__rhs = array('d', [math.inf]) * size
+        self.unsolved = OpenList()
+        self.__changed_cells.clear()
+        self.__end = end
+        self.__allow_diagonals = allow_diagonals
+        self.__last_start = start
+        self.__km = 0
+
+        self.__rhs[end] = 0
+        self.unsolved.push(end, self.__calculate_key(end), end)
+
+    def __calculate_key(self, cell):
+        best = min(self.__g[cell], self.__rhs[cell])
+        return (best + self.__heuristic(self.__start, cell) + self.__km, best)
+
+    def __heuristic(self, a, b):
+        ax, ay = divmod(a, self.__grid.nCol)
+        bx, by = divmod(b, self.__grid.nCol)
+        return self.__heuristic_function(ax - bx, ay - by)
+
+    def __neighbours(self, cell):
+        ''' Returns the indices of the cells adjacent to a cell, walls included.
+
+        Args:
+            cell::[int]
+                The index of the cell
+
+        Returns:
+            [list]
+                The indices of the adjacent cells
+        '''
+        nRow, nCol = self.__grid.nRow, self.__grid.nCol
+        curX, curY = divmod(cell, nCol)
+        return [(curX + offsetX) * nCol + curY + offsetY for offsetX, offsetY in self.__offsets
+                if 0 <= curX + offsetX < nRow and 0 <= curY + offsetY < nCol]
+
+    def __update_rhs(self, cell):
+        ''' Recomputes the lookahead distance of a cell from its neighbours and re-queues it if needed.
+
+        Args:
+            cell::[int]
+                The index of the cell
+
+        Returns:
+            None
+        '''
+        if cell == self.__end:
+            return
+
+        g = self.__g
+        cells = self.__grid.cells
+
+        best = math.inf
+        if cells[cell] != Grid.WALL:
+            for adjCell in self.__neighbours(cell):
+                if cells[adjCell] != Grid.WALL and g[adjCell] + 1 < best:
+                    best = g[adjCell] + 1
+        self.__rhs[cell] = best
+
+        self.__update_vertex(cell)
+
+    def __update_vertex(self, cell):
+        ''' Queues a cell if its distance and lookahead distance disagree, and dequeues it otherwise.
+
+        Args:
+            cell::[int]
+                The index of the cell
+
+        Returns:
+            None
+        '''
+        if self.__g[cell] != self.__rhs[cell]:
+            self.unsolved.push(cell, self.__calculate_key(cell), cell)
+            if self.__grid.cells[cell] == Grid.EMPTY:
+                self.__grid.set(cell, Grid.UNSOLVED)
+        else:
+            self.unsolved.remove(cell)
+
+    def __compute_shortest_path(self, tick):
+        ''' Expands inconsistent cells until the distance of the start cell is correct.
+
+        Args:
+            tick::[function]
+                Called once per expansion; the search stops if it returns False
+
+        Returns:
+            [bool]
+                Whether or not the start cell can reach the end cell
+        '''
+        start = self.__start
+        g = self.__g
+        rhs = self.__rhs
+        cells = self.__grid.cells
+        unsolved = self.unsolved
+
+        while len(unsolved) != 0 and (unsolved.peek_priority() < self.__calculate_key(start)
+                                      or rhs[start] > g[start]):
+            if not tick():
+                return False
+
+            oldKey = unsolved.peek_priority()
+            curCell = unsolved.pop()
+            newKey = self.__calculate_key(curCell)
+
+            # The key is out of date because the start moved since the cell was queued
+            if oldKey < newKey:
+                unsolved.push(curCell, newKey, curCell)
+                continue
+
+            self.__num_solved += 1
+            if cells[curCell] == Grid.UNSOLVED or cells[curCell] == Grid.EMPTY:
+                self.__grid.set(curCell, Grid.SOLVED)
+
+            if g[curCell] > rhs[curCell]:
+                # The cell got closer to the end, which may shorten its neighbours' distances
+                g[curCell] = rhs[curCell]
+                adjRhs = g[curCell] + 1
+                for adjCell in self.__neighbours(curCell):
+                    if adjCell != self.__end and cells[adjCell] != Grid.WALL and adjRhs < rhs[adjCell]:
+                        rhs[adjCell] = adjRhs
+                        self.__update_vertex(adjCell)
+            else:
+                # The cell got further from the end, so every neighbour that relied on it is recomputed
+                oldG = g[curCell]
+                g[curCell] = math.inf
+                self.__update_rhs(curCell)
+                for adjCell in self.__neighbours(curCell):
+                    if rhs[adjCell] == oldG + 1:
+                        self.__update_rhs(adjCell)
+
+        return rhs[start] != math.inf
+
+    def __extract_path(self):
+        ''' Follows the neighbours closest to the end from the start cell.
+
+        Args:
+            None
+
+        Returns:
+            [list]
+                The cell indices on the path from start to end, or None if no path was found
+        '''
+        g = self.__g
+        cells = self.__grid.cells
+        curCell = self.__start
+        pathCells = [curCell]
+
+        while curCell != self.__end:
+            nextCell = -1
+            best = math.inf
+            for adjCell in self.__neighbours(curCell):
+                if cells[adjCell] != Grid.WALL and g[adjCell] < best:
+                    nextCell = adjCell
+                    best = g[adjCell]
+
+            if nextCell == -1 or len(pathCells) > self.__grid.size:
+                return None
+
+            curCell = nextCell
+            pathCells.append(curCell)
+
+        return pathCells
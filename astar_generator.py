@@ -0,0 +1,443 @@
+from itertools import permutations
+import random
+
+
+# Fraction of cells that are walls in random fill mazes
+RANDOM_FILL_DENSITY = 0.3
+
+# Width of the square block holding each room in rooms-and-corridors mazes
+ROOM_BLOCK_WIDTH = 12
+
+# Probability of connecting two neighbouring rooms beyond the corridors needed to reach every room
+ROOM_LOOP_PROBABILITY = 0.1
+
+# The 24 orders in which the four lattice directions can be tried
+_DIRECTION_ORDERS = list(permutations(range(4)))
+
+# Random bytes at or above the largest multiple of 24 are rejected so that every direction order is equally likely
+_ORDER_BYTE_LIMIT = 256 - 256 % len(_DIRECTION_ORDERS)
+_REJECTED_ORDER_BYTES = bytes(range(_ORDER_BYTE_LIMIT, 256))
+
+# Translation table mapping accepted random bytes to indices of direction orders
+_ORDER_TABLE = bytes(byte % len(_DIRECTION_ORDERS) for byte in range(256))
+
+
+def _maze_data(width, plane, start, end):
+    ''' Clears the start and end of a wall plane and returns the maze data holding it.
+
+    Args:
+        width::[int]
+            The width of the square maze
+        plane::[bytearray]
+            The wall plane of the maze
+        start::[tuple]
+            The position of the start
+        end::[tuple]
+            The position of the end
+
+    Returns:
+        [dict]
+            The maze data with the wall plane ('wallPlane')
+    '''
+    plane[start[0] * width + start[1]] = 0
+    plane[end[0] * width + end[1]] = 0
+    return {
+        'gridWidth': width,
+        'start': list(start),
+        'end': list(end),
+        'wallPlane': plane
+    }
+
+
+def generate_open_field(width, rng=None):
+    ''' Generates a maze without any walls from the top-left to the bottom-right corner.
+
+    Args:
+        width::[int]
+            The width of the square maze
+        rng::[random.Random]
+            Unused, accepted for consistency with the other generators
+
+    Returns:
+        [dict]
+            The maze data with the wall plane ('wallPlane')
+    '''
+    return _maze_data(width, bytearray(width * width), (0, 0), (width - 1, width - 1))
+
+
+def generate_random_fill(width, rng, density=RANDOM_FILL_DENSITY):
+    ''' Generates a maze whose cells are walls with the given probability.
+    The start (top-left) and end (bottom-right) are never walls, but may be unreachable.
+
+    One random byte is drawn per cell, so the density is rounded to a multiple of 1/256.
+
+    Args:
+        width::[int]
+            The width of the square maze
+        rng::[random.Random]
+            The random number generator
+        density::[float]
+            The probability of a cell being a wall
+
+    Returns:
+        [dict]
+            The maze data with the wall plane ('wallPlane')
+    '''
+    if not 0 <= density <= 1:
+        raise ValueError('The wall density must be between 0 and 1. Received {} instead.'.format(density))
+
+    # Random bytes below the threshold become walls
+    threshold = round(density * 256)
+    table = b'\x01' * threshold + b'\x00' * (256 - threshold)
+
+    plane = bytearray(rng.randbytes(width * width).translate(table))
+    return _maze_data(width, plane, (0, 0), (width - 1, width - 1))
+
+
+def _random_orders(rng, count):
+    ''' Returns uniformly random indices of direction orders (see _DIRECTION_ORDERS), one per byte.
+
+    Args:
+        rng::[random.Random]
+            The random number generator
+        count::[int]
+            The number of indices
+
+    Returns:
+        [bytes]
+            The indices
+    '''
+    choices = b''
+    while len(choices) < count:
+        # Draw enough bytes that the rejected ones rarely leave a shortfall
+        numBytes = (count - len(choices)) * 256 // _ORDER_BYTE_LIMIT + 16
+        choices += rng.randbytes(numBytes).translate(_ORDER_TABLE, _REJECTED_ORDER_BYTES)
+    return choices[:count]
+
+
+def _lattice_plane(width):
+    ''' Returns a padded working plane for carving mazes whose passages lie on even coordinates.
+
+    The maze sits 2 cells in from each edge of a (width + 4) x (width + 4)
+    plane. Maze cells start as walls (1) and the padding is marked 2, so
+    stepping 2 cells past the edge of the maze never finds an uncarved cell
+    and the carving loops need no bounds checks.
+
+    Args:
+        width::[int]
+            The width of the square maze
+
+    Returns:
+        [tuple]
+            The working plane, its width, and the index of maze cell (0, 0) in it
+    '''
+    paddedWidth = width + 4
+    work = bytearray(b'\x02') * (paddedWidth * paddedWidth)
+    for x in range(width):
+        row = (x + 2) * paddedWidth + 2
+        work[row:row + width] = b'\x01' * width
+    return work, paddedWidth, 2 * paddedWidth + 2
+
+
+def _unpad(work, paddedWidth, width):
+    ''' Returns the wall plane of a maze carved into a padded working plane (see _lattice_plane()).
+
+    Args:
+        work::[bytearray]
+            The working plane
+        paddedWidth::[int]
+            The width of the working plane
+        width::[int]
+            The width of the square maze
+
+    Returns:
+        [bytearray]
+            The wall plane of the maze
+    '''
+    plane = bytearray()
+    for x in range(width):
+        row = (x + 2) * paddedWidth + 2
+        plane += work[row:row + width]
+    return plane
+
+
+def _lattice_maze_data(width, plane):
+    ''' Returns the maze data of a perfect maze carved on even coordinates, from the top-left to the bottom-right corner.
+    Even widths leave the last row and column as walls, so the corner is linked to the nearest passage.
+
+    Args:
+        width::[int]
+            The width of the square maze
+        plane::[bytearray]
+            The wall plane of the maze
+
+    Returns:
+        [dict]
+            The maze data with the wall plane ('wallPlane')
+    '''
+    if width % 2 == 0:
+        plane[(width - 2) * width + width - 1] = 0
+    return _maze_data(width, plane, (0, 0), (width - 1, width - 1))
+
+
+def _carve_backtracker(work, paddedWidth, origin, rng):
+    ''' Carves a perfect maze into a padded working plane with a recursive backtracker (see _lattice_plane()).
+
+    The recursion is replaced by a stack of cells waiting to be visited.
+    Popping a cell carves it and the wall to the cell that pushed it, then
+    pushes its unvisited neighbours in a random order. This visits the cells
+    in exactly the order of the recursive algorithm.
+
+    Args:
+        work::[bytearray]
+            The working plane
+        paddedWidth::[int]
+            The width of the working plane
+        origin::[int]
+            The index of the first passage in the working plane
+        rng::[random.Random]
+            The random number generator
+
+    Returns:
+        None
+    '''
+    # Offsets to the neighbouring passages and to the walls between them, per direction
+    steps = (2, -2, 2 * paddedWidth, -2 * paddedWidth)
+    halfSteps = (1, -1, paddedWidth, -paddedWidth)
+    orders = [tuple((steps[d], d) for d in order) for order in _DIRECTION_ORDERS]
+
+    # One random direction order per carved cell
+    numCells = (paddedWidth // 2) ** 2
+    choices = _random_orders(rng, numCells + 1)
+
+    # Entries hold the cell shifted left by 2 bits and the direction it was reached from in the low 2 bits
+    work[origin] = 0
+    stack = [origin + step << 2 | d for step, d in orders[choices[0] ] if work[origin + step] == 1]
+    push = stack.append
+    pop = stack.pop
+    i = 1
+
+    while stack:
+        entry = pop()
+        cell = entry >> 2
+        if work[cell] != 1:
+            continue
+
+        work[cell] = 0
+        work[cell - halfSteps[entry & 3]] = 0
+
+        for step, d in orders[choices[i] ]:
+            if work[cell + step] == 1:
+                push(cell + step << 2 | d)
+        i += 1
+
+
+def generate_backtracker(width, rng):
+    ''' Generates a perfect maze (exactly one path between any two passages) using a recursive backtracker.
+    Long winding corridors with few dead ends. Passages lie on even coordinates.
+
+    Args:
+        width::[int]
+            The width of the square maze
+        rng::[random.Random]
+            The random number generator
+
+    Returns:
+        [dict]
+            The maze data with the wall plane ('wallPlane')
+    '''
+    work, paddedWidth, origin = _lattice_plane(width)
+    _carve_backtracker(work, paddedWidth, origin, rng)
+    return _lattice_maze_data(width, _unpad(work, paddedWidth, width))
+
+
+def generate_prim(width, rng):
+    ''' Generates a perfect maze using randomized Prim's algorithm.
+    Short branching corridors with many dead ends. Passages lie on even coordinates.
+
+    The frontier holds the uncarved cells next to the carved ones. Each step
+    carves a random frontier cell, links it to a random carved neighbour,
+    and adds its uncarved neighbours to the frontier. Both are found in one
+    pass over the neighbours in a random order.
+
+    Args:
+        width::[int]
+            The width of the square maze
+        rng::[random.Random]
+            The random number generator
+
+    Returns:
+        [dict]
+            The maze data with the wall plane ('wallPlane')
+    '''
+    work, paddedWidth, origin = _lattice_plane(width)
+    steps = (2, -2, 2 * paddedWidth, -2 * paddedWidth)
+    orders = [tuple((steps[d], steps[d] >> 1) for d in order) for order in _DIRECTION_ORDERS]
+
+    # One random direction order per carved cell
+    numCells = (paddedWidth // 2) ** 2
+    choices = _random_orders(rng, numCells)
+    random_fraction = rng.random
+
+    # Frontier cells are marked 3 so they are only added once
+    FRONTIER = 3
+    frontier = [origin]
+    push = frontier.append
+    pop = frontier.pop
+    i = 0
+
+    while frontier:
+        # Remove a random frontier cell by moving the last one into its place
+        index = int(random_fraction() * len(frontier))
+        cell = frontier[index]
+        last = pop()
+        if index < len(frontier):
+            frontier[index] = last
+
+        work[cell] = 0
+        isLinked = cell == origin
+        for step, halfStep in orders[choices[i] ]:
+            state = work[cell + step]
+            if state == 1:
+                work[cell + step] = FRONTIER
+                push(cell + step)
+            elif state == 0 and not isLinked:
+                work[cell + halfStep] = 0
+                isLinked = True
+        i += 1
+
+    return _lattice_maze_data(width, _unpad(work, paddedWidth, width))
+
+
+def generate_rooms(width, rng, block_width=ROOM_BLOCK_WIDTH, loop_probability=ROOM_LOOP_PROBABILITY):
+    ''' Generates rectangular rooms joined by corridors.
+
+    The maze is split into square blocks holding one randomly sized room each.
+    Rooms in neighbouring blocks are joined by L-shaped corridors along a
+    random spanning tree of the blocks (so every room is reachable), and each
+    remaining pair of neighbours is joined with the given probability to add loops.
+    The start and end are the outer corners of the top-left and bottom-right rooms.
+
+    Args:
+        width::[int]
+            The width of the square maze
+        rng::[random.Random]
+            The random number generator
+        block_width::[int]
+            The width of the block holding each room (rooms leave a wall of at least 1 cell around them)
+        loop_probability::[float]
+            The probability of joining two neighbouring rooms that the spanning tree does not join
+
+    Returns:
+        [dict]
+            The maze data with the wall plane ('wallPlane')
+    '''
+    if block_width < 3:
+        raise ValueError('Rooms need blocks at least 3 cells wide. Received {} instead.'.format(block_width))
+
+    numBlocks = max(1, width // block_width)
+    blockWidth = width // numBlocks
+    plane = bytearray(b'\x01') * (width * width)
+
+    # Carve a room in every block, leaving walls on the top and left of the block
+    centres = []
+    corners = []
+    for blockX in range(numBlocks):
+        for blockY in range(numBlocks):
+            maxSide = max(1, blockWidth - 1)
+            height = rng.randint((maxSide + 1) // 2, maxSide)
+            length = rng.randint((maxSide + 1) // 2, maxSide)
+            top = blockX * blockWidth + min(1, blockWidth - 1) + rng.randint(0, maxSide - height)
+            left = blockY * blockWidth + min(1, blockWidth - 1) + rng.randint(0, maxSide - length)
+
+            for x in range(top, top + height):
+                plane[x * width + left:x * width + left + length] = bytes(length)
+            centres.append((top + height // 2, left + length // 2))
+            corners.append(((top, left), (top + height - 1, left + length - 1)))
+
+    # Join the rooms along a perfect maze of the blocks, in which passages are blocks and carved walls are corridors
+    latticeWidth = 2 * numBlocks - 1
+    work, paddedWidth, origin = _lattice_plane(latticeWidth)
+    _carve_backtracker(work, paddedWidth, origin, rng)
+    tree = _unpad(work, paddedWidth, latticeWidth)
+
+    for blockX in range(numBlocks):
+        for blockY in range(numBlocks):
+            block = blockX * numBlocks + blockY
+            for neighbour, wall in ((block + numBlocks, (2 * blockX + 1, 2 * blockY)),
+                                    (block + 1, (2 * blockX, 2 * blockY + 1))):
+                if wall[0] >= latticeWidth or wall[1] >= latticeWidth:
+                    continue
+                if tree[wall[0] * latticeWidth + wall[1]] == 0 or rng.random() < loop_probability:
+                    _carve_corridor(plane, width, centres[block], centres[neighbour])
+
+    # Only a single 1x1 room fits in the smallest mazes, so the start is placed in the wall above it
+    start = corners[0][0]
+    end = corners[-1][1]
+    if start == end:
+        start = (start[0] - 1, start[1])
+
+    return _maze_data(width, plane, start, end)
+
+
+def _carve_corridor(plane, width, a, b):
+    ''' Carves an L-shaped corridor between two cells: along the row of the first, then along the column of the second.
+
+    Args:
+        plane::[bytearray]
+            The wall plane
+        width::[int]
+            The width of the square maze
+        a::[tuple]
+            The position of the first cell
+        b::[tuple]
+            The position of the second cell
+
+    Returns:
+        None
+    '''
+    row = a[0] * width
+    left, right = min(a[1], b[1]), max(a[1], b[1])
+    plane[row + left:row + right + 1] = bytes(right - left + 1)
+
+    for x in range(min(a[0], b[0]), max(a[0], b[0]) + 1):
+        plane[x * width + b[1]] = 0
+
+
+# Generators selectable by name (see generate_maze()): (label, function)
+GENERATORS = {
+    'open': ('Open field', generate_open_field),
+    'random': ('Random fill', generate_random_fill),
+    'backtracker': ('Recursive backtracker', generate_backtracker),
+    'prim': ("Prim's algorithm", generate_prim),
+    'rooms': ('Rooms and corridors', generate_rooms)
+}
+
+
+def generate_maze(name, width, seed=None, **options):
+    ''' Generates a maze with the named generator.
+
+    Generators build the wall plane (see Grid.wall_plane()) with bulk byte
+    operations and flat index loops, so a 2000x2000 maze takes well under a
+    second. AStarModel.generate_maze() loads the plane straight into the grid.
+
+    Args:
+        name::[str]
+            The name of the generator (see GENERATORS)
+        width::[int]
+            The width of the square maze
+        seed::[int]
+            The seed of the random number generator (None for a random maze)
+        options::[dict]
+            Options of the generator (e.g. density for 'random')
+
+    Returns:
+        [dict]
+            The maze data with the wall plane ('wallPlane')
+    '''
+    if name not in GENERATORS:
+        raise ValueError('The maze generator [{}] does not exist. Choose one of: {}'.format(
+            name, ', '.join(GENERATORS)))
+
+    _, generator = GENERATORS[name]
+    return generator(width, random.Random(seed), **options)
@@ -0,0 +1,233 @@
+class Grid:
+    ''' A flat, row-major buffer holding the state of every cell in an nRow x nCol maze.
+
+    Each cell occupies a single byte storing the ordinal of its maze symbol, so symbol
+    lookups, wall checks, and solved checks are all a single index read. A cell at
+    position (x, y) lives at index x * nCol + y.
+
+    Symbols:
+        [space] - Empty
+        W - Wall
+        S - Start
+        E - End
+        ? - Unsolved
+        X - Solved
+        P - Path
+
+    Every state change made through set() (or recorded in dirty directly) is tracked
+    so that views only need to redraw the cells that changed since the last frame.
+
+    @params
+        nRow: the number of rows in the maze
+        nCol: the number of columns in the maze
+        track_changes: whether or not to record the cells that change state
+    '''
+
+    EMPTY = ord(' ')
+    WALL = ord('W')
+    START = ord('S')
+    END = ord('E')
+    UNSOLVED = ord('?')
+    SOLVED = ord('X')
+    PATH = ord('P')
+
+    # Cell states that are produced by a search (and cleared between searches)
+    SEARCH_STATES = (UNSOLVED, SOLVED, PATH)
+
+    # Translation table mapping walls to 1 and every other state to 0
+    __WALL_TABLE = bytes(WALL) + b'\x01' + bytes(255 - WALL)
+
+    # Translation tables between cell states and the digits of a binary number (walls are 1)
+    __WALL_DIGIT_TABLE = b'0' * WALL + b'1' + b'0' * (255 - WALL)
+    __DIGIT_WALL_TABLE = bytes(range(256)).translate(bytes.maketrans(b'01', bytes([EMPTY, WALL])))
+
+    # Translation table mapping the bytes of a wall plane (1 for walls, 0 otherwise) to cell states
+    __PLANE_WALL_TABLE = bytes([EMPTY, WALL]) + bytes([EMPTY]) * 254
+
+    # Translation table mapping search states to empty and keeping every other state
+    __CLEAR_SEARCH_TABLE = bytes(range(256)).translate(
+        bytes.maketrans(bytes(SEARCH_STATES), bytes([EMPTY]) * len(SEARCH_STATES)))
+
+    def __init__(self, nRow, nCol, track_changes=True):
+        self.nRow = nRow
+        self.nCol = nCol
+        self.size = nRow * nCol
+        self.cells = bytearray([self.EMPTY]) * self.size
+
+        # Indices of the cells that changed state since the last call to take_changes() (None if not tracking)
+        self.dirty = set() if track_changes else None
+
+    def index(self, pos):
+        return pos[0] * self.nCol + pos[1]
+
+    def position(self, cell):
+        return divmod(cell, self.nCol)
+
+    def get_symbol(self, pos):
+        return chr(self.cells[pos[0] * self.nCol + pos[1]])
+
+    def set(self, cell, state):
+        ''' Sets the state of a cell, recording it as changed if the state differs.
+
+        Args:
+            cell::[int]
+                The index of the cell
+            state::[int]
+                The new state of the cell (e.g. Grid.WALL)
+
+        Returns:
+            None
+        '''
+        if self.cells[cell] != state:
+            self.cells[cell] = state
+            if self.dirty is not None:
+                self.dirty.add(cell)
+
+    def take_changes(self):
+        ''' Returns the positions of the cells that changed state since the last call and forgets them.
+
+        Args:
+            None
+
+        Returns:
+            [list]
+                The positions of the changed cells
+        '''
+        if not self.dirty:
+            return []
+
+        changes = [divmod(cell, self.nCol) for cell in self.dirty]
+        self.dirty.clear()
+        return changes
+
+    def reset(self):
+        ''' Clears every cell back to empty.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        if self.dirty is not None:
+            for state in (self.WALL, self.START, self.END) + self.SEARCH_STATES:
+                self.dirty.update(self.find_all(state))
+
+        self.cells[:] = bytes([self.EMPTY]) * self.size
+
+    def clear_search(self):
+        ''' Clears the unsolved, solved, and path states left by a search.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        if self.dirty is None:
+            self.cells[:] = self.cells.translate(self.__CLEAR_SEARCH_TABLE)
+            return
+
+        for state in self.SEARCH_STATES:
+            for cell in self.find_all(state):
+                self.set(cell, self.EMPTY)
+
+    def find_all(self, state):
+        ''' Returns the indices of every cell in the given state.
+
+        Args:
+            state::[int]
+                The cell state to search for (e.g. Grid.WALL)
+
+        Returns:
+            [list]
+                The indices of the matching cells in ascending order
+        '''
+        matches = []
+        cells = self.cells
+        cell = cells.find(state)
+        while cell != -1:
+            matches.append(cell)
+            cell = cells.find(state, cell + 1)
+        return matches
+
+    def wall_plane(self):
+        ''' Returns one byte per cell that is 1 for walls and 0 otherwise.
+
+        Args:
+            None
+
+        Returns:
+            [bytes]
+                The wall plane in row-major order
+        '''
+        return self.cells.translate(self.__WALL_TABLE)
+
+    def wall_bits(self):
+        ''' Returns the wall plane packed into bits, eight cells per byte.
+        The first cell is the most significant bit of the first byte, and the last byte is padded with 0 bits.
+
+        Args:
+            None
+
+        Returns:
+            [bytes]
+                The packed wall plane in row-major order
+        '''
+        digits = self.cells.translate(self.__WALL_DIGIT_TABLE) + b'0' * (-self.size % 8)
+        return int(digits, 2).to_bytes(len(digits) // 8, 'big')
+
+    def load_wall_bits(self, bits):
+        ''' Clears every cell and places the walls of a packed wall plane (see wall_bits()).
+
+        Args:
+            bits::[bytes-like]
+                The packed wall plane in row-major order
+
+        Returns:
+            None
+        '''
+        num_bytes = (self.size + 7) // 8
+        if len(bits) != num_bytes:
+            raise ValueError('A packed wall plane of a {} x {} grid has {} bytes. Received {} bytes instead.'.format(
+                self.nRow, self.nCol, num_bytes, len(bits)))
+
+        self.reset()
+        digits = format(int.from_bytes(bits, 'big'), '0{}b'.format(num_bytes * 8))
+        self.cells[:] = digits[:self.size].encode('ascii').translate(self.__DIGIT_WALL_TABLE)
+
+        if self.dirty is not None:
+            self.dirty.update(self.find_all(self.WALL))
+
+    def load_wall_plane(self, plane):
+        ''' Clears every cell and places the walls of a wall plane (see wall_plane()).
+
+        Args:
+            plane::[bytes-like]
+                One byte per cell in row-major order, 1 for walls and 0 otherwise
+
+        Returns:
+            None
+        '''
+        if len(plane) != self.size:
+            raise ValueError('A wall plane of a {} x {} grid has {} bytes. Received {} bytes instead.'.format(
+                self.nRow, self.nCol, self.size, len(plane)))
+
+        self.reset()
+        self.cells[:] = bytes(plane).translate(self.__PLANE_WALL_TABLE)
+
+        if self.dirty is not None:
+            self.dirty.update(self.find_all(self.WALL))
+
+    def rows(self):
+        ''' Returns the maze as a list of rows, each row being a list of symbols.
+
+        Args:
+            None
+
+        Returns:
+            [list[list]]
+                A 2D array containing symbols that represent the maze
+        '''
+        text = self.cells.decode('ascii')
+        return [list(text[x * self.nCol:(x + 1) * self.nCol]) for x in range(self.nRow)]
@@ -1,9 +1,16 @@
 import threading
-import json
 import os
-from astar_model import AStarModel
+import queue
+import random
+from astar_generator import GENERATORS
+from astar_heuristic import HEURISTICS
+from astar_maze_file import BINARY_EXTENSION
+from astar_model import AStarModel, ENGINES, load_maze_data, save_maze_data
+from astar_pixel_renderer import PixelRenderer
+from astar_replay_window import ReplayWindow
+from astar_trace import TRACE_EXTENSION, TracePlayer
 from tkinter.ttk import Progressbar
-from tkinter import (Tk, Frame, Button, Label, Entry, Checkbutton, Scale, Canvas, messagebox, filedialog,
+from tkinter import (Tk, Frame, Button, Label, Entry, Checkbutton, Scale, Canvas, OptionMenu, messagebox, filedialog,
                      StringVar, IntVar,
                      DISABLED, NORMAL,
                      W, S, NW, EW, NSEW,
@@ -22,9 +29,21 @@ class AStarView(Tk):
         self.__VERSION = '1.0.0'
 
         # Grid width slider range
-        self.__MAX_GRID_WIDTH = 100
+        self.__MAX_GRID_WIDTH = 1000
         self.__MIN_GRID_WIDTH = 2
 
+        # Grids wider than this are drawn into a single pixel buffer instead of one canvas item per node
+        self.__MAX_RECTANGLE_GRID_WIDTH = 100
+
+        # Squares created between Tk events while reconfiguring
+        self.__RECONFIGURE_CHUNK_SIZE = 2000
+
+        # Milliseconds between polls of the solver's event queue
+        self.__SOLVER_POLL_INTERVAL = 1
+
+        # Frames the solver may get ahead of the grid drawn on screen
+        self.__SOLVER_QUEUE_SIZE = 1
+
         # Width of the control frame in pixels (you can modify this)
         self.__CONTROL_DIM_WIDTH = 250
 
@@ -54,10 +73,13 @@ class AStarView(Tk):
 
         # Button colours (you can change these)
         self.__COLOUR_RECONFIGURE_BUTTON = 'coral'
+        self.__COLOUR_GENERATE_BUTTON = 'light coral'
         self.__COLOUR_HOW_TO_USE_BUTTON = 'SlateGray2'
         self.__COLOUR_ABOUT_BUTTON = 'SlateGray1'
         self.__COLOUR_IMPORT_MAZE_BUTTON = 'sandy brown'
         self.__COLOUR_EXPORT_MAZE_BUTTON = 'dark salmon'
+        self.__COLOUR_SAVE_TRACE_BUTTON = 'light goldenrod'
+        self.__COLOUR_REPLAY_TRACE_BUTTON = 'khaki'
 
         # Maze colours (you can change these)
         self.__COLOUR_EMPTY = 'white'
@@ -93,12 +115,46 @@ class AStarView(Tk):
                       'v{}'.format(self.__VERSION)),
         }
 
+        # Solver speed presets from slowest to fastest: (label, expansions per frame, frames per second)
+        self.__SOLVER_SPEEDS = [
+            ('1 node per frame', 1, 0),
+            ('10 nodes per frame', 10, 0),
+            ('100 nodes per frame', 100, 0),
+            ('30 frames per second', 0, 30),
+            ('Draw result only', 0, 0)
+        ]
+
+        # Menu label of each heuristic setting
+        self.__HEURISTIC_LABELS = {'auto': 'Auto (tightest admissible)'}
+        self.__HEURISTIC_LABELS.update((name, label) for name, (label, _) in HEURISTICS.items())
+        self.__HEURISTIC_LABELS['alt'] = 'ALT (landmarks)'
+
         # Contains the GUI representaiton of model.settings
         self.cb_values = {}
 
+        # Index of the selected solver speed preset
+        self.__solver_speed = 0
+
+        # Name of the selected search engine (see astar_model.ENGINES)
+        self.__engine = 'astar'
+
+        # Name of the selected heuristic (see astar_heuristic.HEURISTICS, or 'auto')
+        self.__heuristic = 'auto'
+
+        # Name of the selected maze generator (see astar_generator.GENERATORS)
+        self.__generator = 'backtracker'
+
         # Disables mouse and keyboard events while True
         self.__is_reconfiguring = False
 
+        # The thread running the solver and the queue of changes it sends to the GUI (None while stopped)
+        self.__solver_thread = None
+        self.__solver_events = None
+
+        # The trace to replay once its maze is imported, and the window replaying a trace (None if not replaying)
+        self.__pending_replay = None
+        self.__replay_window = None
+
         # Initialize the backing model
         self.__initialize_model(width, width)
 
@@ -121,6 +177,9 @@ class AStarView(Tk):
 
         # Set the model settings to the GUI settings during reconfiguration
         self.__handle_cb()
+        self.__apply_solver_speed()
+        self.model.set_setting('engine', self.__engine)
+        self.model.set_setting('heuristic', self.__heuristic)
 
         # Disable print to console
         self.model.set_setting('enablePrintToConsole', False)
@@ -170,12 +229,20 @@ class AStarView(Tk):
         # Interactive GUI components are disabled during reconfiguration
         self.__interactive_gui_components = [self.grid_width_slider,
                                              self.__reconfigure_button,
+                                             self.__generator_menu,
+                                             self.__generate_button,
                                              self.__cb_diagonal,
                                              self.__cb_grid_lines,
+                                             self.solver_speed_slider,
+                                             self.__engine_menu,
+                                             self.__heuristic_menu,
                                              self.__how_to_use_button,
                                              self.__about_button,
                                              self.__import_button,
                                              self.__export_button,
+                                             self.__cb_record_trace,
+                                             self.__save_trace_button,
+                                             self.__replay_trace_button,
                                              self.start_stop_button]
 
     def __initialize_configuration_frame(self, master):
@@ -235,11 +302,27 @@ class AStarView(Tk):
                                        sticky=EW,
                                        columnspan=2)
 
+        # Maze generator menu
+        self.generator_var = StringVar(value=GENERATORS[self.__generator][0])
+        self.__generator_menu = OptionMenu(configuration_frame,
+                                           self.generator_var,
+                                           *[label for label, _ in GENERATORS.values()],
+                                           command=self.__handle_generator_change)
+        self.__generator_menu.grid(row=4, column=0, sticky=EW)
+
+        # Generate button
+        self.__generate_button = Button(
+            configuration_frame,
+            text='Generate',
+            bg=self.__COLOUR_GENERATE_BUTTON,
+            command=self.__handle_generate)
+        self.__generate_button.grid(row=4, column=1, sticky=EW)
+
         # Progress bar for reconfiguration
         self.__progress_bar = Progressbar(
             configuration_frame,
             orient=HORIZONTAL,
-            mode='indeterminate')
+            mode='determinate')
 
     def __initialize_options_frame(self, master):
         ''' Initializes the options frame which is a child of the control frame.
@@ -285,6 +368,48 @@ class AStarView(Tk):
             command=self.__handle_show_grid_lines)
         self.__cb_grid_lines.grid(row=2, column=0, sticky=W)
 
+        # Solver speed label
+        self.solver_speed_label = Label(
+            options_frame,
+            text='Solver speed: {}'.format(self.__SOLVER_SPEEDS[self.__solver_speed][0]))
+        self.solver_speed_label.grid(row=3, column=0, sticky=W)
+
+        # Solver speed slider
+        self.solver_speed_slider = Scale(options_frame,
+                                         width=20,
+                                         from_=0,
+                                         to=len(self.__SOLVER_SPEEDS) - 1,
+                                         orient=HORIZONTAL,
+                                         showvalue=False,
+                                         command=self.__handle_solver_speed_change)
+        self.solver_speed_slider.set(self.__solver_speed)
+        self.solver_speed_slider.grid(row=4, column=0, sticky=EW)
+
+        # Search engine label
+        engine_label = Label(options_frame, text='Search engine:')
+        engine_label.grid(row=5, column=0, sticky=W)
+
+        # Search engine menu
+        self.engine_var = StringVar(value=ENGINES[self.__engine].LABEL)
+        self.__engine_menu = OptionMenu(options_frame,
+                                        self.engine_var,
+                                        *[engine.LABEL for engine in ENGINES.values()],
+                                        command=self.__handle_engine_change)
+        self.__engine_menu.grid(row=6, column=0, sticky=EW)
+
+        # Heuristic label
+        heuristic_label = Label(options_frame, text='Heuristic:')
+        heuristic_label.grid(row=7, column=0, sticky=W)
+
+        # Heuristic menu
+        self.heuristic_var = StringVar(value=self.__HEURISTIC_LABELS[self.__heuristic])
+        self.__heuristic_menu = OptionMenu(options_frame,
+                                           self.heuristic_var,
+                                           *self.__HEURISTIC_LABELS.values(),
+                                           command=self.__handle_heuristic_change)
+        self.__heuristic_menu.grid(row=8, column=0, sticky=EW)
+        self.__update_heuristic_menu()
+
     def __initialize_import_export_frame(self, master):
         ''' Initializes the Import / Export frame which is a child of the control frame.
 
@@ -325,6 +450,31 @@ class AStarView(Tk):
                                       command=self.__handle_export)
         self.__export_button.grid(row=1, column=1, sticky=EW)
 
+        # Record search trace Checkbutton
+        self.record_trace = IntVar(
+            value=self.model.get_setting('recordTrace'))
+        self.cb_values['recordTrace'] = self.record_trace
+        self.__cb_record_trace = Checkbutton(
+            import_export_frame,
+            text='Record search trace',
+            variable=self.record_trace,
+            command=self.__handle_cb)
+        self.__cb_record_trace.grid(row=2, column=0, sticky=W, columnspan=2)
+
+        # Save trace button
+        self.__save_trace_button = Button(import_export_frame,
+                                          text="Save Trace",
+                                          bg=self.__COLOUR_SAVE_TRACE_BUTTON,
+                                          command=self.__handle_save_trace)
+        self.__save_trace_button.grid(row=3, column=0, sticky=EW)
+
+        # Replay trace button
+        self.__replay_trace_button = Button(import_export_frame,
+                                            text="Replay Trace",
+                                            bg=self.__COLOUR_REPLAY_TRACE_BUTTON,
+                                            command=self.__handle_replay_trace)
+        self.__replay_trace_button.grid(row=3, column=1, sticky=EW)
+
     def __initialize_stats_frame(self, master):
         ''' Initializes the stats frame which is a child of the control frame.
 
@@ -413,6 +563,34 @@ class AStarView(Tk):
         )
         elapsed_time_dynamic_label.grid(row=4, column=1, sticky=W)
 
+        # Suboptimality bound label
+        self.bound_label_var = StringVar()
+        bound_static_label = Label(
+            stats_frame,
+            text='Suboptimality Bound'
+        )
+        bound_static_label.grid(row=5, column=0, sticky=W)
+
+        bound_dynamic_label = Label(
+            stats_frame,
+            textvariable=self.bound_label_var
+        )
+        bound_dynamic_label.grid(row=5, column=1, sticky=W)
+
+        # Landmarks label
+        self.landmarks_label_var = StringVar()
+        landmarks_static_label = Label(
+            stats_frame,
+            text='Landmarks'
+        )
+        landmarks_static_label.grid(row=6, column=0, sticky=W)
+
+        landmarks_dynamic_label = Label(
+            stats_frame,
+            textvariable=self.landmarks_label_var
+        )
+        landmarks_dynamic_label.grid(row=6, column=1, sticky=W)
+
     def __initialize_help_frame(self, master):
         # The help frame itself
         help_frame = Frame(master)
@@ -458,127 +636,226 @@ class AStarView(Tk):
 
         # Colour the entire grid initially
         self.__POS_TO_SQUARE = {}
-
-        all_indices = [(x, y) for x in range(self.model.get_nrow())
-                       for y in range(self.model.get_ncol())]
-
-        self.update_gui(maze=self.model.get_curr_maze(),
-                        diff_positions=all_indices,
-                        is_rapid_config=False)
+        self.__pixel_renderer = None
+        self.__create_squares(self.__resize_squares(self.model.get_nrow()))
+        self.__draw_all()
 
     '''
     GUI HANDLERS.
     '''
 
     def __handle_reconfigure(self, is_importing=False, loaded_maze=None):
+        # Make sure that the solver is stopped
+        if not self.__is_solver_running():
+            # Display confirmation dialog
+            is_reconfiguring = messagebox.askyesno(title='Reconfigure',
+                                                   message=('Are you sure you want to reconfigure?\n'
+                                                            'All walls will be erased.'),
+                                                   icon='warning')
+            if is_reconfiguring == YES:
+                self.__start_reconfiguration(is_importing, loaded_maze)
+        else:
+            messagebox.showerror(title='Failed to Reconfigure',
+                                 message='Cannot reconfigure while the solver is running.')
 
-        def reconfiguration_thread():
-            # Disable mouse and keyboard events
-            self.__is_reconfiguring = True
+    def __start_reconfiguration(self, is_importing, loaded_maze):
+        ''' Recreates the backing model and starts resizing the grid of squares to match it.
 
-            # Change the grid width slider before the GUI is disabled
-            if is_importing:
-                # Move the grid width slider to the new grid width
-                self.grid_width_slider.set(loaded_maze['gridWidth'])
+        Existing squares are rescaled and reused. Missing squares are created
+        a chunk at a time between Tk events (see __continue_reconfiguration()),
+        advancing the progress bar after each chunk.
 
-                # Update the grid width label
-                self.grid_width_label.configure(
-                    text='Grid width: {}'.format(self.grid_width_slider.get()))
+        Args:
+            is_importing::[bool]
+                Whether or not the reconfiguration was triggered by an import
+            loaded_maze::[dict]
+                The imported maze data (None if not importing)
 
-            # Disable interactive GUI components
-            self.__disable_gui()
+        Returns:
+            None
+        '''
+        # Disable mouse and keyboard events
+        self.__is_reconfiguring = True
 
-            # Set the new grid width to the one in the imported file if importing, otherwise use the slider value
-            print('{}...'.format(
-                'Importing maze' if is_importing else 'Reconfiguring'))
+        # The replayed maze is about to be replaced
+        self.__stop_replay()
 
-            new_width = loaded_maze['gridWidth'] if is_importing else int(
-                self.grid_width_slider.get())
+        # Change the grid width slider before the GUI is disabled
+        if is_importing:
+            # Move the grid width slider to the new grid width
+            self.grid_width_slider.set(loaded_maze['gridWidth'])
 
-            # Replace the Reconfigure button with the progress bar
-            self.__reconfigure_button.grid_remove()
-            self.__progress_bar.grid(row=3, column=0, sticky=EW, columnspan=2)
-            self.__progress_bar.start()
+            # Update the grid width label
+            self.grid_width_label.configure(
+                text='Grid width: {}'.format(self.grid_width_slider.get()))
 
-            # The long reconfiguration task
-            reconfigure(new_width=new_width,
-                        is_importing=is_importing,
-                        loaded_maze=loaded_maze)
+        # Disable interactive GUI components
+        self.__disable_gui()
 
-            # Replace the progress bar with the Reconfigure button
-            self.__progress_bar.stop()
-            self.__progress_bar.grid_forget()
-            self.__reconfigure_button.grid(
-                row=3, column=0, sticky=EW, columnspan=2)
+        # Set the new grid width to the one in the imported file if importing, otherwise use the slider value
+        print('{}...'.format(
+            'Importing maze' if is_importing else 'Reconfiguring'))
 
-            # Re-enable mouse and keyboard events
-            self.__is_reconfiguring = False
+        new_width = loaded_maze['gridWidth'] if is_importing else int(
+            self.grid_width_slider.get())
 
-            # Re-enable interactive GUI components
-            self.__enable_gui()
+        # Recreate the backing model and rescale the squares already on the canvas
+        old_width = self.model.get_nrow()
+        self.__initialize_model(new_width, new_width)
+        missing_positions = self.__resize_squares(old_width)
 
-            print('{} complete!'.format(
-                'Import' if is_importing
-                else 'Reconfiguration'))
-
-            # Show success dialog
-            self.__show_info_dialog(
-                title='{} Complete'.format(
-                    'Import' if is_importing else 'Reconfiguration'),
-                message='Successfully {} a {} x {} maze!'.format('imported' if is_importing else 'configured',
-                                                                 self.model.get_nrow(),
-                                                                 self.model.get_ncol()))
-
-        def reconfigure(new_width, is_importing, loaded_maze):
-            # Recreate the backing model and redraw the GUI
-            self.__initialize_model(new_width, new_width)
-            self.__POS_TO_SQUARE = {}
-            self.canvas.delete('all')
+        # Replace the Reconfigure button with the progress bar
+        self.__reconfigure_button.grid_remove()
+        self.__progress_bar.configure(maximum=max(len(missing_positions), 1), value=0)
+        self.__progress_bar.grid(row=3, column=0, sticky=EW, columnspan=2)
 
-            # Colour the entire grid initially
-            all_indices = [(x, y) for x in range(self.model.get_nrow())
-                           for y in range(self.model.get_ncol())]
+        self.__continue_reconfiguration(missing_positions, 0, is_importing, loaded_maze)
 
-            self.update_gui(maze=self.model.get_curr_maze(),
-                            diff_positions=all_indices,
-                            is_rapid_config=False)
+    def __continue_reconfiguration(self, missing_positions, num_created, is_importing, loaded_maze):
+        ''' Creates the next chunk of missing squares, then schedules the next chunk or finishes the reconfiguration.
 
-            # Update model with the imported data if the reconfiguration was triggered by an import
-            if is_importing and loaded_maze is not None:
-                self.model.import_maze_data(loaded_maze)
+        Args:
+            missing_positions::[list]
+                The positions of the squares that do not exist yet
+            num_created::[int]
+                The number of those squares created so far
+            is_importing::[bool]
+                Whether or not the reconfiguration was triggered by an import
+            loaded_maze::[dict]
+                The imported maze data (None if not importing)
 
-        # Make sure that the solver is stopped
-        if not self.model.is_solving():
-            # Display confirmation dialog
-            is_reconfiguring = messagebox.askyesno(title='Reconfigure',
-                                                   message=('Are you sure you want to reconfigure?\n'
-                                                            'All walls will be erased.'),
-                                                   icon='warning')
-            if is_reconfiguring == YES:
-                threading.Thread(target=reconfiguration_thread).start()
+        Returns:
+            None
+        '''
+        chunk = missing_positions[num_created:num_created + self.__RECONFIGURE_CHUNK_SIZE]
+        self.__create_squares(chunk)
+        num_created += len(chunk)
+        self.__progress_bar.configure(value=num_created)
+
+        if num_created < len(missing_positions):
+            # Let Tk redraw the progress bar before the next chunk
+            self.after(1, self.__continue_reconfiguration,
+                       missing_positions, num_created, is_importing, loaded_maze)
         else:
-            messagebox.showerror(title='Failed to Reconfigure',
-                                 message='Cannot reconfigure while the solver is running.')
+            self.__finish_reconfiguration(is_importing, loaded_maze)
+
+    def __finish_reconfiguration(self, is_importing, loaded_maze):
+        ''' Colours the resized grid, restores the GUI, and reports the new maze.
+
+        Args:
+            is_importing::[bool]
+                Whether or not the reconfiguration was triggered by an import
+            loaded_maze::[dict]
+                The imported maze data (None if not importing)
+
+        Returns:
+            None
+        '''
+        # Colour the entire grid, then update model with the imported data if the reconfiguration was triggered by an import
+        self.__draw_all()
+        if is_importing and loaded_maze is not None:
+            self.model.import_maze_data(loaded_maze)
+
+        # Replace the progress bar with the Reconfigure button
+        self.__progress_bar.grid_forget()
+        self.__reconfigure_button.grid(
+            row=3, column=0, sticky=EW, columnspan=2)
+
+        # Re-enable mouse and keyboard events
+        self.__is_reconfiguring = False
+
+        # Re-enable interactive GUI components
+        self.__enable_gui()
+
+        print('{} complete!'.format(
+            'Import' if is_importing
+            else 'Reconfiguration'))
+
+        # Replay the trace the maze was imported from
+        if self.__pending_replay is not None:
+            self.__start_replay(self.__pending_replay)
+            self.__pending_replay = None
+            return
+
+        # Show success dialog
+        self.__show_info_dialog(
+            title='{} Complete'.format(
+                'Import' if is_importing else 'Reconfiguration'),
+            message='Successfully {} a {} x {} maze!'.format('imported' if is_importing else 'configured',
+                                                             self.model.get_nrow(),
+                                                             self.model.get_ncol()))
 
     def __handle_grid_width_slider_change(self, event):
         self.grid_width_label.configure(
             text='Grid width: {}'.format(self.grid_width_slider.get()))
 
+    def __handle_generator_change(self, label):
+        self.__generator = next(name for name, (generatorLabel, _) in GENERATORS.items()
+                                if generatorLabel == label)
+
+    def __handle_generate(self):
+        if not self.__is_solver_running() and not self.__is_reconfiguring:
+            # The generated maze replaces the replayed one
+            self.__stop_replay()
+
+            # Print the seed so that the maze can be generated again headlessly
+            seed = random.randrange(2 ** 32)
+            print('Generating a {} x {} maze with {} (seed {})...'.format(
+                self.model.get_nrow(), self.model.get_ncol(), self.__generator, seed))
+            self.model.generate_maze(self.__generator, seed=seed)
+
     def __handle_cb(self):
         for k, v in self.cb_values.items():
             self.model.set_setting(k, bool(v.get()))
 
+    def __handle_solver_speed_change(self, value):
+        self.__solver_speed = int(float(value))
+        self.solver_speed_label.configure(
+            text='Solver speed: {}'.format(self.__SOLVER_SPEEDS[self.__solver_speed][0]))
+        self.__apply_solver_speed()
+
+    def __apply_solver_speed(self):
+        _, expansions_per_frame, frames_per_second = self.__SOLVER_SPEEDS[self.__solver_speed]
+        self.model.set_setting('expansionsPerFrame', expansions_per_frame)
+        self.model.set_setting('framesPerSecond', frames_per_second)
+
+    def __handle_engine_change(self, label):
+        self.__engine = next(name for name, engine in ENGINES.items() if engine.LABEL == label)
+        self.model.set_setting('engine', self.__engine)
+        self.__update_heuristic_menu()
+
+    def __update_heuristic_menu(self):
+        ''' Only offers the ALT heuristic for engines that accept landmarks, switching to 'auto' if it is selected for another engine.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        is_alt_supported = hasattr(ENGINES[self.__engine], 'set_landmarks')
+        alt_index = list(self.__HEURISTIC_LABELS).index('alt')
+        self.__heuristic_menu['menu'].entryconfigure(alt_index, state=NORMAL if is_alt_supported else DISABLED)
+
+        if not is_alt_supported and self.__heuristic == 'alt':
+            self.__heuristic = 'auto'
+            self.heuristic_var.set(self.__HEURISTIC_LABELS[self.__heuristic])
+            self.model.set_setting('heuristic', self.__heuristic)
+
+    def __handle_heuristic_change(self, label):
+        self.__heuristic = next(name for name, heuristicLabel in self.__HEURISTIC_LABELS.items()
+                                if heuristicLabel == label)
+        self.model.set_setting('heuristic', self.__heuristic)
+
     def __handle_show_grid_lines(self):
         # Determine outline colour
         outline_colour = 'gray' if self.show_grid_lines.get() else ''
 
         # Colour all square outlines
-        for pos in self.__POS_TO_SQUARE:
-            square = self.__POS_TO_SQUARE[pos]
-            self.canvas.itemconfig(square, outline=outline_colour)
+        self.canvas.itemconfig('square', outline=outline_colour)
 
     def __handle_import(self):
-        if not self.model.is_solving():
+        if not self.__is_solver_running():
             # Display load file dialog
             filename = filedialog.askopenfilename(parent=self,
                                                   title='Import Maze',
@@ -586,12 +863,8 @@ class AStarView(Tk):
 
             if filename != '':
                 try:
-                    # Read the contents of the file
-                    with open(filename, 'r') as file:
-                        content = file.readlines()
-
-                    # Assign the file contents to a dictionary
-                    loaded_maze = json.loads(content[0])
+                    # Read the contents of the file into a dictionary
+                    loaded_maze = load_maze_data(filename)
 
                     # Reconfigure the maze using the imported data
                     self.__handle_reconfigure(
@@ -601,29 +874,70 @@ class AStarView(Tk):
                         filename))
 
     def __handle_export(self):
-        if not self.model.is_solving():
+        if not self.__is_solver_running():
             # Display save file dialog
-            filetypes = [('JSON', '*.json')]
+            filetypes = [('JSON', '*.json'), ('Binary maze', '*' + BINARY_EXTENSION)]
             filename = filedialog.asksaveasfilename(parent=self,
                                                     title='Export Maze',
                                                     initialfile='my_astar_maze',
                                                     defaultextension='.json',
                                                     filetypes=filetypes)
 
-            # Prepare the current maze configuration data
-            curr_maze = {
-                'gridWidth': self.model.get_nrow(),
-                'start': self.model.get_start(),
-                'end': self.model.get_end(),
-                'walls': list(self.model.get_walls())
-            }
-
             # Write to the file
             if filename != '':
-                with open(filename, 'w') as file:
-                    file.write(json.dumps(curr_maze))
+                # Prepare the current maze configuration data (binary files store the packed wall plane)
+                curr_maze = {
+                    'gridWidth': self.model.get_nrow(),
+                    'start': self.model.get_start(),
+                    'end': self.model.get_end()
+                }
+                if filename.endswith(BINARY_EXTENSION):
+                    curr_maze['wallBits'] = self.model.get_wall_bits()
+                else:
+                    curr_maze['walls'] = list(self.model.get_walls())
+
+                save_maze_data(filename, curr_maze)
                 print('Successfully exported maze configuration to {}.'.format(filename))
 
+    def __handle_save_trace(self):
+        if not self.__is_solver_running():
+            # Display save file dialog
+            filename = filedialog.asksaveasfilename(parent=self,
+                                                    title='Save Trace',
+                                                    initialfile='my_astar_trace',
+                                                    defaultextension=TRACE_EXTENSION,
+                                                    filetypes=[('Search trace', '*' + TRACE_EXTENSION)])
+
+            if filename != '':
+                try:
+                    self.model.save_trace(filename)
+                except ValueError as error:
+                    self.__show_error_dialog(title='Failed to Save Trace', message=str(error))
+                else:
+                    print('Successfully saved search trace to {}.'.format(filename))
+
+    def __handle_replay_trace(self):
+        if not self.__is_solver_running():
+            # Display load file dialog
+            filename = filedialog.askopenfilename(parent=self,
+                                                  title='Replay Trace',
+                                                  filetypes=[('Search trace', '*' + TRACE_EXTENSION)])
+
+            if filename != '':
+                try:
+                    player = TracePlayer(filename)
+                except Exception:
+                    print('Failed to replay trace from {}: Incompatible or corrupted file'.format(
+                        filename))
+                    return
+
+                # Import the traced maze, then replay the trace once the grid is ready (see __finish_reconfiguration())
+                self.__pending_replay = player
+                self.__handle_reconfigure(
+                    is_importing=True, loaded_maze=player.maze_data)
+                if not self.__is_reconfiguring:
+                    self.__pending_replay = None
+
     '''
     EVENT HANDLERS.
     '''
@@ -644,7 +958,7 @@ class AStarView(Tk):
             return (square_pos_x, square_pos_y)
 
         # Validate that the solver is stopped, the GUI is not reconfiguring, and the position is good
-        if (not self.model.is_solving()
+        if (not self.__is_solver_running()
             and not self.__is_reconfiguring
             and event.widget == self.canvas
                 and is_event_pos_valid()):
@@ -684,7 +998,7 @@ class AStarView(Tk):
 
             # Press [Esc] to quit the application
             elif key_code == 'Escape':
-                if not self.model.is_solving():
+                if not self.__is_solver_running():
                     # Display confirmation dialog
                     is_quitting = messagebox.askyesno(title='Exit Application',
                                                       message='Are you sure you want to exit the application?',
@@ -719,18 +1033,117 @@ class AStarView(Tk):
     UTILITY METHODS.
     '''
 
+    def __start_replay(self, player):
+        ''' Opens the replay window for a trace whose maze was just imported.
+
+        Args:
+            player::[TracePlayer]
+                The player of the trace
+
+        Returns:
+            None
+        '''
+        self.__stop_replay()
+
+        maze = self.model.get_curr_maze()
+        maze_version = self.model.get_maze_version()
+
+        def is_current():
+            return (not self.__is_solver_running() and not self.__is_reconfiguring
+                    and self.model.get_curr_maze() is maze and self.model.get_maze_version() == maze_version)
+
+        self.__replay_window = ReplayWindow(self,
+                                            player,
+                                            grid=maze,
+                                            draw=lambda diff_positions: self.__draw_maze(maze, diff_positions),
+                                            is_current=is_current)
+
+    def __stop_replay(self):
+        if self.__replay_window is not None:
+            if self.__replay_window.winfo_exists():
+                self.__replay_window.close()
+            self.__replay_window = None
+
     def __toggle_solver(self):
-        if not self.model.is_solving():
+        if not self.__is_solver_running():
+            # A replay would draw over the search
+            self.__stop_replay()
+
             # Disable everything in the GUI except the Start / Stop button and the Show grid lines Checkbutton
             self.__disable_gui()
-            self.start_stop_button.configure(state=NORMAL)
+            self.start_stop_button.configure(state=NORMAL, text='STOP', bg='salmon')
             self.__cb_grid_lines.configure(state=NORMAL)
-            self.model.solve()
+
+            # Solve on a worker thread and draw its changes as they arrive
+            self.__solver_events = queue.Queue(maxsize=self.__SOLVER_QUEUE_SIZE)
+            self.__solver_thread = threading.Thread(target=self.__run_solver,
+                                                    args=(self.model, self.__solver_events),
+                                                    daemon=True)
+            self.__solver_thread.start()
+            self.after(self.__SOLVER_POLL_INTERVAL, self.__poll_solver_events)
         else:
+            # The GUI is re-enabled once the solver thread reports that it finished
             print('Solver stopped.')
-            self.__enable_gui()
             self.model.stop_solving()
 
+    def __is_solver_running(self):
+        return self.__solver_thread is not None
+
+    def __run_solver(self, model, events):
+        ''' Solves the maze on the solver thread, reporting how the search ended on the event queue.
+
+        Args:
+            model::[AStarModel]
+                The model to solve
+            events::[queue.Queue]
+                The queue the changes of the search are put on
+
+        Returns:
+            None
+        '''
+        try:
+            is_found = model.solve(events=events)
+        except Exception as error:
+            events.put(('error', error))
+        else:
+            events.put(('done', is_found))
+
+    def __poll_solver_events(self):
+        ''' Draws the changes the solver thread queued since the last poll.
+        Polls again later until the solver thread finishes.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        diff_positions = set()
+        is_finished = False
+        error = None
+
+        # Only drain the events queued so far, or a fast solver could keep the GUI from ever drawing
+        for _ in range(self.__solver_events.qsize()):
+            kind, value = self.__solver_events.get_nowait()
+            if kind == 'changes':
+                diff_positions.update(value)
+            else:
+                is_finished = True
+                if kind == 'error':
+                    error = value
+
+        if is_finished:
+            self.__solver_thread = None
+            self.__solver_events = None
+
+        self.__draw_maze(maze=self.model.get_curr_maze(),
+                         diff_positions=list(diff_positions))
+
+        if error is not None:
+            self.__show_error_dialog(title='Failed to Solve', message=str(error))
+        elif not is_finished:
+            self.after(self.__SOLVER_POLL_INTERVAL, self.__poll_solver_events)
+
     def __disable_gui(self):
         for component in self.__interactive_gui_components:
             component.configure(state=DISABLED)
@@ -749,6 +1162,111 @@ class AStarView(Tk):
     UPDATE METHOD.
     '''
 
+    def __create_pixel_renderer(self):
+        ''' Creates a pixel buffer renderer if the grid is too wide to draw one canvas item per node.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        self.__pixel_renderer = None
+        if self.model.get_nrow() > self.__MAX_RECTANGLE_GRID_WIDTH:
+            self.__pixel_renderer = PixelRenderer(self.canvas,
+                                                  width=self.__GRID_DIM_WIDTH,
+                                                  nRow=self.model.get_nrow(),
+                                                  nCol=self.model.get_ncol(),
+                                                  colours={ord(symbol): colour for symbol, colour
+                                                           in self.__SYMBOL_TO_COLOUR.items()})
+
+    def __resize_squares(self, old_width):
+        ''' Fits the squares on the canvas to the grid of the current model.
+
+        Squares outside the new grid are deleted and the rest are rescaled in
+        place, each with a single Tk call. Grids drawn into a pixel buffer have
+        no squares at all.
+
+        Args:
+            old_width::[int]
+                The width of the grid the squares were drawn for
+
+        Returns:
+            [list]
+                The positions of the squares that still have to be created
+        '''
+        new_width = self.model.get_nrow()
+
+        # The pixel buffer of the previous grid is replaced
+        if self.__pixel_renderer is not None:
+            self.canvas.delete(self.__pixel_renderer.item)
+        self.__create_pixel_renderer()
+        self.__calculate_square_width()
+
+        if self.__pixel_renderer is not None:
+            self.canvas.delete('square')
+            self.__POS_TO_SQUARE = {}
+            return []
+
+        removed_positions = [(x, y) for x, y in self.__POS_TO_SQUARE
+                             if x >= new_width or y >= new_width]
+        if removed_positions:
+            self.canvas.delete(*[self.__POS_TO_SQUARE.pop(pos) for pos in removed_positions])
+
+        if self.__POS_TO_SQUARE and old_width != new_width:
+            self.canvas.scale('square', 0, 0, old_width / new_width, old_width / new_width)
+
+        return [(x, y) for x in range(new_width) for y in range(new_width)
+                if (x, y) not in self.__POS_TO_SQUARE]
+
+    def __create_squares(self, positions):
+        ''' Creates empty squares at the given positions with a single Tcl call.
+
+        Args:
+            positions::[list]
+                The positions of the squares to create
+
+        Returns:
+            None
+        '''
+        if not positions:
+            return
+
+        width = self.__SQUARE_WIDTH
+        options = '-fill {{{}}} -outline {{{}}} -tags square'.format(
+            self.__COLOUR_EMPTY, 'gray' if self.show_grid_lines.get() else '')
+        script = 'list ' + ' '.join(['[{} create rectangle {} {} {} {} {}]'.format(self.canvas,
+                                                                                 x * width,
+                                                                                 y * width,
+                                                                                 (x + 1) * width,
+                                                                                 (y + 1) * width,
+                                                                                 options)
+                                     for x, y in positions])
+
+        squares = self.tk.splitlist(self.tk.eval(script))
+        self.__POS_TO_SQUARE.update(zip(positions, map(int, squares)))
+
+    def __draw_all(self):
+        ''' Colours every square of the grid according to the model.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        maze = self.model.get_curr_maze()
+
+        # Empty the whole grid at once, then colour the remaining nodes one by one
+        if self.__pixel_renderer is not None:
+            self.__pixel_renderer.draw_all(maze)
+        else:
+            self.canvas.itemconfig('square', fill=self.__COLOUR_EMPTY)
+
+        self.update_gui(maze=maze,
+                        diff_positions=[self.model.get_start(), self.model.get_end()] + list(self.model.get_walls()),
+                        is_rapid_config=False)
+
     def __calculate_square_width(self):
         # Update the square width depending on the new model
         self.__SQUARE_WIDTH = self.__GRID_DIM_WIDTH / self.model.get_nrow()
@@ -758,16 +1276,37 @@ class AStarView(Tk):
         Also updates the stats frame.
 
         Args:
-            maze::[list[list]]
-                A 2D array containing symbols that represent the maze
+            maze::[Grid]
+                The grid containing symbols that represent the maze
             diff_indices::[list]
                 A list containing the positions of nodes that have changed since the previous update
 
+        Returns:
+            None
+        '''
+        self.__draw_maze(maze, diff_positions)
+
+        # Handle GUI updates differently if the update is caused by a wall config or not
+        if is_rapid_config:
+            # update_idletasks() prevents fatal crashes when setting / removing nodes rapidly
+            self.update_idletasks()
+        else:
+            self.update()
+
+    def __draw_maze(self, maze, diff_positions):
+        ''' Colours the grid squares at the given positions according to the maze symbols and updates the stats frame.
+
+        Args:
+            maze::[Grid]
+                The grid containing symbols that represent the maze
+            diff_positions::[list]
+                The positions of nodes that have changed since the previous update
+
         Returns:
             None
         '''
         # Configure the Start / Stop button to display the appropriate text and colour
-        if self.model.is_solving():
+        if self.__is_solver_running():
             self.start_stop_button.configure(text='STOP', bg='salmon')
         elif not self.__is_reconfiguring:
             # Re-enable the GUI if the solver is done
@@ -780,6 +1319,11 @@ class AStarView(Tk):
         # Determine outline colour
         outline_colour = 'gray' if self.show_grid_lines.get() else ''
 
+        # Wide grids are drawn into a pixel buffer (without grid lines)
+        if self.__pixel_renderer is not None:
+            self.__pixel_renderer.draw(maze, diff_positions)
+            diff_positions = []
+
         # Update grid by colouring the appropriate square
         for (x, y) in diff_positions:
 
@@ -791,29 +1335,26 @@ class AStarView(Tk):
                                                       self.__SQUARE_WIDTH,
                                                       (y + 1) *
                                                       self.__SQUARE_WIDTH,
-                                                      fill=self.__SYMBOL_TO_COLOUR[maze[x][y]],
+                                                      fill=self.__SYMBOL_TO_COLOUR[maze.get_symbol((x, y))],
                                                       outline=outline_colour,
-                                                      tag='to-delete')
+                                                      tag='square')
                 self.__POS_TO_SQUARE[(x, y)] = square
 
             # Configure the square at (x, y) since it exists
             else:
                 self.canvas.itemconfig(self.__POS_TO_SQUARE[(
-                    x, y)], fill=self.__SYMBOL_TO_COLOUR[maze[x][y]])
+                    x, y)], fill=self.__SYMBOL_TO_COLOUR[maze.get_symbol((x, y))])
 
         # Update stats
         self.unsolved_label_var.set(str(self.model.get_stat('numUnsolved')))
         self.solved_label_var.set(str(self.model.get_stat('numSolved')))
         self.path_label_var.set(str(self.model.get_stat('numPath')))
         self.elapsed_label_var.set(str(self.model.get_stat('elapsedTime')))
-
-        # Handle GUI updates differently if the update is caused by a wall config or not
-        if is_rapid_config:
-            # update_idletasks() prevents fatal crashes when setting / removing nodes rapidly
-            self.update_idletasks()
-        else:
-            # update() allows the user to stop the solver and prevents calls to model.solve() from queueing
-            self.update()
+        bound = self.model.get_stat('suboptimalityBound')
+        self.bound_label_var.set('-' if bound is None else '{:.2f}'.format(bound))
+        landmarks = self.model.get_stat('landmarks')
+        self.landmarks_label_var.set('-' if landmarks is None else '{} in {:.2f} s ({:.1f} MB)'.format(
+            landmarks['count'], landmarks['preprocessingTime'], landmarks['memoryBytes'] / 1e6))
 
 
 def main():
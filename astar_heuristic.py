@@ -0,0 +1,185 @@
+from array import array
+import math
+
+
+def manhattan(dx, dy):
+    ''' Returns the number of straight steps covering an offset.
+    The exact distance without walls when diagonal movement is not allowed.
+
+    Args:
+        dx::[int]
+            The row offset
+        dy::[int]
+            The column offset
+
+    Returns:
+        [int]
+            The Manhattan distance
+    '''
+    return abs(dx) + abs(dy)
+
+
+def chebyshev(dx, dy):
+    ''' Returns the number of steps covering an offset when a diagonal step costs 1.
+    The exact distance without walls when diagonal movement is allowed.
+
+    Args:
+        dx::[int]
+            The row offset
+        dy::[int]
+            The column offset
+
+    Returns:
+        [int]
+            The Chebyshev distance
+    '''
+    return max(abs(dx), abs(dy))
+
+
+def octile(dx, dy):
+    ''' Returns the cost of covering an offset when a diagonal step costs sqrt(2).
+    Overestimates distances in this model, where a diagonal step costs 1.
+
+    Args:
+        dx::[int]
+            The row offset
+        dy::[int]
+            The column offset
+
+    Returns:
+        [float]
+            The octile distance
+    '''
+    dx, dy = abs(dx), abs(dy)
+    return max(dx, dy) + (math.sqrt(2) - 1) * min(dx, dy)
+
+
+def euclidean(dx, dy):
+    ''' Returns the straight-line distance covered by an offset.
+
+    Args:
+        dx::[int]
+            The row offset
+        dy::[int]
+            The column offset
+
+    Returns:
+        [float]
+            The Euclidean distance
+    '''
+    return math.sqrt(dx ** 2 + dy ** 2)
+
+
+def zero(dx, dy):
+    ''' Returns 0 for every offset, which turns A* into Dijkstra's algorithm.
+
+    Args:
+        dx::[int]
+            The row offset
+        dy::[int]
+            The column offset
+
+    Returns:
+        [int]
+            0
+    '''
+    return 0
+
+
+# Heuristics selectable with the 'heuristic' setting: (label, function)
+HEURISTICS = {
+    'manhattan': ('Manhattan', manhattan),
+    'chebyshev': ('Chebyshev', chebyshev),
+    'octile': ('Octile', octile),
+    'euclidean': ('Euclidean', euclidean),
+    'zero': ('Zero (Dijkstra)', zero)
+}
+
+
+def is_admissible(name, allow_diagonals):
+    ''' Returns whether or not a heuristic never overestimates the distance to the goal.
+
+    Every step costs 1, diagonal or not, so Manhattan and Euclidean distances
+    overestimate diagonal paths and octile distances overestimate any path
+    with a diagonal step.
+
+    Args:
+        name::[str]
+            The name of the heuristic (see HEURISTICS), 'auto', or 'alt'
+        allow_diagonals::[bool]
+            Whether or not diagonal movement is allowed
+
+    Returns:
+        [bool]
+            Whether or not the heuristic is admissible
+    '''
+    if name in ('auto', 'alt'):
+        return True
+    if allow_diagonals:
+        return name in ('chebyshev', 'zero')
+    return True
+
+
+def get_heuristic(name, allow_diagonals):
+    ''' Returns the heuristic function with the given name.
+    'auto' selects the tightest admissible heuristic for the movement model.
+
+    Args:
+        name::[str]
+            The name of the heuristic (see HEURISTICS), or 'auto'
+        allow_diagonals::[bool]
+            Whether or not diagonal movement is allowed
+
+    Returns:
+        [function]
+            Maps the (row, column) offset from a cell to the goal to the heuristic value
+    '''
+    if name == 'auto':
+        name = 'chebyshev' if allow_diagonals else 'manhattan'
+
+    # The landmark heuristic depends on the maze, not just the offset (see astar_landmarks.Landmarks)
+    if name == 'alt':
+        raise ValueError('The alt heuristic needs precomputed landmarks. Only the astar and anytime engines support it.')
+
+    if name not in HEURISTICS:
+        raise ValueError('The heuristic [{}] does not exist. Choose one of: auto, {}'.format(
+            name, ', '.join(HEURISTICS)))
+
+    return HEURISTICS[name][1]
+
+
+class HeuristicField:
+    ''' The heuristic value of every cell for one goal, stored in a flat array parallel to the grid.
+
+    Values are computed the first time a cell is probed and reused by every
+    later probe of that cell, in the same search or in later searches, until
+    the goal or the heuristic changes. Unset values are negative.
+
+    @params
+        size: the number of cells in the grid
+    '''
+
+    def __init__(self, size):
+        self.size = size
+        self.__values = None
+        self.__goal = None
+        self.__heuristic = None
+
+    def get_values(self, goal, heuristic):
+        ''' Returns the field for the given goal and heuristic, discarding the cached one if either changed.
+
+        Args:
+            goal::[int]
+                The index of the goal cell
+            heuristic::[function]
+                Maps the (row, column) offset from a cell to the goal to the heuristic value
+
+        Returns:
+            [array]
+                The heuristic value of each cell, or a negative value if it is not computed yet
+        '''
+        if self.__values is None or goal != self.__goal or heuristic is not self.__heuristic:
+            self.__values = array('d', [-1.0]) * self.size
+            self.__goal = goal
+            self.__heuristic = heuristic
+        return self.__values
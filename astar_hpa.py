@@ -0,0 +1,491 @@
+from collections import deque
+from astar_grid import Grid
+from astar_heuristic import get_heuristic
+from astar_open_list import OpenList
+from astar_search import get_offsets
+import math
+
+
+class HierarchicalSearch:
+    ''' The hierarchical A* (HPA*) search engine for very large grids.
+
+    The grid is split into square clusters. Wherever two neighbouring
+    clusters can be crossed, a transition (a pair of adjacent cells, one on
+    each side) is placed: one per entrance, or one at each end of entrances
+    at least ENTRANCE_SPLIT cells long. The transition cells of a cluster
+    form the nodes of an abstract graph, connected across the border by
+    their transitions and within the cluster by their distances to each other.
+
+    A query connects the start and end cells to the nodes of their clusters,
+    searches the abstract graph with A*, and then refines each abstract edge
+    into cells with a search bounded to a single cluster. Paths are close to,
+    but not always exactly, the shortest path.
+
+    The abstraction is built lazily (only for clusters the search reaches)
+    and cached between searches. When a cell changes (see on_cell_changed()),
+    only the borders of its cluster and the distances of its cluster and
+    the clusters around it are recomputed.
+
+    @params
+        grid: the grid to search
+        cluster_size: the width of a cluster in cells
+    '''
+
+    LABEL = 'Hierarchical A* (HPA*)'
+
+    # Width of the clusters in cells
+    CLUSTER_SIZE = 16
+
+    # Entrances at least this long get a transition at each end instead of one in the middle
+    ENTRANCE_SPLIT = 6
+
+    def __init__(self, grid, cluster_size=CLUSTER_SIZE):
+        if cluster_size < 2:
+            raise ValueError(
+                'The cluster size must be at least 2. Received {} instead.'.format(cluster_size))
+
+        self.__grid = grid
+        self.__cluster_size = cluster_size
+        self.unsolved = OpenList()
+        self.__num_solved = 0
+
+        # Transitions of every border built so far, by border key
+        self.__borders = {}
+
+        # [intra-cluster edges, inter-cluster edges, adjacency] of every cluster built so far, by cluster
+        self.__clusters = {}
+
+        # The allowDiagonals setting the abstraction was built for
+        self.__allow_diagonals = None
+
+    def get_num_unsolved(self):
+        return len(self.unsolved)
+
+    def get_num_solved(self):
+        return self.__num_solved
+
+    def on_cell_changed(self, cell):
+        ''' Discards the parts of the abstraction that depend on a cell that was turned into a wall or cleared.
+
+        Args:
+            cell::[int]
+                The index of the changed cell
+
+        Returns:
+            None
+        '''
+        x, y = divmod(cell, self.__grid.nCol)
+        cluster = (x // self.__cluster_size, y // self.__cluster_size)
+
+        for border in self.__get_cluster_borders(cluster):
+            self.__borders.pop(border, None)
+
+        # The clusters around it share the dropped borders
+        for offsetX in (-1, 0, 1):
+            for offsetY in (-1, 0, 1):
+                self.__clusters.pop((cluster[0] + offsetX, cluster[1] + offsetY), None)
+
+    def search(self, start, end, settings, tick):
+        ''' Searches the abstract graph for a path from the start cell to the end cell and refines it.
+
+        Args:
+            start::[int]
+                The index of the start cell
+            end::[int]
+                The index of the end cell
+            settings::[dict]
+                The model settings
+            tick::[function]
+                Called once per expansion; the search stops if it returns False
+
+        Returns:
+            [list]
+                The cell indices on the path from start to end, or None if no path was found
+        '''
+        self.unsolved = OpenList()
+        self.__num_solved = 0
+
+        if settings['allowDiagonals'] != self.__allow_diagonals:
+            self.__borders = {}
+            self.__clusters = {}
+            self.__allow_diagonals = settings['allowDiagonals']
+        self.__offsets = get_offsets(self.__allow_diagonals)
+        heuristic = get_heuristic(settings['heuristic'], self.__allow_diagonals)
+
+        grid = self.__grid
+        nCol = grid.nCol
+        cells = grid.cells
+        unsolved = self.unsolved
+        endX, endY = divmod(end, nCol)
+
+        # Connect the start and end cells to the nodes of their clusters
+        startCluster = self.__get_cluster(start)
+        endCluster = self.__get_cluster(end)
+        startEdges = self.__get_distances(start, self.__get_adjacency(startCluster),
+                                          set(self.__build_cluster(startCluster)[0]) | {end})
+        endEdges = self.__get_distances(end, self.__get_adjacency(endCluster),
+                                        set(self.__build_cluster(endCluster)[0]))
+
+        g = {start: 0}
+        parent = {start: -1}
+        closed = set()
+        unsolved.push(start, (0, 0), start)
+
+        while len(unsolved) != 0 and tick():
+            curCell = unsolved.pop()
+            closed.add(curCell)
+            self.__num_solved += 1
+            if cells[curCell] == Grid.UNSOLVED:
+                grid.set(curCell, Grid.SOLVED)
+
+            if curCell == end:
+                return self.__refine(self.__get_abstract_path(parent, end))
+
+            intraEdges, interEdges, _ = self.__build_cluster(self.__get_cluster(curCell))
+            neighbours = list(intraEdges.get(curCell, {}).items())
+            neighbours += [(adjCell, 1) for adjCell in interEdges.get(curCell, ())]
+            if curCell == start:
+                neighbours += startEdges.items()
+            if curCell in endEdges:
+                neighbours.append((end, endEdges[curCell]))
+
+            for adjCell, cost in neighbours:
+                if adjCell in closed:
+                    continue
+
+                adjG = g[curCell] + cost
+                if adjG < g.get(adjCell, math.inf):
+                    g[adjCell] = adjG
+                    parent[adjCell] = curCell
+                    adjX, adjY = divmod(adjCell, nCol)
+                    adjH = heuristic(endX - adjX, endY - adjY)
+
+                    # Ties are broken in favour of the deeper node
+                    unsolved.push(adjCell, (adjG + adjH, -adjG), adjCell)
+                    if cells[adjCell] == Grid.EMPTY:
+                        grid.set(adjCell, Grid.UNSOLVED)
+
+        # Failed to find a path
+        return None
+
+    '''
+    ABSTRACTION METHODS.
+    '''
+
+    def __get_cluster(self, cell):
+        x, y = divmod(cell, self.__grid.nCol)
+        return (x // self.__cluster_size, y // self.__cluster_size)
+
+    def __get_bounds(self, cluster):
+        ''' Returns the first and last row and column of a cluster.
+
+        Args:
+            cluster::[tuple]
+                The (row, column) of the cluster
+
+        Returns:
+            [tuple]
+                (first row, last row, first column, last column)
+        '''
+        size = self.__cluster_size
+        return (cluster[0] * size, min((cluster[0] + 1) * size, self.__grid.nRow) - 1,
+                cluster[1] * size, min((cluster[1] + 1) * size, self.__grid.nCol) - 1)
+
+    def __get_cluster_borders(self, cluster):
+        ''' Returns the keys of every border (and corner, with diagonal movement) of a cluster.
+
+        A border key is (kind, row, column), where 'v' borders lie between the
+        cluster at (row, column) and the one to its right, 'h' borders between it
+        and the one below, and 'd' and 'a' corners cross the diagonals of the
+        2 x 2 block of clusters whose top-left cluster is at (row, column).
+
+        Args:
+            cluster::[tuple]
+                The (row, column) of the cluster
+
+        Returns:
+            [list]
+                The border keys
+        '''
+        row, col = cluster
+        borders = [('v', row, col), ('v', row, col - 1), ('h', row, col), ('h', row - 1, col)]
+        if self.__allow_diagonals:
+            borders += [('d', row, col), ('d', row - 1, col - 1), ('a', row, col - 1), ('a', row - 1, col)]
+        return borders
+
+    def __build_border(self, border):
+        ''' Returns the transitions of a border, finding them if they are not cached.
+
+        Args:
+            border::[tuple]
+                The border key (see __get_cluster_borders())
+
+        Returns:
+            [list]
+                (cell, cell) pairs of adjacent free cells on either side of the border
+        '''
+        if border in self.__borders:
+            return self.__borders[border]
+
+        kind, row, col = border
+        grid = self.__grid
+        nRow, nCol = grid.nRow, grid.nCol
+        cells = grid.cells
+        size = self.__cluster_size
+        transitions = []
+
+        if kind in ('d', 'a'):
+            x = (row + 1) * size - 1
+            y = (col + 1) * size - 1 if kind == 'd' else (col + 1) * size
+            adjY = y + 1 if kind == 'd' else y - 1
+            if row >= 0 and col >= 0 and x + 1 < nRow and 0 <= adjY < nCol and y < nCol:
+                cell, adjCell = x * nCol + y, (x + 1) * nCol + adjY
+                if cells[cell] != Grid.WALL and cells[adjCell] != Grid.WALL:
+                    transitions.append((cell, adjCell))
+
+        elif row >= 0 and col >= 0:
+            # Cells along the near side of the border
+            if kind == 'v' and (col + 1) * size < nCol and row * size < nRow:
+                y = (col + 1) * size - 1
+                side = [x * nCol + y for x in range(row * size, min((row + 1) * size, nRow))]
+                transitions = self.__find_transitions(side, 1)
+            elif kind == 'h' and (row + 1) * size < nRow and col * size < nCol:
+                x = (row + 1) * size - 1
+                side = [x * nCol + y for y in range(col * size, min((col + 1) * size, nCol))]
+                transitions = self.__find_transitions(side, nCol)
+
+        self.__borders[border] = transitions
+        return transitions
+
+    def __find_transitions(self, side, across):
+        ''' Places transitions along one side of a border.
+
+        Crossings whose cells lie in the same run of free cells on both sides
+        belong to the same entrance, since the cells of a run are connected
+        along the border.
+
+        Args:
+            side::[list]
+                The indices of the cells along the near side of the border, in order
+            across::[int]
+                The index offset from a near cell to the cell facing it across the border
+
+        Returns:
+            [list]
+                (cell, cell) pairs of adjacent free cells on either side of the border
+        '''
+        cells = self.__grid.cells
+        length = len(side)
+        nearFree = [cells[cell] != Grid.WALL for cell in side]
+        farFree = [cells[cell + across] != Grid.WALL for cell in side]
+
+        # Identify the runs of free cells on each side
+        nearRun = self.__label_runs(nearFree)
+        farRun = self.__label_runs(farFree)
+
+        # Crossings grouped by entrance, in order along the border
+        entrances = {}
+        for i in range(length):
+            if not nearFree[i]:
+                continue
+            for j in ((i - 1, i, i + 1) if self.__allow_diagonals else (i,)):
+                if 0 <= j < length and farFree[j]:
+                    entrances.setdefault((nearRun[i], farRun[j]), []).append(
+                        (side[i], side[j] + across))
+
+        transitions = []
+        for crossings in entrances.values():
+            if len(crossings) >= self.ENTRANCE_SPLIT:
+                transitions += [crossings[0], crossings[-1]]
+            else:
+                transitions.append(crossings[len(crossings) // 2])
+        return transitions
+
+    def __label_runs(self, free):
+        labels = []
+        run = 0
+        for i, is_free in enumerate(free):
+            if is_free and i > 0 and not free[i - 1]:
+                run += 1
+            labels.append(run)
+        return labels
+
+    def __build_cluster(self, cluster):
+        ''' Returns the edges between the nodes of a cluster, computing them if they are not cached.
+
+        Args:
+            cluster::[tuple]
+                The (row, column) of the cluster
+
+        Returns:
+            [list]
+                [intra-cluster edges, inter-cluster edges, adjacency]: the first maps
+                each node to the costs of reaching the other nodes of the cluster, the
+                second maps each node to the nodes of other clusters adjacent to it,
+                and the third is the cluster's adjacency (None until it is needed, see
+                __get_adjacency())
+        '''
+        if cluster in self.__clusters:
+            return self.__clusters[cluster]
+
+        interEdges = {}
+        for border in self.__get_cluster_borders(cluster):
+            for cell, adjCell in self.__build_border(border):
+                if self.__get_cluster(cell) != cluster:
+                    cell, adjCell = adjCell, cell
+                interEdges.setdefault(cell, []).append(adjCell)
+
+        nodes = set(interEdges)
+        intraEdges = {}
+        self.__clusters[cluster] = [intraEdges, interEdges, None]
+
+        # Without walls, the distance between two cells is the distance between their positions
+        if self.__is_open(cluster):
+            nCol = self.__grid.nCol
+            for node in nodes:
+                nodeX, nodeY = divmod(node, nCol)
+                intraEdges[node] = {}
+                for other in nodes - {node}:
+                    otherX, otherY = divmod(other, nCol)
+                    if self.__allow_diagonals:
+                        intraEdges[node][other] = max(abs(otherX - nodeX), abs(otherY - nodeY))
+                    else:
+                        intraEdges[node][other] = abs(otherX - nodeX) + abs(otherY - nodeY)
+        else:
+            adjacency = self.__get_adjacency(cluster)
+            for node in nodes:
+                intraEdges[node] = self.__get_distances(node, adjacency, nodes - {node})
+
+        return self.__clusters[cluster]
+
+    def __is_open(self, cluster):
+        nCol = self.__grid.nCol
+        cells = self.__grid.cells
+        firstX, lastX, firstY, lastY = self.__get_bounds(cluster)
+        return all(cells.find(Grid.WALL, x * nCol + firstY, x * nCol + lastY + 1) == -1
+                   for x in range(firstX, lastX + 1))
+
+    def __get_adjacency(self, cluster):
+        ''' Returns the free neighbours within a cluster of each free cell of the cluster, building them if needed.
+        Searches within the cluster use it to skip the bounds and wall checks.
+
+        Args:
+            cluster::[tuple]
+                The (row, column) of the cluster
+
+        Returns:
+            [dict]
+                The indices of the free neighbours of each free cell
+        '''
+        clusterData = self.__build_cluster(cluster)
+        if clusterData[2] is not None:
+            return clusterData[2]
+
+        nCol = self.__grid.nCol
+        cells = self.__grid.cells
+        firstX, lastX, firstY, lastY = self.__get_bounds(cluster)
+        adjacency = {}
+        for curX in range(firstX, lastX + 1):
+            for curY in range(firstY, lastY + 1):
+                if cells[curX * nCol + curY] != Grid.WALL:
+                    adjacency[curX * nCol + curY] = [
+                        (curX + offsetX) * nCol + curY + offsetY for offsetX, offsetY in self.__offsets
+                        if firstX <= curX + offsetX <= lastX and firstY <= curY + offsetY <= lastY
+                        and cells[(curX + offsetX) * nCol + curY + offsetY] != Grid.WALL]
+
+        clusterData[2] = adjacency
+        return adjacency
+
+    def __search_cluster(self, source, adjacency, targets=None):
+        ''' Runs a breadth-first search from a cell without leaving its cluster.
+
+        Args:
+            source::[int]
+                The index of the cell to search from
+            adjacency::[dict]
+                The free neighbours within the cluster of each free cell of the cluster
+            targets::[set]
+                Stops once all of these cells are reached (searches the whole cluster if None)
+
+        Returns:
+            [tuple]
+                (parent, distance): the parent cell index (-1 for the source) and the
+                distance of every reached cell
+        '''
+        parent = {source: -1}
+        distance = {source: 0}
+        remaining = len(targets) if targets is not None else -1
+        queue = deque([source])
+
+        while queue and remaining != 0:
+            curCell = queue.popleft()
+            adjDistance = distance[curCell] + 1
+            for adjCell in adjacency[curCell]:
+                if adjCell not in parent:
+                    parent[adjCell] = curCell
+                    distance[adjCell] = adjDistance
+                    queue.append(adjCell)
+                    if targets is not None and adjCell in targets:
+                        remaining -= 1
+        return parent, distance
+
+    def __get_distances(self, source, adjacency, targets):
+        ''' Returns the distances from a cell to the given cells of its cluster without leaving the cluster.
+
+        Args:
+            source::[int]
+                The index of the cell to search from
+            adjacency::[dict]
+                The free neighbours within the cluster of each free cell of the cluster
+            targets::[set]
+                The indices of the cells to find the distances of
+
+        Returns:
+            [dict]
+                The distance of every reachable target
+        '''
+        if source not in adjacency:
+            return {}
+
+        targets = targets - {source}
+        _, distance = self.__search_cluster(source, adjacency, targets)
+        return {cell: distance[cell] for cell in targets if cell in distance}
+
+    def __get_abstract_path(self, parent, end):
+        path = []
+        cell = end
+        while cell != -1:
+            path.append(cell)
+            cell = parent[cell]
+        path.reverse()
+        return path
+
+    def __refine(self, abstractPath):
+        ''' Expands the edges of an abstract path into the cells they cross.
+
+        Args:
+            abstractPath::[list]
+                The node indices on the abstract path from start to end
+
+        Returns:
+            [list]
+                The indices of every cell on the path from start to end
+        '''
+        nCol = self.__grid.nCol
+        pathCells = abstractPath[:1]
+
+        for fromCell, toCell in zip(abstractPath, abstractPath[1:]):
+            fromX, fromY = divmod(fromCell, nCol)
+            toX, toY = divmod(toCell, nCol)
+            if (toX - fromX, toY - fromY) in self.__offsets:
+                pathCells.append(toCell)
+                continue
+
+            # Non-adjacent nodes are connected within their cluster
+            parent, _ = self.__search_cluster(toCell, self.__get_adjacency(self.__get_cluster(toCell)), {fromCell})
+            cell = parent[fromCell]
+            while cell != -1:
+                pathCells.append(cell)
+                cell = parent[cell]
+
+        return pathCells
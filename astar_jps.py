@@ -0,0 +1,233 @@
+from astar_grid import Grid
+from astar_heuristic import get_heuristic
+from astar_node import NodePool
+from astar_open_list import OpenList
+from astar_search import get_offsets
+import math
+
+
+class JumpPointSearch:
+    ''' The Jump Point Search engine for uniform-cost grids.
+
+    Instead of queuing every neighbour of an expanded cell, the search scans
+    in straight lines (and diagonals) and only queues the cells where an
+    optimal path may have to turn: the end cell and cells next to a wall that
+    forces a detour (jump points). Only jump points are marked as unsolved and
+    solved, and the path between consecutive jump points is filled in at the end.
+
+    Paths have the same cost as an optimal A* search: every step costs 1,
+    diagonal or not, and the heuristic is chosen by the 'heuristic' setting
+    (see astar_heuristic).
+
+    @params
+        grid: the grid to search
+    '''
+
+    LABEL = 'Jump Point Search'
+
+    def __init__(self, grid):
+        self.__grid = grid
+        self.__nodes = NodePool(grid.size)
+        self.unsolved = OpenList()
+        self.__num_solved = 0
+
+    def get_num_unsolved(self):
+        return len(self.unsolved)
+
+    def get_num_solved(self):
+        return self.__num_solved
+
+    def search(self, start, end, settings, tick):
+        ''' Searches for a path from the start cell to the end cell.
+
+        Args:
+            start::[int]
+                The index of the start cell
+            end::[int]
+                The index of the end cell
+            settings::[dict]
+                The model settings
+            tick::[function]
+                Called once per expansion; the search stops if it returns False
+
+        Returns:
+            [list]
+                The cell indices on the path from start to end, or None if no path was found
+        '''
+        self.__nodes.reset()
+        self.unsolved = OpenList()
+        self.__num_solved = 0
+        self.__end = end
+        self.__allow_diagonals = settings['allowDiagonals']
+        heuristic = get_heuristic(settings['heuristic'], self.__allow_diagonals)
+
+        grid = self.__grid
+        nCol = grid.nCol
+        cells = grid.cells
+        g = self.__nodes.g
+        parent = self.__nodes.parent
+        touched = self.__nodes.touched
+        unsolved = self.unsolved
+        endX, endY = divmod(end, nCol)
+
+        g[start] = 0
+        touched.append(start)
+        unsolved.push(start, 0, start)
+
+        while len(unsolved) != 0 and tick():
+            curCell = unsolved.pop()
+            self.__num_solved += 1
+            if cells[curCell] == Grid.UNSOLVED:
+                grid.set(curCell, Grid.SOLVED)
+
+            if curCell == end:
+                return self.__interpolate(self.__nodes.path_to(curCell))
+
+            curX, curY = divmod(curCell, nCol)
+
+            for offsetX, offsetY in self.__get_directions(curCell, parent[curCell]):
+                jumpCell = self.__jump(curX, curY, offsetX, offsetY)
+                if jumpCell == -1 or cells[jumpCell] == Grid.SOLVED:
+                    continue
+
+                jumpX, jumpY = divmod(jumpCell, nCol)
+                jumpG = g[curCell] + max(abs(jumpX - curX), abs(jumpY - curY))
+
+                if jumpG < g[jumpCell]:
+                    if g[jumpCell] == math.inf:
+                        touched.append(jumpCell)
+                    g[jumpCell] = jumpG
+                    parent[jumpCell] = curCell
+                    unsolved.push(jumpCell, jumpG + heuristic(endX - jumpX, endY - jumpY), jumpCell)
+                    if cells[jumpCell] == Grid.EMPTY:
+                        grid.set(jumpCell, Grid.UNSOLVED)
+
+        # Failed to find a path
+        return None
+
+    def __is_free(self, x, y):
+        return (0 <= x < self.__grid.nRow and 0 <= y < self.__grid.nCol
+                and self.__grid.cells[x * self.__grid.nCol + y] != Grid.WALL)
+
+    def __get_directions(self, cell, parentCell):
+        ''' Returns the directions worth scanning from a jump point given the direction it was reached from.
+
+        Args:
+            cell::[int]
+                The index of the jump point
+            parentCell::[int]
+                The index of the jump point it was reached from (-1 for the start cell)
+
+        Returns:
+            [list]
+                The (x, y) directions to scan
+        '''
+        if parentCell == -1:
+            return get_offsets(self.__allow_diagonals)
+
+        is_free = self.__is_free
+        curX, curY = divmod(cell, self.__grid.nCol)
+        parentX, parentY = divmod(parentCell, self.__grid.nCol)
+        dx = (curX > parentX) - (curX < parentX)
+        dy = (curY > parentY) - (curY < parentY)
+
+        if not self.__allow_diagonals:
+            # Vertical scans may turn anywhere, horizontal scans only where a wall forces them to
+            if dx:
+                return [(dx, 0), (0, 1), (0, -1)]
+            return [(0, dy)] + [(side, 0) for side in (1, -1) if not is_free(curX + side, curY - dy)]
+
+        if dx and dy:
+            directions = [(dx, 0), (0, dy), (dx, dy)]
+            if not is_free(curX - dx, curY):
+                directions.append((-dx, dy))
+            if not is_free(curX, curY - dy):
+                directions.append((dx, -dy))
+            return directions
+
+        if dx:
+            return [(dx, 0)] + [(dx, side) for side in (1, -1) if not is_free(curX, curY + side)]
+        return [(0, dy)] + [(side, dy) for side in (1, -1) if not is_free(curX + side, curY)]
+
+    def __jump(self, x, y, dx, dy):
+        ''' Scans from a cell in the given direction until it reaches a jump point.
+
+        Args:
+            x::[int]
+                The row of the cell to scan from
+            y::[int]
+                The column of the cell to scan from
+            dx::[int]
+                The row direction (-1, 0, or 1)
+            dy::[int]
+                The column direction (-1, 0, or 1)
+
+        Returns:
+            [int]
+                The index of the jump point, or -1 if the scan hit a wall or the edge of the maze
+        '''
+        is_free = self.__is_free
+        nCol = self.__grid.nCol
+        end = self.__end
+        allow_diagonals = self.__allow_diagonals
+
+        while True:
+            x += dx
+            y += dy
+            if not is_free(x, y):
+                return -1
+
+            cell = x * nCol + y
+            if cell == end:
+                return cell
+
+            if dx and dy:
+                # A wall beside the diagonal forces a turn, as does a jump point along either straight direction
+                if ((not is_free(x - dx, y) and is_free(x - dx, y + dy))
+                        or (not is_free(x, y - dy) and is_free(x + dx, y - dy))):
+                    return cell
+                if self.__jump(x, y, dx, 0) != -1 or self.__jump(x, y, 0, dy) != -1:
+                    return cell
+
+            elif not allow_diagonals:
+                if dx:
+                    if self.__jump(x, y, 0, 1) != -1 or self.__jump(x, y, 0, -1) != -1:
+                        return cell
+                elif ((is_free(x + 1, y) and not is_free(x + 1, y - dy))
+                        or (is_free(x - 1, y) and not is_free(x - 1, y - dy))):
+                    return cell
+
+            elif dx:
+                if ((not is_free(x, y + 1) and is_free(x + dx, y + 1))
+                        or (not is_free(x, y - 1) and is_free(x + dx, y - 1))):
+                    return cell
+
+            elif ((not is_free(x + 1, y) and is_free(x + 1, y + dy))
+                    or (not is_free(x - 1, y) and is_free(x - 1, y + dy))):
+                return cell
+
+    def __interpolate(self, jumpPoints):
+        ''' Fills in the cells between consecutive jump points.
+
+        Args:
+            jumpPoints::[list]
+                The indices of the jump points on the path from start to end
+
+        Returns:
+            [list]
+                The indices of every cell on the path from start to end
+        '''
+        nCol = self.__grid.nCol
+        pathCells = jumpPoints[:1]
+
+        for fromCell, toCell in zip(jumpPoints, jumpPoints[1:]):
+            x, y = divmod(fromCell, nCol)
+            toX, toY = divmod(toCell, nCol)
+            dx = (toX > x) - (toX < x)
+            dy = (toY > y) - (toY < y)
+            while (x, y) != (toX, toY):
+                x += dx
+                y += dy
+                pathCells.append(x * nCol + y)
+
+        return pathCells
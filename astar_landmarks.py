@@ -0,0 +1,143 @@
+from array import array
+from astar_distance_field import DistanceField
+from astar_heuristic import get_heuristic
+import time
+
+
+class Landmarks:
+    ''' Precomputed distances from a few landmark cells, giving the ALT heuristic (A*, landmarks, triangle inequality).
+
+    For any landmark L, the triangle inequality bounds the distance from a
+    cell to the goal from below by |d(L, goal) - d(L, cell)|. The heuristic
+    is the largest of these bounds and the 'auto' heuristic, so it stays
+    admissible and is far tighter than straight-line distances on winding mazes.
+
+    Landmarks are picked by farthest-point selection: the first is the cell
+    farthest from the seed cell, and each next one is the cell farthest from
+    every landmark picked so far. Each landmark's distances come from a
+    breadth-first search over its region (see astar_distance_field), so the
+    distances must be rebuilt whenever a wall changes.
+
+    @params
+        grid: the grid
+        allow_diagonals: whether or not diagonal movement is allowed
+        count: the number of landmarks to pick
+        seed: the index of a free cell in the region to place the landmarks in
+    '''
+
+    def __init__(self, grid, allow_diagonals, count, seed):
+        if count < 1:
+            raise ValueError('There must be at least 1 landmark. Received {} landmarks instead.'.format(count))
+
+        self.__grid = grid
+        self.__allow_diagonals = allow_diagonals
+        self.count = count
+
+        # The landmark cells and the distance of every cell from each of them
+        self.cells = []
+        self.__distances = []
+
+        # The heuristic of the last goal
+        self.__goal = None
+        self.__heuristic = None
+
+        start_time = time.perf_counter()
+        self.__pick_landmarks(seed)
+        self.preprocessing_time = time.perf_counter() - start_time
+
+    def __get_distances(self, cell):
+        field = DistanceField(self.__grid, cell, self.__allow_diagonals)
+        field.build(lambda: True)
+        return field.get_distances()
+
+    def __pick_landmarks(self, seed):
+        ''' Picks the landmarks and computes their distances.
+
+        Args:
+            seed::[int]
+                The index of a free cell in the region to place the landmarks in
+
+        Returns:
+            None
+        '''
+        # Distance of every cell from the closest landmark (or from the seed before the first landmark)
+        closest = self.__get_distances(seed)
+
+        while len(self.cells) < self.count:
+            farthest = max(closest)
+
+            # Every cell of the region is already a landmark
+            if farthest == 0 and self.cells:
+                break
+
+            landmark = closest.index(farthest)
+            distances = self.__get_distances(landmark)
+            self.cells.append(landmark)
+            self.__distances.append(distances)
+
+            closest = distances if len(self.cells) == 1 else array('i', map(min, closest, distances))
+
+    def reaches(self, cell):
+        ''' Returns whether or not the landmarks are in the region of a cell.
+        Every landmark is in the region of the seed, so they either all reach the cell or none of them do.
+
+        Args:
+            cell::[int]
+                The index of the cell
+
+        Returns:
+            [bool]
+                Whether or not the landmarks bound the distance to the cell
+        '''
+        return self.__distances[0][cell] >= 0
+
+    def get_stats(self):
+        ''' Returns the cost of the preprocessing.
+
+        Args:
+            None
+
+        Returns:
+            [dict]
+                The number of landmarks, the preprocessing time in seconds, and the memory held by the distances in bytes
+        '''
+        return {
+            'count': len(self.cells),
+            'preprocessingTime': self.preprocessing_time,
+            'memoryBytes': sum(len(distances) * distances.itemsize for distances in self.__distances)
+        }
+
+    def get_heuristic(self, goal):
+        ''' Returns the ALT heuristic for a goal.
+        The same function is returned for the same goal, so heuristic values cached for it stay valid.
+
+        Args:
+            goal::[int]
+                The index of the goal cell
+
+        Returns:
+            [function]
+                Maps the (row, column) offset from a cell to the goal to the heuristic value
+        '''
+        if goal == self.__goal:
+            return self.__heuristic
+
+        nCol = self.__grid.nCol
+        goalX, goalY = divmod(goal, nCol)
+        base = get_heuristic('auto', self.__allow_diagonals)
+
+        # Landmarks that cannot reach the goal are in another region and bound nothing
+        bounds = [(distances, distances[goal]) for distances in self.__distances if distances[goal] >= 0]
+
+        def heuristic(dx, dy):
+            cell = (goalX - dx) * nCol + goalY - dy
+            h = base(dx, dy)
+            for distances, goalDistance in bounds:
+                bound = abs(distances[cell] - goalDistance)
+                if bound > h:
+                    h = bound
+            return h
+
+        self.__goal = goal
+        self.__heuristic = heuristic
+        return heuristic
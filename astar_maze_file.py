@@ -0,0 +1,183 @@
+import argparse
+import json
+import mmap
+import struct
+from astar_grid import Grid
+
+
+# File extension of binary maze files
+BINARY_EXTENSION = '.amaze'
+
+# Identifies a binary maze file and the version of its layout
+MAGIC = b'AMAZ'
+VERSION = 1
+
+# Magic, version, flags (reserved, 0), nRow, nCol, start (x, y), end (x, y), all little-endian
+HEADER = struct.Struct('<4sHHIIIIII')
+
+
+def is_binary_maze_file(filename):
+    ''' Returns whether or not a file starts like a binary maze file.
+
+    Args:
+        filename::[str]
+            The path of the maze file
+
+    Returns:
+        [bool]
+            Whether or not the file is a binary maze file
+    '''
+    with open(filename, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def read_binary_maze(filename):
+    ''' Reads a binary maze file.
+
+    The file is memory-mapped, and the returned wall plane is a view of the
+    mapping rather than a copy, so AStarModel.import_maze_data() unpacks it
+    straight from the file into the grid.
+
+    Args:
+        filename::[str]
+            The path of the binary maze file
+
+    Returns:
+        [dict]
+            The maze data containing the grid width, the start and end positions,
+            and the packed wall plane (see Grid.wall_bits())
+    '''
+    with open(filename, 'rb') as file:
+        header = file.read(HEADER.size)
+        if len(header) < HEADER.size or header[:len(MAGIC)] != MAGIC:
+            raise ValueError('{} is not a binary maze file.'.format(filename))
+
+        magic, version, flags, nRow, nCol, startX, startY, endX, endY = HEADER.unpack(header)
+        if version != VERSION:
+            raise ValueError('Unsupported binary maze version {} in {}. Expected version {}.'.format(
+                version, filename, VERSION))
+
+        if nRow != nCol:
+            raise ValueError('Only square mazes are supported. Received a {} x {} maze instead.'.format(
+                nRow, nCol))
+
+        num_bytes = (nRow * nCol + 7) // 8
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # The mapping stays open on success since the wall plane is a view of it
+    num_mapped_bytes = len(mapping)
+    if num_mapped_bytes != HEADER.size + num_bytes:
+        mapping.close()
+        raise ValueError('{} is truncated or corrupted: expected {} bytes, found {}.'.format(
+            filename, HEADER.size + num_bytes, num_mapped_bytes))
+
+    return {
+        'gridWidth': nRow,
+        'start': [startX, startY],
+        'end': [endX, endY],
+        'wallBits': memoryview(mapping)[HEADER.size:]
+    }
+
+
+def write_binary_maze(filename, maze_data):
+    ''' Writes a binary maze file.
+
+    Args:
+        filename::[str]
+            The path of the binary maze file
+        maze_data::[dict]
+            The maze data containing the grid width, the start and end positions,
+            and either the packed wall plane ('wallBits') or the wall positions ('walls')
+
+    Returns:
+        None
+    '''
+    width = maze_data['gridWidth']
+    wall_bits = maze_data['wallBits'] if 'wallBits' in maze_data else pack_walls(maze_data['walls'], width)
+
+    with open(filename, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0, width, width,
+                               *maze_data['start'], *maze_data['end']))
+        file.write(wall_bits)
+
+
+def pack_walls(walls, width):
+    ''' Packs wall positions into a wall plane (see Grid.wall_bits()).
+
+    Args:
+        walls::[list]
+            The wall positions
+        width::[int]
+            The width of the grid
+
+    Returns:
+        [bytes]
+            The packed wall plane
+    '''
+    grid = Grid(width, width, track_changes=False)
+    for wall in walls:
+        grid.cells[grid.index(wall)] = Grid.WALL
+    return grid.wall_bits()
+
+
+def unpack_walls(wall_bits, width):
+    ''' Unpacks a wall plane (see Grid.wall_bits()) into wall positions.
+
+    Args:
+        wall_bits::[bytes-like]
+            The packed wall plane
+        width::[int]
+            The width of the grid
+
+    Returns:
+        [list]
+            The wall positions in row-major order
+    '''
+    grid = Grid(width, width, track_changes=False)
+    grid.load_wall_bits(wall_bits)
+    return [list(grid.position(cell)) for cell in grid.find_all(Grid.WALL)]
+
+
+def convert(source, destination):
+    ''' Converts a maze file between the JSON and binary formats.
+    The format of the destination is chosen by its extension.
+
+    Args:
+        source::[str]
+            The path of the maze file to convert
+        destination::[str]
+            The path of the converted maze file
+
+    Returns:
+        None
+    '''
+    if is_binary_maze_file(source):
+        maze_data = read_binary_maze(source)
+    else:
+        with open(source, 'r') as file:
+            maze_data = json.load(file)
+
+    if destination.endswith(BINARY_EXTENSION):
+        write_binary_maze(destination, maze_data)
+        return
+
+    if 'wallBits' in maze_data:
+        maze_data['walls'] = unpack_walls(maze_data.pop('wallBits'), maze_data['gridWidth'])
+
+    with open(destination, 'w') as file:
+        json.dump(maze_data, file)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Converts maze files between the JSON and binary ({}) formats.'.format(BINARY_EXTENSION))
+    parser.add_argument('source', help='the maze file to convert')
+    parser.add_argument('destination',
+                        help='the converted maze file (binary if it ends in {}, JSON otherwise)'.format(BINARY_EXTENSION))
+    args = parser.parse_args()
+
+    convert(args.source, args.destination)
+
+
+if __name__ == '__main__':
+    main()
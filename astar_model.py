@@ -1,7 +1,33 @@
-from astar_node import Node
-from operator import attrgetter
+from astar_anytime import AnytimeSearch
+from astar_bidirectional import BidirectionalSearch
+from astar_connectivity import ConnectivityIndex
+from astar_distance_field import DistanceFieldSearch
+from astar_dstar_lite import DStarLiteSearch
+from astar_generator import generate_maze
+from astar_grid import Grid
+from astar_hpa import HierarchicalSearch
+from astar_jps import JumpPointSearch
+from astar_landmarks import Landmarks
+from astar_maze_file import BINARY_EXTENSION, is_binary_maze_file, read_binary_maze, write_binary_maze
+from astar_profile import Profiler
+from astar_render import RenderScheduler
+from astar_search import AStarSearch
+from astar_trace import TraceRecorder
+import hashlib
+import json
 import time
-import math
+
+
+# Search engines selectable with the 'engine' setting
+ENGINES = {
+    'anytime': AnytimeSearch,
+    'astar': AStarSearch,
+    'bidirectional': BidirectionalSearch,
+    'distance-field': DistanceFieldSearch,
+    'dstar-lite': DStarLiteSearch,
+    'hpa': HierarchicalSearch,
+    'jps': JumpPointSearch
+}
 
 
 class AStarModel:
@@ -27,35 +53,102 @@ class AStarModel:
         # Takes part in determining whether or not to update the GUI
         self.__is_currently_solving = False
 
-        # Stores symbols representing walls, unsolved, solved, or path nodes
-        self.__curr_maze = []
-        self.__prev_maze = []
+        # Time spent rendering during the current search (excluded from the elapsed time)
+        self.__start_time = 0
+        self.__render_time = 0
+
+        # Stores symbols representing walls, unsolved, solved, or path nodes (one byte per cell)
+        # Changed cells are only tracked when there is a view to redraw them
+        self.__grid = Grid(self.__nRow, self.__nCol,
+                           track_changes=view is not None)
+
+        # Search engines by name (created when first used) and the engine that ran the last search
+        self.__engines = {}
+        self.__engine = None
+
+        # Connected regions of the maze by whether or not diagonal movement is allowed (created when first used)
+        self.__connectivity = {}
+
+        # Landmarks of the 'alt' heuristic by movement setting and count (created when first used)
+        self.__landmarks = {}
 
         # Containers for solving
-        self.unsolved = set()
-        self.solved = set()
         self.path = []
 
+        # Receives the changes instead of the view while solving on another thread (see solve())
+        self.__events = None
+
+        # Records where the time of the last solve went (None unless the 'enableProfiling' setting is on)
+        self.__profiler = None
+
+        # Records the search of the current solve, and the trace of the last one (None unless the 'recordTrace' setting is on)
+        self.__trace_recorder = None
+        self.__trace = None
+
+        # Result restored from the solve cache (None if the last solve was searched)
+        self.__cached_result = None
+
+        # Optional persistent cache of solve results (see astar_cache.SolveCache)
+        self.__cache = None
+
+        # Incremented whenever the walls, start, or end change
+        self.__maze_version = 0
+        self.__wall_digest = None
+        self.__wall_digest_version = -1
+
         self.__settings = {
             'allowDiagonals': True,
-            'enablePrintToConsole': True
+            'enablePrintToConsole': True,
+            # Record the time spent in each phase of a solve (see astar_profile.Profiler)
+            'enableProfiling': False,
+            # Record every change a solve makes to the maze (see astar_trace.TraceRecorder and save_trace())
+            'recordTrace': False,
+            # Reject an end in another region than the start before searching (see astar_connectivity.ConnectivityIndex)
+            'checkConnectivity': True,
+            # The search engine to solve with (see ENGINES)
+            'engine': 'astar',
+            # The heuristic to search with (see astar_heuristic.HEURISTICS), 'auto' for the tightest admissible one,
+            # or 'alt' for landmark distances (see astar_landmarks.Landmarks)
+            'heuristic': 'auto',
+            # The number of landmarks the 'alt' heuristic picks
+            'numLandmarks': 8,
+            # The weight of the heuristic for the A* engine (1 for optimal paths, higher to trade path length for speed)
+            'weight': 1.0,
+            # The weight of the first pass of the anytime engine, lowered on each later pass
+            'anytimeWeight': 3.0,
+            # Seconds the anytime engine may spend improving its first path (0 to improve until optimal)
+            'timeLimit': 0,
+            # Draw the search every K expansions (0 to disable)
+            'expansionsPerFrame': 1,
+            # Draw the search at most this many times per second (0 to disable, overrides expansionsPerFrame)
+            'framesPerSecond': 0
         }
 
+        # Settings that change the result of a search (and therefore its cache key)
+        self.__SEARCH_SETTINGS = ['allowDiagonals', 'anytimeWeight', 'engine', 'heuristic', 'numLandmarks', 'timeLimit',
+                                  'weight']
+
         self.__stats = {
             'numUnsolved': 0,
             'numSolved': 0,
             'numPath': 0,
-            'elapsedTime': 0
+            'elapsedTime': 0,
+            # How many times longer than the shortest path the path may be (None if unknown)
+            'suboptimalityBound': None,
+            # Time and calls per phase and search counters of the last solve (None unless profiling)
+            'profile': None,
+            # Number, preprocessing time, and memory of the landmarks (None unless the 'alt' heuristic is selected)
+            'landmarks': None,
+            # Seconds the last solve spent labelling the connected regions (None unless the 'checkConnectivity' setting is on)
+            'connectivityBuildTime': None,
+            'isCacheHit': False
         }
 
-        # Initialize a set containing wall positions
-        self.__walls = set()
-
-        # Initialize a 2D containing symbols representing the maze
+        # Initialize the grid containing symbols representing the maze
         self.__initialize_maze()
 
     def __initialize_maze(self):
-        ''' Initializes a 2D array representing the maze.
+        ''' Initializes the grid representing the maze.
 
         Initially, the maze only contains [space] characters
         in addition to the start and end characters.
@@ -66,25 +159,19 @@ class AStarModel:
         Returns:
             None
         '''
-        self.__curr_maze = [[' '] * self.__nCol for _ in range(self.__nRow)]
-        self.__prev_maze = self.__curr_maze
-        self.__curr_maze[self.__start[0]][self.__start[1]] = 'S'
-        self.__curr_maze[self.__end[0]][self.__end[1]] = 'E'
+        self.__grid.reset()
+        self.__grid.set(self.__grid.index(self.__start), Grid.START)
+        self.__grid.set(self.__grid.index(self.__end), Grid.END)
+        self.__maze_version += 1
 
-    def __update_maze(self, is_rapid_config):
-        ''' Updates the maze array to reflect the current search state.
+        # The view draws the entire grid initially
+        self.__grid.take_changes()
 
-        By maintaining the maze array, the GUI can be easily updated
-        after each iteration of the search.
+    def __update_maze(self, is_rapid_config):
+        ''' Publishes the current search state of the maze.
 
-        Symbols:
-            [space] - Empty
-            W - Wall
-            S - Start
-            E - End
-            ? - Unsolved
-            X - Solved
-            P - Path
+        The grid is kept up to date as the search runs, so the GUI can be
+        easily updated after each iteration of the search.
 
         Args:
             is_rapid_config::[bool]
@@ -93,42 +180,26 @@ class AStarModel:
         Returns:
             None
         '''
+        profiler = self.__profiler
+        if profiler is not None:
+            update_start_time = time.perf_counter()
+
         # Update stats
         self.__update_stats()
 
-        # Store current maze into previous maze
-        self.__prev_maze = self.__curr_maze
-
-        # Clear potentially removed symbols ('S', 'E', or 'W')
-        self.__curr_maze = [[' '] * self.__nCol for _ in range(self.__nRow)]
-
-        # Update the current maze
-        for x in range(self.__nRow):
-            for y in range(self.__nCol):
-                symbol = ' '
-                if self.__is_wall((x, y)):
-                    symbol = 'W'
-                elif Node(position=(x, y)) in self.solved:
-                    symbol = 'X'
-                elif Node(position=(x, y)) in self.unsolved:
-                    symbol = '?'
-
-                self.__curr_maze[x][y] = symbol
-
-        # Path symbols overwrite wall, solved, and unsolved symbols
-        for (x, y) in self.path:
-            self.__curr_maze[x][y] = 'P'
-
-        # Start and end symbols overwrite everything
-        self.__curr_maze[self.__start[0]][self.__start[1]] = 'S'
-        self.__curr_maze[self.__end[0]][self.__end[1]] = 'E'
-
         if self.__settings['enablePrintToConsole']:
+            if profiler is not None:
+                print_start_time = time.perf_counter()
             self.print_maze()
+            if profiler is not None:
+                profiler.add('print', time.perf_counter() - print_start_time)
 
         # Update the GUI
         self.__notify_maze_changed(is_rapid_config)
 
+        if profiler is not None:
+            profiler.add('mazeUpdate', time.perf_counter() - update_start_time)
+
     def __update_stats(self):
         ''' Updates some metrics.
 
@@ -138,52 +209,133 @@ class AStarModel:
         Returns:
             None
         '''
-        self.__stats['numUnsolved'] = len(self.unsolved)
-        self.__stats['numSolved'] = len(self.solved)
+        if self.__cached_result is not None:
+            self.__stats['numUnsolved'] = self.__cached_result['numUnsolved']
+            self.__stats['numSolved'] = self.__cached_result['numSolved']
+            self.__stats['suboptimalityBound'] = self.__cached_result.get('suboptimalityBound')
+        elif self.__engine is not None:
+            self.__stats['numUnsolved'] = self.__engine.get_num_unsolved()
+            self.__stats['numSolved'] = self.__engine.get_num_solved()
+            self.__stats['suboptimalityBound'] = self.__get_suboptimality_bound()
+        else:
+            self.__stats['numUnsolved'] = 0
+            self.__stats['numSolved'] = 0
+            self.__stats['suboptimalityBound'] = None
         self.__stats['numPath'] = len(self.path)
+        self.__stats['profile'] = self.__profiler.get_profile() if self.__profiler is not None else None
+
+        landmarks = self.__landmarks.get((self.__settings['allowDiagonals'], self.__settings['numLandmarks']))
+        self.__stats['landmarks'] = (landmarks.get_stats()
+                                     if landmarks is not None and self.__settings['heuristic'] == 'alt' else None)
 
         if self.is_solving():
-            self.__stats['elapsedTime'] = '{:.3f}'.format(
-                time.time() - self.__start_time)
+            self.__update_elapsed_time()
 
-    def __notify_maze_changed(self, is_rapid_config):
-        ''' Notifies the attached view to update its interface based on the new data.
-        Only update nodes that have changed to improve performance.
+    def __get_suboptimality_bound(self):
+        ''' Returns the suboptimality bound reported by the engine of the current search.
 
         Args:
-            is_rapid_config::[bool]
-                Calls update_idletasks() on the GUI if true, and update() if false
+            None
+
+        Returns:
+            [float]
+                How many times longer than the shortest path the path may be, or None if unknown
+        '''
+        if hasattr(self.__engine, 'get_suboptimality_bound'):
+            return self.__engine.get_suboptimality_bound()
+        return None
+
+    def __update_elapsed_time(self):
+        ''' Updates the elapsed time of the current search.
+        Time spent rendering frames is not counted.
+
+        Args:
+            None
 
         Returns:
             None
         '''
-        if self.__view is not None:
-            diff_positions = self.__get_diff_positions()
-            self.__view.update_gui(
-                maze=self.__curr_maze,
-                diff_positions=diff_positions,
-                is_rapid_config=is_rapid_config)
+        self.__stats['elapsedTime'] = '{:.3f}'.format(
+            time.time() - self.__start_time - self.__render_time)
 
-    def __get_diff_positions(self):
-        ''' Returns a list of positions representing the positions that differ between
-        the current maze and the previous maze.
+    def __tick(self):
+        ''' Called by the search engine once per expansion.
+        Renders a frame if one is due.
 
         Args:
             None
 
         Returns:
-            diff_positions::[list]
-                The positions that differ between the current and previous mazes
+            [bool]
+                Whether or not the search should continue
         '''
-        diff_positions = []
+        frame = self.__scheduler.tick()
+        if frame != RenderScheduler.NONE:
+            self.__render_frame(frame)
+        return self.__is_currently_solving
+
+    def __render_frame(self, frame):
+        ''' Renders a frame scheduled by the RenderScheduler during a search.
+
+        Args:
+            frame::[int]
+                RenderScheduler.FRAME to draw the changed nodes,
+                or RenderScheduler.POLL to only let the view process events
 
-        # Only update nodes that have changed
-        for x in range(self.__nRow):
-            for y in range(self.__nCol):
-                if self.__curr_maze[x][y] != self.__prev_maze[x][y]:
-                    diff_positions.append((x, y))
+        Returns:
+            None
+        '''
+        render_start_time = time.time()
 
-        return diff_positions
+        if frame == RenderScheduler.FRAME:
+            self.__update_maze(is_rapid_config=False)
+        elif self.__events is not None:
+            # The view processes its own events while the search runs on another thread
+            self.__update_stats()
+        else:
+            self.__update_stats()
+            if self.__view is not None:
+                self.__view.update_gui(maze=self.__grid,
+                                       diff_positions=[],
+                                       is_rapid_config=False)
+
+        self.__render_time += time.time() - render_start_time
+
+    def __notify_maze_changed(self, is_rapid_config):
+        ''' Notifies the attached view to update its interface based on the new data.
+        Only nodes that have changed state since the last notification are passed to the view.
+
+        Args:
+            is_rapid_config::[bool]
+                Calls update_idletasks() on the GUI if true, and update() if false
+
+        Returns:
+            None
+        '''
+        if self.__events is None and self.__view is None:
+            return
+
+        profiler = self.__profiler
+        if profiler is not None:
+            diff_start_time = time.perf_counter()
+
+        diff_positions = self.__grid.take_changes()
+
+        if profiler is not None:
+            render_start_time = time.perf_counter()
+            profiler.add('diff', render_start_time - diff_start_time)
+
+        if self.__events is not None:
+            # Blocks while the view is behind, so the search runs no faster than it can be drawn
+            self.__events.put(('changes', diff_positions))
+        else:
+            self.__view.update_gui(
+                maze=self.__grid,
+                diff_positions=diff_positions,
+                is_rapid_config=is_rapid_config)
+
+        if profiler is not None:
+            profiler.add('render', time.perf_counter() - render_start_time)
 
     '''
     GETTERS.
@@ -196,10 +348,16 @@ class AStarModel:
         return self.__nCol
 
     def get_curr_maze(self):
-        return self.__curr_maze
+        return self.__grid
+
+    def get_symbol(self, pos):
+        return self.__grid.get_symbol(pos)
 
     def get_walls(self):
-        return self.__walls
+        return set(map(self.__grid.position, self.__grid.find_all(Grid.WALL)))
+
+    def get_wall_bits(self):
+        return self.__grid.wall_bits()
 
     def get_start(self):
         return self.__start
@@ -210,6 +368,69 @@ class AStarModel:
     def is_solving(self):
         return self.__is_currently_solving
 
+    def get_maze_version(self):
+        return self.__maze_version
+
+    def get_maze_key(self):
+        ''' Returns a canonical hash of the grid size, walls, start, end, and the settings that affect the search.
+        Two models with the same key always produce the same solve result.
+
+        The wall digest is only recomputed after the maze changes.
+
+        Args:
+            None
+
+        Returns:
+            [str]
+                The hex digest identifying the maze
+        '''
+        if self.__wall_digest_version != self.__maze_version:
+            self.__wall_digest = hashlib.sha256(
+                self.__grid.wall_plane()).hexdigest()
+            self.__wall_digest_version = self.__maze_version
+
+        description = json.dumps({
+            'nRow': self.__nRow,
+            'nCol': self.__nCol,
+            'start': self.__start,
+            'end': self.__end,
+            'walls': self.__wall_digest,
+            'settings': {setting: self.__settings[setting] for setting in self.__SEARCH_SETTINGS}
+        }, sort_keys=True)
+
+        return hashlib.sha256(description.encode('utf-8')).hexdigest()
+
+    def export_profile(self, filename):
+        ''' Writes the profile of the last solve to a JSON file.
+
+        Args:
+            filename::[str]
+                The path of the profile file
+
+        Returns:
+            None
+        '''
+        if self.__profiler is None:
+            raise ValueError(
+                'There is no profile to export. Enable the enableProfiling setting and solve first.')
+        self.__profiler.save(filename)
+
+    def save_trace(self, filename):
+        ''' Writes the search trace of the last solve to a file (see astar_trace.TracePlayer to replay it).
+
+        Args:
+            filename::[str]
+                The path of the trace file
+
+        Returns:
+            None
+        '''
+        if self.__trace is None:
+            raise ValueError(
+                'There is no trace to save. Enable the recordTrace setting and solve first.')
+        with open(filename, 'wb') as file:
+            file.write(self.__trace)
+
     def get_setting(self, setting):
         if setting not in self.__settings:
             raise ValueError(
@@ -234,6 +455,18 @@ class AStarModel:
                 'The setting [{}] does not exist.'.format(setting))
         self.__settings[setting] = val
 
+    def set_cache(self, cache):
+        ''' Attaches a persistent cache of solve results (or detaches it if None).
+
+        Args:
+            cache::[SolveCache]
+                The cache to look up and store solve results in
+
+        Returns:
+            None
+        '''
+        self.__cache = cache
+
     '''
     SETTERS FOR SPECIAL NODES.
     '''
@@ -244,7 +477,10 @@ class AStarModel:
                 self.__clear_solve_containers()
                 if self.__settings['enablePrintToConsole']:
                     print('Setting new start point: {}'.format(start))
+                self.__grid.set(self.__grid.index(self.__start), Grid.EMPTY)
+                self.__grid.set(self.__grid.index(start), Grid.START)
                 self.__start = start
+                self.__maze_version += 1
                 self.__update_maze(is_rapid_config=True)
             elif self.__settings['enablePrintToConsole']:
                 raise ValueError(
@@ -259,7 +495,10 @@ class AStarModel:
                 self.__clear_solve_containers()
                 if self.__settings['enablePrintToConsole']:
                     print('Setting new end point: {}'.format(end))
+                self.__grid.set(self.__grid.index(self.__end), Grid.EMPTY)
+                self.__grid.set(self.__grid.index(end), Grid.END)
                 self.__end = end
+                self.__maze_version += 1
                 self.__update_maze(is_rapid_config=True)
             elif self.__settings['enablePrintToConsole']:
                 raise ValueError(
@@ -278,13 +517,21 @@ class AStarModel:
                     print('{} wall: {}'.format(
                         'Setting' if val else 'Removing', str(pos)))
 
-                x, y = pos
-
                 # Set / remove wall
-                if val:
-                    self.__walls.add(pos)
-                elif pos in self.__walls:
-                    self.__walls.remove(pos)
+                cell = self.__grid.index(pos)
+                if self.__grid.cells[cell] != (Grid.WALL if val else Grid.EMPTY):
+                    self.__grid.set(cell, Grid.WALL if val else Grid.EMPTY)
+                    self.__maze_version += 1
+
+                    # Incremental engines repair their search instead of starting over
+                    for engine in self.__engines.values():
+                        if hasattr(engine, 'on_cell_changed'):
+                            engine.on_cell_changed(cell)
+                    for connectivity in self.__connectivity.values():
+                        connectivity.on_cell_changed(cell)
+
+                    # Landmark distances only hold for the walls they were measured with
+                    self.__landmarks = {}
 
                 self.__update_maze(is_rapid_config=True)
 
@@ -295,6 +542,26 @@ class AStarModel:
             raise ValueError(
                 'The provided wall position is out of bounds for an {} x {} maze: {}'.format(self.__nRow, self.__nCol, pos))
 
+    def generate_maze(self, generator, seed=None, **options):
+        ''' Replaces the maze with a procedurally generated maze of the same size (see astar_generator).
+
+        Args:
+            generator::[str]
+                The name of the generator (see astar_generator.GENERATORS)
+            seed::[int]
+                The seed of the random number generator (None for a random maze)
+            options::[dict]
+                Options of the generator (e.g. density for 'random')
+
+        Returns:
+            None
+        '''
+        if self.__nRow != self.__nCol:
+            raise ValueError('Only square mazes can be generated. The maze is {} x {}.'.format(
+                self.__nRow, self.__nCol))
+
+        self.import_maze_data(generate_maze(generator, self.__nRow, seed, **options))
+
     def import_maze_data(self, maze_data):
         ''' Loads a maze given a maze dictionary object.
 
@@ -304,21 +571,46 @@ class AStarModel:
 
         Args:
             maze_data::[dict]
-                The imported maze data containing the start, end, and wall positions
+                The imported maze data containing the start, end, and either the wall positions ('walls'),
+                the packed wall plane ('wallBits', see Grid.wall_bits()), or the wall plane ('wallPlane',
+                see Grid.wall_plane())
 
         Returns:
             None
         '''
+        self.__clear_solve_containers()
         self.__start = tuple(maze_data['start'])
         self.__end = tuple(maze_data['end'])
-        self.__walls = set([tuple(wall) for wall in maze_data['walls']])
+
+        if 'wallBits' in maze_data:
+            self.__grid.load_wall_bits(maze_data['wallBits'])
+        elif 'wallPlane' in maze_data:
+            self.__grid.load_wall_plane(maze_data['wallPlane'])
+        else:
+            self.__grid.reset()
+            for wall in maze_data['walls']:
+                self.__grid.set(self.__grid.index(wall), Grid.WALL)
+        self.__grid.set(self.__grid.index(self.__start), Grid.START)
+        self.__grid.set(self.__grid.index(self.__end), Grid.END)
+        self.__maze_version += 1
+
+        # The search state of every engine and the regions belong to the previous maze
+        self.__engines = {}
+        self.__connectivity = {}
+        self.__landmarks = {}
+
         self.__update_maze(is_rapid_config=False)
 
     def __clear_solve_containers(self):
-        self.unsolved = set()
-        self.solved = set()
+        self.__grid.clear_search()
+        self.__engine = None
+        self.__cached_result = None
+        self.__profiler = None
+        self.__trace = None
         self.path = []
         self.__stats['elapsedTime'] = 0
+        self.__stats['isCacheHit'] = False
+        self.__stats['connectivityBuildTime'] = None
 
     '''
     VALIDATION METHODS.
@@ -348,29 +640,14 @@ class AStarModel:
             [bool]
                 Whether or not the position is a wall
         '''
-        return pos in self.__walls
-
-    def __can_move_to_node(self, node):
-        ''' Returns true if the given node is a valid node to move to and false otherwise.
-
-        Args:
-            node::[AstarNode]
-                The node to check
-
-        Returns:
-            [bool]
-                Whether or not the node is a valid node to move to
-        '''
-        # You can move to a node if it is at a valid position and if it is not a wall
-        pos = node.position
-        return self.__is_position_valid(pos) and not self.__is_wall(pos)
+        return self.__grid.cells[self.__grid.index(pos)] == Grid.WALL
 
     '''
     PRINT METHODS.
     '''
 
     def print_maze(self):
-        [print(row) for row in self.__curr_maze]
+        [print(row) for row in self.__grid.rows()]
         print()
 
     def print_path(self):
@@ -380,29 +657,70 @@ class AStarModel:
     SEARCH METHODS.
     '''
 
-    def __calculate_path(self, curNode):
-        ''' Calculates the solved path given the end node.
-        Assigns the path to an instance variable.
+    def __calculate_path(self, pathCells):
+        ''' Assigns the solved path to an instance variable and marks it in the grid.
 
         Args:
-            curNode::[AstarNode]
-                The end node that was found
+            pathCells::[list]
+                The indices of the cells on the path from the start to the end
 
         Returns:
             None
         '''
-        self.path = []
+        grid = self.__grid
+        cells = grid.cells
+
+        for cell in pathCells:
+            if cells[cell] in Grid.SEARCH_STATES or cells[cell] == Grid.EMPTY:
+                grid.set(cell, Grid.PATH)
 
-        # Iterate through the parent nodes of the end node until the start node is reached
-        while (curNode is not None):
-            self.path.append(curNode.position)
-            curNode = curNode.parent
+        self.path = [grid.position(cell) for cell in pathCells]
 
-        self.path.reverse()
+    def __restore_cached_result(self, result):
+        ''' Restores the path and search statistics of a cached solve result.
 
-    def solve(self):
+        Args:
+            result::[dict]
+                The cached result
+
+        Returns:
+            None
+        '''
+        self.__calculate_path(result['path'])
+        self.__cached_result = result
+        self.__stats['isCacheHit'] = True
+
+    def solve(self, events=None):
         ''' Solves the maze.
 
+        If a cache is attached, a cached result for the same maze and search
+        settings is returned without searching, and new results are stored.
+
+        To solve on a worker thread, pass a queue: each frame of the search is
+        put on it as a ('changes', diff_positions) event instead of calling the
+        view, and the view drains the queue on its own thread. The maze must
+        not be edited until solve() returns.
+
+        Args:
+            events::[queue.Queue]
+                Receives the changes instead of the view while solving (None to update the view directly)
+
+        Returns:
+            [bool]
+                Whether or not the search successfully reached the end node
+        '''
+        self.__events = events
+        try:
+            return self.__solve()
+        finally:
+            self.__events = None
+            if self.__trace_recorder is not None:
+                self.__trace = self.__trace_recorder.finish()
+                self.__trace_recorder = None
+
+    def __solve(self):
+        ''' Solves the maze (see solve()).
+
         Args:
             None
 
@@ -412,85 +730,228 @@ class AStarModel:
         '''
         self.__is_currently_solving = True
         self.__start_time = time.time()
+        self.__render_time = 0
         self.__clear_solve_containers()
+        self.__profiler = Profiler() if self.__settings['enableProfiling'] else None
+        if self.__settings['recordTrace']:
+            self.__trace_recorder = TraceRecorder(self.__grid, self.__start, self.__end)
+
+        if self.__settings['enablePrintToConsole']:
+            print('Solving the maze starting at {} and ending at {}.'.format(
+                self.__start, self.__end))
+
+        if self.__cache is not None:
+            cache_key = self.get_maze_key()
+            result = self.__cache.get(cache_key)
+            if result is not None:
+                self.__restore_cached_result(result)
+                return self.__finish_solve(is_found=result['success'])
+
+        # An end in another region than the start cannot be reached, so there is nothing to search
+        if (self.__settings['checkConnectivity'] and
+                not self.__get_connectivity().is_connected(self.__grid.index(self.__start),
+                                                           self.__grid.index(self.__end))):
+            if self.__settings['enablePrintToConsole']:
+                print('The end is not connected to the start.')
+            return self.__finish_solve(is_found=False)
+
+        self.__engine = self.__get_engine(self.__settings['engine'])
+        if hasattr(self.__engine, 'set_profiler'):
+            self.__engine.set_profiler(self.__profiler)
+        if hasattr(self.__engine, 'set_landmarks'):
+            self.__engine.set_landmarks(self.__get_landmarks() if self.__settings['heuristic'] == 'alt' else None)
+
+        # Decides when the search is drawn
+        self.__scheduler = RenderScheduler(expansions_per_frame=self.__settings['expansionsPerFrame'],
+                                           frames_per_second=self.__settings['framesPerSecond'])
+        self.__scheduler.start()
+
+        pathCells = self.__engine.search(self.__grid.index(self.__start),
+                                         self.__grid.index(self.__end),
+                                         dict(self.__settings),
+                                         self.__tick)
+        is_complete = self.is_solving()
+
+        if pathCells is not None:
+            self.__calculate_path(pathCells)
+
+        # Searches stopped by the user are not cached
+        if self.__cache is not None and is_complete:
+            self.__cache.put(cache_key, {
+                'success': pathCells is not None,
+                'path': pathCells or [],
+                'numSolved': self.__engine.get_num_solved(),
+                'numUnsolved': self.__engine.get_num_unsolved(),
+                'suboptimalityBound': self.__get_suboptimality_bound()
+            })
+
+        return self.__finish_solve(is_found=pathCells is not None)
+
+    def query_path(self, start):
+        ''' Returns a shortest path from any position to the end without solving or changing the maze.
+
+        The path is read from the reverse distance field of the end (see
+        astar_distance_field.DistanceFieldSearch). The first query for an end
+        builds the field, and later queries from any start cost only the
+        length of their path until a wall changes.
+
+        Args:
+            start::[tuple]
+                The position to start from
 
-        # Constant offsets
-        DIAGONAL_OFFSETS = [(-1, 1), (1, 1), (-1, -1), (1, -1)]
-        OFFSETS = [(0, 1), (-1, 0), (1, 0), (0, -1)]
+        Returns:
+            [list]
+                The positions on the path from the start to the end, or None if the end cannot be reached
+        '''
+        if not self.__is_position_valid(start):
+            raise ValueError(
+                'The provided start position is out of bounds for an {} x {} maze: {}'.format(self.__nRow, self.__nCol, start))
 
-        # Add DIAGONAL_OFFSETS to OFFSETS if diagonal movement is allowed
-        if self.__settings['allowDiagonals']:
-            OFFSETS.extend(DIAGONAL_OFFSETS)
+        engine = self.__get_engine('distance-field')
+        field = engine.get_field(self.__grid.index(self.__end), self.__settings['allowDiagonals'])
+        pathCells = field.path_from(self.__grid.index(start))
+        if pathCells is None:
+            return None
+        return [self.__grid.position(cell) for cell in pathCells]
 
-        print('Solving the maze starting at {} and ending at {}.'.format(
-            self.__start, self.__end))
+    def __get_engine(self, name):
+        ''' Returns the search engine with the given name, creating it if needed.
+        Engines are kept so that incremental engines can reuse their previous search.
 
-        # Start and end nodes
-        startNode = Node(None, self.__start)
-        endNode = Node(None, self.__end)
+        Args:
+            name::[str]
+                The name of the engine (see ENGINES)
 
-        # Queue the starting node
-        self.unsolved.add(startNode)
+        Returns:
+            [object]
+                The search engine
+        '''
+        if name not in ENGINES:
+            raise ValueError('The engine [{}] does not exist. Choose one of: {}'.format(
+                name, ', '.join(ENGINES)))
 
-        while self.is_solving() and len(self.unsolved) != 0:
-            self.__update_maze(is_rapid_config=False)
+        if name not in self.__engines:
+            self.__engines[name] = ENGINES[name](self.__grid)
+        return self.__engines[name]
+
+    def __get_connectivity(self):
+        ''' Returns the connected regions of the maze for the current movement setting, labelling them if needed.
+        The time spent labelling counts towards the elapsed time, and is also reported in the 'connectivityBuildTime' stat.
+
+        Args:
+            None
+
+        Returns:
+            [ConnectivityIndex]
+                The connected regions of the maze
+        '''
+        allow_diagonals = self.__settings['allowDiagonals']
+        if allow_diagonals not in self.__connectivity:
+            self.__connectivity[allow_diagonals] = ConnectivityIndex(self.__grid, allow_diagonals)
+        connectivity = self.__connectivity[allow_diagonals]
+
+        build_time = connectivity.build()
+        self.__stats['connectivityBuildTime'] = build_time
+        if build_time and self.__settings['enablePrintToConsole']:
+            print('Labelled the connected regions in {:.3f} seconds.'.format(build_time))
+        return connectivity
+
+    def __get_landmarks(self):
+        ''' Returns the landmarks of the 'alt' heuristic for the current settings, picking them if needed.
+        Landmarks are placed in the region of the end, and picked again once a wall changes or the end moves to another region.
+
+        Args:
+            None
+
+        Returns:
+            [Landmarks]
+                The landmarks and their distances
+        '''
+        key = (self.__settings['allowDiagonals'], self.__settings['numLandmarks'])
+        end = self.__grid.index(self.__end)
+
+        # Landmarks in another region than the end bound nothing, so the search would fall back to 'auto'
+        if key not in self.__landmarks or not self.__landmarks[key].reaches(end):
+            landmarks = Landmarks(self.__grid, key[0], key[1], seed=end)
+            self.__landmarks[key] = landmarks
+
+            if self.__settings['enablePrintToConsole']:
+                stats = landmarks.get_stats()
+                print('Picked {} landmarks in {:.3f} seconds ({:.1f} MB of distances).'.format(
+                    stats['count'], stats['preprocessingTime'], stats['memoryBytes'] / 1024 ** 2))
+        return self.__landmarks[key]
 
-            # Get the node with the minimum 'f' value from the unsolved list
-            curNode = min(self.unsolved, key=attrgetter('f'))
+    def __finish_solve(self, is_found):
+        ''' Stops the solver and publishes the final state of the search.
 
-            # Remove the current node from the unsolved list and append it to the solved list
-            self.unsolved.remove(curNode)
-            self.solved.add(curNode)
+        Args:
+            is_found::[bool]
+                Whether or not the search reached the end node
 
-            # Done if the current node is the end node
-            if curNode == endNode:
-                self.stop_solving()
-                self.__calculate_path(curNode)
+        Returns:
+            [bool]
+                Whether or not the search reached the end node
+        '''
+        self.__update_elapsed_time()
+        self.stop_solving()
+
+        if is_found:
+            if self.__settings['enablePrintToConsole']:
                 self.print_path()
-                self.__update_maze(is_rapid_config=False)
+            self.__update_maze(is_rapid_config=False)
+            if self.__settings['enablePrintToConsole']:
                 print(
                     'A* search completed in {} seconds!\n'.format(self.__stats['elapsedTime']))
-                return True
-
-            # Check adjacent nodes
-            for offset in OFFSETS:
-                offsetPos = (curNode.position[0] + offset[0],
-                             curNode.position[1] + offset[1])
-
-                adjNode = Node(None, offsetPos)
-
-                # Don't do anything if the adjacent node is a wall or already solved
-                if not self.__can_move_to_node(adjNode) or adjNode in self.solved:
-                    continue
-
-                # Calculate adjacent node properties
-                adjNode.parent = curNode
-                adjNode.g = curNode.g + 1
-                adjNode.h = math.sqrt(abs(endNode.position[0] - adjNode.position[0]) ** 2 + abs(
-                    endNode.position[1] - adjNode.position[1]) ** 2)
-                adjNode.f = adjNode.g + adjNode.h
-
-                # Add adjacent nodes to the unsolved list
-                if adjNode not in self.unsolved:
-                    self.unsolved.add(adjNode)
-
-                # Update the adjacent node in the unsolved list if the new g value is less than the old g value
-                else:
-                    # Get the existing adjacent node from the unsolved list
-                    for existingNode in self.unsolved:
-                        if existingNode.__eq__(adjNode):
-                            # Update the existing node's values
-                            if adjNode.g < existingNode.g:
-                                existingNode.g = adjNode.g
-                                existingNode.f = adjNode.f
-                                existingNode.parent = adjNode.parent
-
-        # Failed to find a path
-        self.stop_solving()
-        self.__update_maze(is_rapid_config=False)
-        print('Failed to complete the search in {} seconds.\n'.format(
-            self.__stats['elapsedTime']))
-        return False
+        else:
+            self.__update_maze(is_rapid_config=False)
+            if self.__settings['enablePrintToConsole']:
+                print('Failed to complete the search in {} seconds.\n'.format(
+                    self.__stats['elapsedTime']))
+
+        return is_found
+
+
+def load_maze_data(filename):
+    ''' Reads an exported maze file in either the JSON or the binary format.
+
+    Args:
+        filename::[str]
+            The path of the maze file
+
+    Returns:
+        [dict]
+            The maze data containing the grid width, the start and end positions, and either the
+            wall positions ('walls', JSON) or the packed wall plane ('wallBits', binary)
+    '''
+    if is_binary_maze_file(filename):
+        return read_binary_maze(filename)
+
+    with open(filename, 'r') as file:
+        return json.load(file)
+
+
+def save_maze_data(filename, maze_data):
+    ''' Writes a maze file, in the binary format if the filename ends in BINARY_EXTENSION and in JSON otherwise.
+
+    Args:
+        filename::[str]
+            The path of the maze file
+        maze_data::[dict]
+            The maze data containing the grid width, the start and end positions, and either the
+            wall positions ('walls') or the packed wall plane ('wallBits')
+
+    Returns:
+        None
+    '''
+    if filename.endswith(BINARY_EXTENSION):
+        write_binary_maze(filename, maze_data)
+        return
+
+    if 'wallBits' in maze_data:
+        raise ValueError('JSON maze files store wall positions. Received a packed wall plane instead.')
+
+    with open(filename, 'w') as file:
+        json.dump(maze_data, file)
 
 
 def main():
@@ -1,22 +1,61 @@
-class Node:
-    '''
+from array import array
+import math
+
+
+class NodePool:
+    ''' Struct-of-arrays storage for one search node per grid cell.
+
+    Nodes are identified by their cell index. The g-score and parent cell index of
+    every node are stored in flat arrays, so the search allocates no objects per
+    node and paths are recovered by walking the parent array.
+
     @params
-        parent: the parent node
-        position: the position of this node
-        f: the total cost of the node (g + h)
-        g: the cost from the start to this node
-        h: an approximate cost from this node to the end
+        size: the number of cells in the grid
     '''
 
-    def __init__(self, parent=None, position=None):
-        self.parent = parent
-        self.position = position
-        self.f = 0
-        self.g = 0
-        self.h = 0
+    def __init__(self, size):
+        self.size = size
+
+        # The cost from the start to each cell (infinity if unreached)
+        self.g = array('d', [math.inf]) * size
+
+        # The parent cell index of each cell (-1 if none)
+        self.parent = array('i', [-1]) * size
+
+        # Cells whose g-score and parent were set since the last reset
+        self.touched = array('i')
+
+    def reset(self):
+        ''' Resets the nodes touched since the last reset.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        g = self.g
+        parent = self.parent
+        for cell in self.touched:
+            g[cell] = math.inf
+            parent[cell] = -1
+        self.touched = array('i')
+
+    def path_to(self, cell):
+        ''' Returns the cell indices on the path from the root node to the given cell.
 
-    def __eq__(self, other):
-        return self.position == other.position
+        Args:
+            cell::[int]
+                The index of the last cell on the path
 
-    def __hash__(self):
-        return hash(self.position)
+        Returns:
+            [list]
+                The cell indices from the root to the given cell
+        '''
+        path = []
+        parent = self.parent
+        while cell != -1:
+            path.append(cell)
+            cell = parent[cell]
+        path.reverse()
+        return path
@@ -0,0 +1,133 @@
+import heapq
+import itertools
+
+
+class OpenList:
+    ''' A priority queue of unsolved nodes backed by a binary heap.
+
+    Entries are keyed (e.g. by position) so that membership tests and lookups
+    are O(1). Updating the priority of a queued key uses lazy deletion: the old
+    heap entry is marked as removed and a new entry is pushed, so both push and
+    pop stay O(log n).
+
+    Ties between equal priorities are broken in insertion order.
+    '''
+
+    # Marker stored in the item slot of a heap entry that has been superseded
+    __REMOVED = object()
+
+    def __init__(self):
+        self.__heap = []
+        self.__entries = {}
+        self.__counter = itertools.count()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, key):
+        return key in self.__entries
+
+    def __iter__(self):
+        return (entry[3] for entry in self.__entries.values())
+
+    def push(self, key, priority, item):
+        ''' Queues an item under the given key, replacing any queued item with the same key.
+
+        Args:
+            key::[hashable]
+                The key identifying the item (e.g. its position)
+            priority::[float]
+                The priority of the item (lower is popped first)
+            item::[object]
+                The item to queue
+
+        Returns:
+            None
+        '''
+        if key in self.__entries:
+            self.__entries[key][3] = self.__REMOVED
+
+        entry = [priority, next(self.__counter), key, item]
+        self.__entries[key] = entry
+        heapq.heappush(self.__heap, entry)
+
+    def pop(self):
+        ''' Removes and returns the item with the lowest priority.
+
+        Args:
+            None
+
+        Returns:
+            [object]
+                The item with the lowest priority
+
+        Raises:
+            KeyError if the open list is empty
+        '''
+        while self.__heap:
+            _, _, key, item = heapq.heappop(self.__heap)
+            if item is not self.__REMOVED:
+                del self.__entries[key]
+                return item
+
+        raise KeyError('Cannot pop from an empty open list.')
+
+    def peek_priority(self):
+        ''' Returns the lowest priority in the open list without removing its item.
+
+        Args:
+            None
+
+        Returns:
+            [float]
+                The lowest priority, or None if the open list is empty
+        '''
+        heap = self.__heap
+        while heap and heap[0][3] is self.__REMOVED:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def remove(self, key):
+        ''' Removes the item with the given key if it is queued.
+
+        Args:
+            key::[hashable]
+                The key identifying the item
+
+        Returns:
+            None
+        '''
+        entry = self.__entries.pop(key, None)
+        if entry is not None:
+            entry[3] = self.__REMOVED
+
+    def get(self, key):
+        ''' Returns the queued item with the given key, or None if the key is not queued.
+
+        Args:
+            key::[hashable]
+                The key identifying the item
+
+        Returns:
+            [object]
+                The queued item or None
+        '''
+        entry = self.__entries.get(key)
+        return entry[3] if entry is not None else None
+
+    def get_priority(self, key):
+        ''' Returns the priority of the queued item with the given key.
+
+        Args:
+            key::[hashable]
+                The key identifying the item
+
+        Returns:
+            [float]
+                The priority of the queued item
+        '''
+        return self.__entries[key][0]
+
+    def clear(self):
+        self.__heap = []
+        self.__entries = {}
@@ -0,0 +1,138 @@
+from collections import defaultdict
+from tkinter import PhotoImage, NW
+
+
+class PixelRenderer:
+    ''' Draws a maze into a single PhotoImage pixel buffer on a canvas.
+
+    Every cell is a block of pixels in the image rather than its own canvas
+    item, so the number of Tk items no longer grows with the grid. Only the
+    changed cells are redrawn: one block per cell, or a whole band of pixel
+    rows when many cells in the same band changed.
+
+    Cells are mapped to pixels along each axis by scaling their index, so a
+    grid wider than the image shares pixels between neighbouring cells (the
+    last cell drawn wins).
+
+    @params
+        canvas: the canvas to draw the image on
+        width: the width and height of the image in pixels
+        nRow: the number of rows in the maze (drawn along the canvas x axis)
+        nCol: the number of columns in the maze (drawn along the canvas y axis)
+        colours: the colour of each cell state (e.g. {Grid.WALL: 'gray25'})
+    '''
+
+    # Redraw a whole band once this many of its cells changed
+    BAND_THRESHOLD = 16
+
+    # Redraw the whole image once this fraction of the cells changed
+    FULL_REDRAW_FRACTION = 0.125
+
+    def __init__(self, canvas, width, nRow, nCol, colours):
+        self.__width = width
+        self.__nRow = nRow
+        self.__nCol = nCol
+
+        # Hex colours parse faster than colour names, indexed by cell state
+        self.__colours = ['#000000'] * 256
+        for state, colour in colours.items():
+            red, green, blue = canvas.winfo_rgb(colour)
+            self.__colours[state] = '#{:02x}{:02x}{:02x}'.format(red >> 8, green >> 8, blue >> 8)
+
+        # The cell shown by each pixel along either axis
+        self.__pixel_to_row = [((px + 1) * nRow - 1) // width for px in range(width)]
+        self.__pixel_to_col = [((py + 1) * nCol - 1) // width for py in range(width)]
+
+        self.image = PhotoImage(master=canvas, width=width, height=width)
+        self.item = canvas.create_image(0, 0, image=self.image, anchor=NW)
+
+    def __get_span(self, index, count):
+        ''' Returns the pixels covered by a cell along one axis.
+
+        Args:
+            index::[int]
+                The index of the cell along the axis
+            count::[int]
+                The number of cells along the axis
+
+        Returns:
+            [tuple]
+                The first pixel and the pixel after the last one
+        '''
+        first = index * self.__width // count
+        return first, max((index + 1) * self.__width // count, first + 1)
+
+    def draw(self, maze, diff_positions):
+        ''' Redraws the cells at the given positions.
+
+        Args:
+            maze::[Grid]
+                The grid containing the state of every cell
+            diff_positions::[list]
+                The positions of the cells that changed since the previous draw
+
+        Returns:
+            None
+        '''
+        if len(diff_positions) >= maze.size * self.FULL_REDRAW_FRACTION:
+            self.draw_all(maze)
+            return
+
+        # Group the changed cells by the band of pixel rows they are drawn in
+        bands = defaultdict(list)
+        for x, y in diff_positions:
+            bands[y].append(x)
+
+        cells = maze.cells
+        colours = self.__colours
+        put = self.image.put
+
+        for y, xs in bands.items():
+            firstY, lastY = self.__get_span(y, self.__nCol)
+
+            if len(xs) >= self.BAND_THRESHOLD:
+                put(self.__get_band_data(maze, y), to=(0, firstY, self.__width, lastY))
+                continue
+
+            for x in xs:
+                firstX, lastX = self.__get_span(x, self.__nRow)
+                put(colours[cells[x * self.__nCol + y]], to=(firstX, firstY, lastX, lastY))
+
+    def draw_all(self, maze):
+        ''' Redraws every cell.
+
+        Args:
+            maze::[Grid]
+                The grid containing the state of every cell
+
+        Returns:
+            None
+        '''
+        rows = []
+        band = None
+        previousY = -1
+        for y in self.__pixel_to_col:
+            if y != previousY:
+                band = self.__get_band_data(maze, y)
+                previousY = y
+            rows.append(band)
+
+        self.image.put(' '.join(rows))
+
+    def __get_band_data(self, maze, y):
+        ''' Returns one row of pixels showing the cells in a maze column.
+
+        Args:
+            maze::[Grid]
+                The grid containing the state of every cell
+            y::[int]
+                The column of the cells
+
+        Returns:
+            [str]
+                The row of pixels in Tk image data format
+        '''
+        cells = maze.cells
+        colours = self.__colours
+        nCol = self.__nCol
+        return '{' + ' '.join([colours[cells[x * nCol + y]] for x in self.__pixel_to_row]) + '}'
@@ -0,0 +1,80 @@
+import json
+
+
+class Profiler:
+    ''' Accumulates the time spent in and the number of calls to each phase of a solve, and counts search events.
+
+    Phases:
+        select - popping the next cell from the unsolved list
+        expand - checking the neighbours of the popped cell (heuristic included)
+        heuristic - computing heuristic values not cached yet
+        mazeUpdate - publishing the state of the maze (diff, render, and print included)
+        diff - collecting the cells that changed since the last update
+        render - the view callback drawing the changes
+        print - printing the maze to the console
+
+    Counters:
+        pushed - cells queued in the unsolved list
+        popped - cells popped from the unsolved list
+        reopened - cells queued again after a shorter path to them was found
+
+    The search phases and counters are only recorded by engines that accept a
+    profiler (see AStarSearch.set_profiler()).
+    '''
+
+    PHASES = ('select', 'expand', 'heuristic', 'mazeUpdate', 'diff', 'render', 'print')
+    COUNTERS = ('pushed', 'popped', 'reopened')
+
+    def __init__(self):
+        self.times = dict.fromkeys(self.PHASES, 0.0)
+        self.calls = dict.fromkeys(self.PHASES, 0)
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+
+    def add(self, phase, seconds, calls=1):
+        ''' Records time spent in a phase.
+
+        Args:
+            phase::[str]
+                The name of the phase (see PHASES)
+            seconds::[float]
+                The time spent in the phase
+            calls::[int]
+                The number of calls the time was spent over
+
+        Returns:
+            None
+        '''
+        self.times[phase] += seconds
+        self.calls[phase] += calls
+
+    def count(self, counter, amount=1):
+        self.counters[counter] += amount
+
+    def get_profile(self):
+        ''' Returns the recorded times, calls, and counters.
+
+        Args:
+            None
+
+        Returns:
+            [dict]
+                The time and calls of every phase, and the value of every counter
+        '''
+        return {
+            'phases': {phase: {'time': self.times[phase], 'calls': self.calls[phase]}
+                       for phase in self.PHASES},
+            'counters': dict(self.counters)
+        }
+
+    def save(self, filename):
+        ''' Writes the recorded profile to a JSON file.
+
+        Args:
+            filename::[str]
+                The path of the profile file
+
+        Returns:
+            None
+        '''
+        with open(filename, 'w') as file:
+            json.dump(self.get_profile(), file, indent=2)
@@ -0,0 +1,92 @@
+import time
+
+
+class RenderScheduler:
+    ''' Decides when a running search should push its accumulated changes to the view.
+
+    A frame is due either every `expansions_per_frame` expansions or, if
+    `frames_per_second` is set, whenever a frame period has elapsed. If neither
+    is set, only the final result is drawn.
+
+    When no frame has been drawn for POLL_INTERVAL seconds, a poll is due instead
+    so that the view can still process events (e.g. the Stop button) without
+    redrawing the maze.
+
+    @params
+        expansions_per_frame: draw a frame every K expansions (0 to disable)
+        frames_per_second: draw at most this many frames per second (0 to disable)
+    '''
+
+    NONE = 0
+    FRAME = 1
+    POLL = 2
+
+    # Seconds between polls when no frame is drawn
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, expansions_per_frame=1, frames_per_second=0):
+        if expansions_per_frame < 0:
+            raise ValueError(
+                'The number of expansions per frame cannot be negative: {}'.format(expansions_per_frame))
+
+        if frames_per_second < 0:
+            raise ValueError(
+                'The number of frames per second cannot be negative: {}'.format(frames_per_second))
+
+        self.__expansions_per_frame = expansions_per_frame
+        self.__frame_period = 1 / frames_per_second if frames_per_second else 0
+        self.__expansions = 0
+        self.__next_frame_time = 0
+        self.__next_poll_time = 0
+
+    def start(self):
+        ''' Resets the schedule at the start of a search.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        now = time.perf_counter()
+        self.__expansions = 0
+        self.__next_frame_time = now + self.__frame_period
+        self.__next_poll_time = now + self.POLL_INTERVAL
+
+    def tick(self):
+        ''' Registers one expansion and returns what the search should render.
+
+        Args:
+            None
+
+        Returns:
+            [int]
+                RenderScheduler.FRAME if the changes should be drawn,
+                RenderScheduler.POLL if the view should only process events,
+                or RenderScheduler.NONE otherwise
+        '''
+        self.__expansions += 1
+
+        if self.__frame_period:
+            now = time.perf_counter()
+            if now >= self.__next_frame_time:
+                self.__next_frame_time = now + self.__frame_period
+                self.__next_poll_time = now + self.POLL_INTERVAL
+                return self.FRAME
+
+        elif self.__expansions_per_frame and self.__expansions % self.__expansions_per_frame == 0:
+            self.__next_poll_time = time.perf_counter() + self.POLL_INTERVAL
+            return self.FRAME
+
+        # Only check the clock periodically when frames are not time-based
+        elif self.__expansions % 64 != 0:
+            return self.NONE
+
+        else:
+            now = time.perf_counter()
+
+        if now >= self.__next_poll_time:
+            self.__next_poll_time = now + self.POLL_INTERVAL
+            return self.POLL
+
+        return self.NONE
@@ -0,0 +1,165 @@
+from tkinter import Toplevel, Frame, Button, Label, Scale, HORIZONTAL, W, EW
+
+
+class ReplayWindow(Toplevel):
+    ''' A window of controls that replays a recorded search trace onto the grid of a view.
+
+    The trace plays back at 10^k events per frame for any k up to MAX_SPEED,
+    and the position slider seeks to any event. The search is never run
+    again: the player only applies the recorded changes to the grid. The
+    window closes itself once the maze is changed.
+
+    @params
+        master: the view that owns the window
+        player: the TracePlayer of the trace
+        grid: the grid to replay onto (holding the traced maze)
+        draw: called with the positions of the cells that changed to redraw them
+        is_current: returns whether or not the grid still holds the traced maze
+    '''
+
+    # Milliseconds between replayed frames
+    FRAME_INTERVAL = 16
+
+    # Replay speeds are 10^k events per frame for k from 0 to MAX_SPEED
+    MAX_SPEED = 6
+
+    def __init__(self, master, player, grid, draw, is_current):
+        Toplevel.__init__(self, master)
+        self.title('Replay Trace')
+        self.resizable(0, 0)
+        self.protocol('WM_DELETE_WINDOW', self.close)
+
+        self.__player = player
+        self.__grid = grid
+        self.__draw = draw
+        self.__is_current = is_current
+
+        self.__speed = 2
+        self.__is_playing = False
+        self.__after_id = None
+
+        frame = Frame(self)
+        frame.pack(padx=20, pady=20, fill='x')
+        frame.grid_columnconfigure(0, weight=1)
+        frame.grid_columnconfigure(1, weight=1)
+        frame.grid_columnconfigure(2, weight=1)
+
+        # Position label and slider
+        self.__position_label = Label(frame)
+        self.__position_label.grid(row=0, column=0, sticky=W, columnspan=3)
+
+        self.__position_slider = Scale(frame,
+                                       width=20,
+                                       length=300,
+                                       from_=0,
+                                       to=len(player),
+                                       orient=HORIZONTAL,
+                                       showvalue=False,
+                                       command=self.__handle_position_change)
+        self.__position_slider.grid(row=1, column=0, sticky=EW, columnspan=3)
+
+        # Speed label and slider
+        self.__speed_label = Label(frame)
+        self.__speed_label.grid(row=2, column=0, sticky=W, columnspan=3)
+
+        self.__speed_slider = Scale(frame,
+                                    width=20,
+                                    from_=0,
+                                    to=self.MAX_SPEED,
+                                    orient=HORIZONTAL,
+                                    showvalue=False,
+                                    command=self.__handle_speed_change)
+        self.__speed_slider.set(self.__speed)
+        self.__speed_slider.grid(row=3, column=0, sticky=EW, columnspan=3)
+
+        # Playback buttons
+        Button(frame, text='Rewind', command=lambda: self.__seek(0)).grid(row=4, column=0, sticky=EW)
+        self.__play_button = Button(frame, text='Play', command=self.__toggle_playing)
+        self.__play_button.grid(row=4, column=1, sticky=EW)
+        Button(frame, text='End', command=lambda: self.__seek(len(self.__player))).grid(row=4, column=2, sticky=EW)
+
+        self.__update_labels()
+
+    def close(self):
+        ''' Stops the replay and closes the window. The grid keeps the replayed state.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        self.__is_playing = False
+        if self.__after_id is not None:
+            self.after_cancel(self.__after_id)
+            self.__after_id = None
+        self.destroy()
+
+    def __toggle_playing(self):
+        self.__is_playing = not self.__is_playing
+
+        # Play from the start again once the end was reached
+        if self.__is_playing and self.__player.position == len(self.__player):
+            if not self.__seek(0):
+                return
+
+        self.__play_button.configure(text='Pause' if self.__is_playing else 'Play')
+        if self.__is_playing:
+            self.__play_frame()
+
+    def __play_frame(self):
+        ''' Replays the events of one frame and schedules the next frame.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        self.__after_id = None
+        if not self.__is_playing:
+            return
+
+        if not self.__seek(self.__player.position + 10 ** self.__speed):
+            return
+
+        if self.__player.position < len(self.__player):
+            self.__after_id = self.after(self.FRAME_INTERVAL, self.__play_frame)
+        elif self.__is_playing:
+            self.__toggle_playing()
+
+    def __seek(self, position):
+        ''' Brings the grid to the given event and redraws the cells that changed.
+
+        Args:
+            position::[int]
+                The number of events to apply
+
+        Returns:
+            [bool]
+                Whether or not the grid was replayed (False once the maze changed and the window closed)
+        '''
+        if not self.__is_current():
+            self.close()
+            return False
+
+        self.__player.seek(self.__grid, position)
+        self.__draw(self.__grid.take_changes())
+        self.__position_slider.set(self.__player.position)
+        self.__update_labels()
+        return True
+
+    def __handle_position_change(self, value):
+        # Setting the slider while playing calls this again with the current position
+        if int(value) != self.__player.position:
+            self.__seek(int(value))
+
+    def __handle_speed_change(self, value):
+        self.__speed = int(float(value))
+        self.__update_labels()
+
+    def __update_labels(self):
+        self.__position_label.configure(
+            text='Event {} of {}'.format(self.__player.position, len(self.__player)))
+        self.__speed_label.configure(
+            text='Replay speed: {} events per frame'.format(10 ** self.__speed))
@@ -0,0 +1,226 @@
+from astar_grid import Grid
+from astar_heuristic import HeuristicField, get_heuristic, is_admissible
+from astar_node import NodePool
+from astar_open_list import OpenList
+import math
+import time
+
+
+# Constant offsets
+OFFSETS = [(0, 1), (-1, 0), (1, 0), (0, -1)]
+DIAGONAL_OFFSETS = [(-1, 1), (1, 1), (-1, -1), (1, -1)]
+
+
+def get_offsets(allow_diagonals):
+    ''' Returns the offsets of the adjacent cells that can be moved to.
+
+    Args:
+        allow_diagonals::[bool]
+            Whether or not diagonal movement is allowed
+
+    Returns:
+        [list]
+            The (x, y) offsets of the adjacent cells
+    '''
+    return OFFSETS + DIAGONAL_OFFSETS if allow_diagonals else list(OFFSETS)
+
+
+class AStarSearch:
+    ''' The A* search engine.
+
+    Every search engine shares this interface: search() runs a search over the
+    grid, marking the cells it queues as unsolved and the cells it expands as
+    solved, and returns the cells on the path it found. The model reads the
+    engine's counters to update its stats while the search runs. Engines that
+    can bound the length of their path also report get_suboptimality_bound().
+
+    The heuristic is multiplied by the 'weight' setting. A weight above 1
+    expands fewer cells, but the path may be up to that many times longer
+    than the shortest.
+
+    @params
+        grid: the grid to search
+    '''
+
+    LABEL = 'A*'
+
+    def __init__(self, grid):
+        self.__grid = grid
+        self.__nodes = NodePool(grid.size)
+        self.__heuristic_field = HeuristicField(grid.size)
+        self.unsolved = OpenList()
+        self.__num_solved = 0
+        self.__suboptimality_bound = None
+        self.__profiler = None
+        self.__landmarks = None
+
+    def get_num_unsolved(self):
+        return len(self.unsolved)
+
+    def get_num_solved(self):
+        return self.__num_solved
+
+    def set_profiler(self, profiler):
+        ''' Attaches a profiler recording the search phases and counters (or detaches it if None).
+
+        Args:
+            profiler::[Profiler]
+                The profiler to record into
+
+        Returns:
+            None
+        '''
+        self.__profiler = profiler
+
+    def set_landmarks(self, landmarks):
+        ''' Attaches the landmarks the 'alt' heuristic is computed from (see astar_landmarks.Landmarks).
+
+        Args:
+            landmarks::[Landmarks]
+                The landmarks of the current maze (None unless the 'alt' heuristic is selected)
+
+        Returns:
+            None
+        '''
+        self.__landmarks = landmarks
+
+    def get_suboptimality_bound(self):
+        ''' Returns how many times longer than the shortest path the path found may be.
+
+        Args:
+            None
+
+        Returns:
+            [float]
+                The bound (the 'weight' setting), or None if the heuristic is not admissible
+        '''
+        return self.__suboptimality_bound
+
+    def search(self, start, end, settings, tick):
+        ''' Searches for a path from the start cell to the end cell.
+
+        Args:
+            start::[int]
+                The index of the start cell
+            end::[int]
+                The index of the end cell
+            settings::[dict]
+                The model settings
+            tick::[function]
+                Called once per expansion; the search stops if it returns False
+
+        Returns:
+            [list]
+                The cell indices on the path from start to end, or None if no path was found
+        '''
+        weight = settings['weight']
+        if weight < 1:
+            raise ValueError('The weight must be at least 1. Received {} instead.'.format(weight))
+
+        self.__nodes.reset()
+        self.unsolved = OpenList()
+        self.__num_solved = 0
+
+        # Weighting an admissible heuristic by w finds a path at most w times the shortest
+        admissible = is_admissible(settings['heuristic'], settings['allowDiagonals'])
+        self.__suboptimality_bound = weight if admissible else None
+
+        offsets = get_offsets(settings['allowDiagonals'])
+
+        # Local references for the search loop
+        nRow, nCol = self.__grid.nRow, self.__grid.nCol
+        cells = self.__grid.cells
+        dirty = self.__grid.dirty
+        g = self.__nodes.g
+        parent = self.__nodes.parent
+        unsolved = self.unsolved
+        touched = self.__nodes.touched
+        endX, endY = divmod(end, nCol)
+
+        # Heuristic values are kept between searches until the end cell changes
+        if settings['heuristic'] == 'alt' and self.__landmarks is not None:
+            heuristic = self.__landmarks.get_heuristic(end)
+        else:
+            heuristic = get_heuristic(settings['heuristic'], settings['allowDiagonals'])
+        hValues = self.__heuristic_field.get_values(end, heuristic)
+
+        # Instrumentation costs one check per step when no profiler is attached
+        profiler = self.__profiler
+        timer = time.perf_counter
+
+        # Queue the starting cell
+        g[start] = 0
+        touched.append(start)
+        unsolved.push(start, (0, 0), start)
+        if profiler is not None:
+            profiler.count('pushed')
+
+        while len(unsolved) != 0 and tick():
+            # Remove the cell with the minimum 'f' value from the unsolved list and mark it as solved
+            if profiler is not None:
+                selectStart = timer()
+            curCell = unsolved.pop()
+            if profiler is not None:
+                expandStart = timer()
+                profiler.add('select', expandStart - selectStart)
+                profiler.count('popped')
+            self.__num_solved += 1
+            if cells[curCell] == Grid.UNSOLVED:
+                cells[curCell] = Grid.SOLVED
+                if dirty is not None:
+                    dirty.add(curCell)
+
+            # Done if the current cell is the end cell
+            if curCell == end:
+                if profiler is not None:
+                    profiler.add('expand', timer() - expandStart)
+                return self.__nodes.path_to(curCell)
+
+            curX, curY = divmod(curCell, nCol)
+            adjG = g[curCell] + 1
+
+            # Check adjacent cells
+            for offsetX, offsetY in offsets:
+                adjX = curX + offsetX
+                adjY = curY + offsetY
+
+                if not (0 <= adjX < nRow and 0 <= adjY < nCol):
+                    continue
+
+                adjCell = adjX * nCol + adjY
+                state = cells[adjCell]
+
+                # Don't do anything if the adjacent cell is a wall or already solved
+                if state == Grid.WALL or state == Grid.SOLVED:
+                    continue
+
+                # Add or update the adjacent cell in the unsolved list if the new g value is less than the old g value
+                if adjG < g[adjCell]:
+                    if g[adjCell] == math.inf:
+                        touched.append(adjCell)
+                    elif profiler is not None:
+                        profiler.count('reopened')
+                    g[adjCell] = adjG
+                    parent[adjCell] = curCell
+                    adjH = hValues[adjCell]
+                    if adjH < 0:
+                        if profiler is not None:
+                            heuristicStart = timer()
+                        adjH = hValues[adjCell] = heuristic(endX - adjX, endY - adjY)
+                        if profiler is not None:
+                            profiler.add('heuristic', timer() - heuristicStart)
+                    if profiler is not None:
+                        profiler.count('pushed')
+
+                    # Ties are broken in favour of the deeper cell
+                    unsolved.push(adjCell, (adjG + weight * adjH, -adjG), adjCell)
+                    if state == Grid.EMPTY:
+                        cells[adjCell] = Grid.UNSOLVED
+                        if dirty is not None:
+                            dirty.add(adjCell)
+
+            if profiler is not None:
+                profiler.add('expand', timer() - expandStart)
+
+        # Failed to find a path
+        return None
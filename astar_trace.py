@@ -0,0 +1,204 @@
+from array import array
+from astar_grid import Grid
+from astar_maze_file import HEADER
+import zlib
+
+
+# Identifies a search trace file and the version of its layout
+MAGIC = b'ATRC'
+VERSION = 1
+
+# File extension of search trace files
+TRACE_EXTENSION = '.atrace'
+
+# The cell state set by each event kind: cleared, opened (unsolved), closed (solved), or on the path
+KIND_STATES = (Grid.EMPTY, Grid.UNSOLVED, Grid.SOLVED, Grid.PATH)
+
+# The event kind of each cell state (255 for states a search never sets)
+STATE_KINDS = bytes(KIND_STATES.index(state) if state in KIND_STATES else 255 for state in range(256))
+
+# Uncompressed bytes of events buffered before they are handed to the compressor
+BUFFER_SIZE = 1 << 16
+
+
+class TraceRecorder(set):
+    ''' Records every state change of a grid's cells as a compact binary trace.
+
+    The recorder stands in for the grid's set of changed cells (Grid.dirty),
+    so every change a search reports is recorded in order at no cost to
+    searches that are not recorded. Views still receive the changes through
+    Grid.take_changes() as usual.
+
+    A trace starts with the maze (the header and packed wall plane of a binary
+    maze file, see astar_maze_file) followed by a zlib stream of events. Each
+    event is a varint holding the zigzag-encoded difference between its cell
+    and the cell of the previous event, shifted left by 2 bits, with the
+    event kind (see KIND_STATES) in the low 2 bits. Neighbouring cells are
+    close together, so most events take 1 or 2 bytes before compression.
+
+    @params
+        grid: the grid to record
+        start: the position of the start cell
+        end: the position of the end cell
+    '''
+
+    def __init__(self, grid, start, end):
+        super().__init__()
+        self.__grid = grid
+        self.__cells = grid.cells
+        self.__compressor = zlib.compressobj()
+        self.__buffer = bytearray()
+        self.__previous_cell = 0
+        self.num_events = 0
+
+        self.__chunks = [HEADER.pack(MAGIC, VERSION, 0, grid.nRow, grid.nCol, *start, *end),
+                         grid.wall_bits()]
+
+        # Changes are forwarded to the original set when recording stops (None if it did not track changes)
+        self.__tracked_changes = grid.dirty
+        if grid.dirty is not None:
+            self.update(grid.dirty)
+        grid.dirty = self
+
+    def add(self, cell):
+        kind = STATE_KINDS[self.__cells[cell]]
+        if kind != 255:
+            delta = cell - self.__previous_cell
+            self.__previous_cell = cell
+
+            # Zigzag-encode the delta so that small negative deltas stay small, then write it as a varint
+            value = ((delta << 1) if delta >= 0 else ((-delta << 1) - 1)) << 2 | kind
+            buffer = self.__buffer
+            while value >= 0x80:
+                buffer.append((value & 0x7f) | 0x80)
+                value >>= 7
+            buffer.append(value)
+            self.num_events += 1
+
+            if len(buffer) >= BUFFER_SIZE:
+                self.__chunks.append(self.__compressor.compress(buffer))
+                buffer.clear()
+
+        set.add(self, cell)
+
+    def finish(self):
+        ''' Stops recording and returns the trace.
+
+        Args:
+            None
+
+        Returns:
+            [bytes]
+                The contents of the trace file
+        '''
+        if self.__tracked_changes is not None:
+            self.__tracked_changes.update(self)
+        self.__grid.dirty = self.__tracked_changes
+
+        self.__chunks.append(self.__compressor.compress(self.__buffer))
+        self.__chunks.append(self.__compressor.flush())
+        self.__buffer = bytearray()
+        return b''.join(self.__chunks)
+
+
+class TracePlayer:
+    ''' Replays a recorded search trace onto a grid.
+
+    The events are decoded once when the trace is loaded, so the player can
+    jump to any event: moving forward applies the events in between, and
+    moving backward clears the search from the grid and applies the events
+    from the start.
+
+    @params
+        filename: the path of the trace file
+    '''
+
+    def __init__(self, filename):
+        with open(filename, 'rb') as file:
+            data = file.read()
+
+        if len(data) < HEADER.size or data[:len(MAGIC)] != MAGIC:
+            raise ValueError('{} is not a search trace file.'.format(filename))
+
+        magic, version, flags, nRow, nCol, startX, startY, endX, endY = HEADER.unpack_from(data)
+        if version != VERSION:
+            raise ValueError('Unsupported search trace version {} in {}. Expected version {}.'.format(
+                version, filename, VERSION))
+
+        if nRow != nCol:
+            raise ValueError('Only square mazes are supported. Received a {} x {} maze instead.'.format(
+                nRow, nCol))
+
+        events_offset = HEADER.size + (nRow * nCol + 7) // 8
+        self.maze_data = {
+            'gridWidth': nRow,
+            'start': [startX, startY],
+            'end': [endX, endY],
+            'wallBits': data[HEADER.size:events_offset]
+        }
+
+        self.__event_cells, self.__event_states = self.__decode(zlib.decompress(data[events_offset:]))
+
+        # The number of events applied to the grid
+        self.position = 0
+
+    def __len__(self):
+        return len(self.__event_cells)
+
+    def __decode(self, events):
+        ''' Decodes the events of a trace.
+
+        Args:
+            events::[bytes]
+                The decompressed event stream
+
+        Returns:
+            [tuple]
+                The cell of every event (array) and the state it sets (bytes)
+        '''
+        cells = array('i')
+        kinds = bytearray()
+        cell = 0
+        value = 0
+        shift = 0
+
+        for byte in events:
+            value |= (byte & 0x7f) << shift
+            if byte & 0x80:
+                shift += 7
+                continue
+
+            zigzag = value >> 2
+            cell += (zigzag >> 1) if not zigzag & 1 else -((zigzag + 1) >> 1)
+            cells.append(cell)
+            kinds.append(value & 3)
+            value = 0
+            shift = 0
+
+        return cells, bytes(kinds).translate(bytes(KIND_STATES) + bytes(252))
+
+    def seek(self, grid, position):
+        ''' Brings the grid to the state it had after the given number of events.
+
+        Args:
+            grid::[Grid]
+                The grid the trace is replayed onto (holding the traced maze)
+            position::[int]
+                The number of events to apply, clamped to the length of the trace
+
+        Returns:
+            None
+        '''
+        position = max(0, min(position, len(self)))
+        if position < self.position:
+            grid.clear_search()
+            self.position = 0
+
+        cells = grid.cells
+        event_cells = self.__event_cells[self.position:position]
+        for cell, state in zip(event_cells, self.__event_states[self.position:position]):
+            cells[cell] = state
+
+        if grid.dirty is not None:
+            grid.dirty.update(event_cells)
+        self.position = position